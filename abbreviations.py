@@ -0,0 +1,159 @@
+"""
+缩写扩展模块
+功能：把文本中的英文缩写扩展为完整形式，供命令列版与图形介面版共用
+特点：
+1. 所有缩写预先编译成一个前缀树(trie)正则，单次扫描完成全部替换
+2. 按单词边界匹配，不会误改单词内部的字母(如"visit's"中的"it's")
+3. 大小写统一处理，"I'd"与"i'd"效果相同
+4. 只在映射表变化时重新编译，映射表再大也不会拖慢每次判题
+"""
+
+import re
+from typing import Dict, List, Mapping, Optional, Pattern, Tuple
+
+# 撇号在匹配时同时接受直撇号与弯撇号
+APOSTROPHES = "'’"
+
+
+def _trie_to_pattern(node: dict) -> str:
+    """把前缀树节点递归转换为正则表达式片段
+
+    Args:
+        node: 前缀树节点，键为字符，值为子节点；空字符串键表示单词结束
+
+    Returns:
+        与该节点下所有单词匹配的正则表达式片段
+    """
+    is_end = "" in node
+    branches = []
+    for char in sorted(k for k in node if k):
+        if char in APOSTROPHES:
+            head = f"[{APOSTROPHES}]"
+        else:
+            head = re.escape(char)
+        branches.append(head + _trie_to_pattern(node[char]))
+
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    body = "(?:" + "|".join(branches) + ")"
+    return body + "?" if is_end else body
+
+
+def build_trie_pattern(words) -> str:
+    """把一组单词编译成共享前缀的正则表达式
+
+    Args:
+        words: 要匹配的单词集合(应已转换为小写)
+
+    Returns:
+        匹配任一单词的正则表达式字符串
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            # 弯撇号与直撇号合并到同一分支
+            if char in APOSTROPHES:
+                char = "'"
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_to_pattern(trie)
+
+
+class AbbreviationExpander:
+    """预编译的缩写扩展器
+
+    缩写表在第一次使用(或修改后第一次使用)时编译为一个正则，
+    之后每次扩展只需对文本扫描一次，耗时与缩写数量基本无关。
+    """
+
+    def __init__(self, mapping: Optional[Mapping[str, str]] = None):
+        self._mapping: Dict[str, str] = {}
+        self._pattern: Optional[Pattern[str]] = None
+        if mapping:
+            self.update(mapping)
+
+    @staticmethod
+    def _key(abbr: str) -> str:
+        """缩写的统一查找键：小写并把弯撇号换成直撇号"""
+        return abbr.lower().replace("’", "'")
+
+    def update(self, mapping: Mapping[str, str]) -> None:
+        """添加或覆盖缩写，下次扩展时自动重新编译
+
+        Args:
+            mapping: 缩写与全称的映射
+        """
+        for abbr, full in mapping.items():
+            self._mapping[self._key(abbr)] = full.lower()
+        self._pattern = None
+
+    def add(self, abbr: str, full: str) -> None:
+        """添加单个缩写"""
+        self.update({abbr: full})
+
+    def remove(self, abbr: str) -> None:
+        """移除单个缩写(不存在时忽略)"""
+        if self._mapping.pop(self._key(abbr), None) is not None:
+            self._pattern = None
+
+    @property
+    def mapping(self) -> Dict[str, str]:
+        """当前生效的缩写映射(副本)"""
+        return dict(self._mapping)
+
+    def _compiled(self) -> Optional[Pattern[str]]:
+        """返回编译好的正则，映射表变化后才重新编译"""
+        if self._pattern is None and self._mapping:
+            body = build_trie_pattern(self._mapping)
+            # 前后都不能紧贴字母、数字或撇号，保证只匹配完整单词
+            self._pattern = re.compile(
+                rf"(?<![\w{APOSTROPHES}]){body}(?![\w{APOSTROPHES}])",
+                re.IGNORECASE,
+            )
+        return self._pattern
+
+    def _replace(self, match: "re.Match[str]") -> str:
+        return self._mapping[self._key(match.group(0))]
+
+    def expand(self, text: str) -> str:
+        """扩展文本中的所有缩写
+
+        Args:
+            text: 需要处理的文本
+
+        Returns:
+            处理后的文本，已知缩写全部替换为小写的完整形式
+        """
+        pattern = self._compiled()
+        if pattern is None:
+            return text
+        return pattern.sub(self._replace, text)
+
+    def expand_with_spans(self, text: str) -> Tuple[str, List[int], List[int]]:
+        """扩展缩写，并记下结果中每个字符来自原文的哪一段
+
+        Returns:
+            (与 expand 相同的结果, 每个字符对应原文的起始位置, 对应原文的最后一个位置)；
+            缩写扩展出的字符都对应整个缩写
+        """
+        pattern = self._compiled()
+        pieces: List[str] = []
+        firsts: List[int] = []
+        lasts: List[int] = []
+        done = 0
+        for match in pattern.finditer(text) if pattern is not None else ():
+            start, end = match.span()
+            full = self._replace(match)
+            pieces += (text[done:start], full)
+            firsts += range(done, start)
+            lasts += range(done, start)
+            firsts += [start] * len(full)
+            lasts += [end - 1] * len(full)
+            done = end
+        pieces.append(text[done:])
+        firsts += range(done, len(text))
+        lasts += range(done, len(text))
+        return "".join(pieces), firsts, lasts
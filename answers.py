@@ -0,0 +1,244 @@
+"""
+多答案模块
+功能：一道题可以接受多种译法。题库旁的 <题库名>.accept.json 为句子列出其他可接受的答案
+特点：
+1. 答案模式支持可选词 [me] 与多选一 (kidding|joking)，可以嵌套，如 "Are you (kidding [me]|joking)"
+2. 加载时把每道题的全部写法展开并规范化，编译成一棵前缀树；
+   规范化结果不含空格，"can not" 与 "cannot" 这类只差空格的写法本来就相同
+3. 判题时沿前缀树走一遍答案，就能知道它是否与某种写法完全相同，不必逐个比较
+4. 与所有写法都不完全相同时，在前缀树上做带宽受限的编辑距离搜索，
+   超出阈值所允许编辑次数的分支立即剪掉，只对找到的最接近写法计算一次精确相似度
+
+文件格式：
+    {"Are you joking": ["Are you (kidding [me]|pulling my leg)", "You [must] be joking"]}
+"""
+
+import json
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+ACCEPT_SUFFIX = ".accept.json"
+# 单个模式最多展开的写法数，防止写错的模式展开成指数级
+MAX_VARIANTS = 1024
+
+_TOKEN = re.compile(r"[\[\]()|]|[^\[\]()|]+")
+_CLOSING = {"(": ")", "[": "]"}
+_END = None  # 前缀树中表示“写法在此结束”的键，值为 (写法原文, 规范化写法)
+
+
+def accepted_path(deck_path: str) -> str:
+    """题库对应的多答案文件路径(与题库放在同一目录)"""
+    return os.path.splitext(deck_path)[0] + ACCEPT_SUFFIX
+
+
+def expand(pattern: str) -> List[str]:
+    """展开答案模式中的可选词与多选一，返回全部写法(去重，保持顺序)
+
+    Raises:
+        ValueError: 括号不配对，或展开的写法超过 MAX_VARIANTS
+    """
+    tokens = _TOKEN.findall(pattern)
+    variants, position = _parse_alternatives(tokens, 0, pattern)
+    if position != len(tokens):
+        raise ValueError(f"答案模式 {pattern!r} 的括号不配对")
+    return list(dict.fromkeys(" ".join(variant.split()) for variant in variants))
+
+
+def _parse_alternatives(tokens: List[str], position: int, pattern: str) -> Tuple[List[str], int]:
+    """解析以 | 分隔的若干段，停在右括号或结尾"""
+    variants, position = _parse_sequence(tokens, position, pattern)
+    while position < len(tokens) and tokens[position] == "|":
+        more, position = _parse_sequence(tokens, position + 1, pattern)
+        variants += more
+    return variants, position
+
+
+def _parse_sequence(tokens: List[str], position: int, pattern: str) -> Tuple[List[str], int]:
+    """解析一段文字与括号组成的序列，返回它的全部写法"""
+    variants = [""]
+    while position < len(tokens) and tokens[position] not in ("|", ")", "]"):
+        token = tokens[position]
+        if token in _CLOSING:
+            choices, position = _parse_alternatives(tokens, position + 1, pattern)
+            if position >= len(tokens) or tokens[position] != _CLOSING[token]:
+                raise ValueError(f"答案模式 {pattern!r} 的括号不配对")
+            if token == "[":
+                choices.append("")
+            # 括号两侧补空格，"[really]good" 与 "really good" 一样按单词处理
+            choices = [f" {choice} " for choice in choices]
+        else:
+            choices = [token]
+        position += 1
+        if len(variants) * len(choices) > MAX_VARIANTS:
+            raise ValueError(f"答案模式 {pattern!r} 展开后超过 {MAX_VARIANTS} 种写法")
+        variants = [variant + choice for variant in variants for choice in choices]
+    return variants, position
+
+
+class AcceptedAnswers:
+    """各题其他可接受答案的前缀树
+
+    Args:
+        normalizer: 文本规范化函数(如 practice.normalize_text)，与判题时相同
+    """
+
+    def __init__(self, normalizer: Callable[[str], str]):
+        self.normalizer = normalizer
+        self._tries: Dict[str, dict] = {}
+        self.errors: List[str] = []  # 加载时跳过的文件或模式及原因
+
+    def __len__(self) -> int:
+        """有其他可接受答案的题目数"""
+        return len(self._tries)
+
+    def __contains__(self, english: object) -> bool:
+        return english in self._tries
+
+    def add(self, english: str, patterns: Iterable[str]) -> int:
+        """为句子加入可接受的答案模式
+
+        Args:
+            english: 题库中的英文句子(标准答案)
+            patterns: 答案模式
+
+        Returns:
+            新加入的写法数(规范化后与已有写法相同的不计)
+
+        Raises:
+            ValueError: 模式格式错误
+        """
+        trie = self._tries.get(english)
+        if trie is None:
+            # 标准答案也放进前缀树，近似搜索时与其他写法一起比较
+            trie = self._tries[english] = {}
+            self._insert(trie, english)
+        added = 0
+        for pattern in patterns:
+            for variant in expand(pattern):
+                added += self._insert(trie, variant)
+        return added
+
+    def _insert(self, trie: dict, variant: str) -> bool:
+        normalized = self.normalizer(variant)
+        if not normalized:
+            return False
+        node = trie
+        for char in normalized:
+            child = node.get(char)
+            if child is None:
+                child = node[char] = {}
+            node = child
+        if _END in node:
+            return False
+        node[_END] = (variant, normalized)
+        return True
+
+    def variants(self, english: str) -> List[str]:
+        """句子的全部可接受写法(含标准答案)"""
+        found = []
+        stack = [self._tries.get(english, {})]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char is _END:
+                    found.append(child[0])
+                else:
+                    stack.append(child)
+        return found
+
+    def match(self, english: str, normalized: str, threshold: float) -> Optional[Tuple[str, str]]:
+        """找出与答案最接近的可接受写法
+
+        先沿前缀树查找完全相同的写法；没有时做编辑距离搜索：
+        相似度达到 threshold 的写法与答案的插入/删除次数不超过 2(1-t)n/t(n 为答案长度)，
+        每个节点只计算这一带宽内的一段，所有值都超出时整个分支剪掉。
+
+        Args:
+            english: 题目的英文句子
+            normalized: 规范化后的用户答案
+            threshold: 相似度阈值
+
+        Returns:
+            (写法原文, 规范化写法)；句子没有其他写法或没有写法可能达到阈值时为 None
+        """
+        trie = self._tries.get(english)
+        if trie is None or not normalized or threshold <= 0:
+            return None
+        node = trie
+        for char in normalized:
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            if _END in node:
+                return node[_END]
+
+        length = len(normalized)
+        max_edits = int(2 * (1 - threshold) * length / threshold)
+        over = max_edits + 1
+        best, best_score = None, -1.0
+        # row[j]：从根到当前节点的前缀与答案前 j 个字符的插入/删除距离(超出预算的记为 over)
+        stack = [(trie, 0, [min(j, over) for j in range(length + 1)])]
+        while stack:
+            node, depth, row = stack.pop()
+            depth += 1
+            low, high = max(1, depth - max_edits), min(length, depth + max_edits)
+            for char, child in node.items():
+                if char is _END:
+                    continue
+                new = [over] * (length + 1)
+                if depth <= max_edits:
+                    new[0] = depth
+                for j in range(low, high + 1):
+                    if normalized[j - 1] == char:
+                        new[j] = row[j - 1]
+                    else:
+                        value = min(row[j], new[j - 1]) + 1
+                        new[j] = value if value < over else over
+                if min(new) > max_edits:
+                    continue
+                end = child.get(_END)
+                if end is not None and new[length] <= max_edits:
+                    # 最长公共子序列 = (两者长度之和 - 距离) / 2，由此得到相似度的上界
+                    score = (length + depth - new[length]) / (length + depth)
+                    if score > best_score:
+                        best, best_score = end, score
+                stack.append((child, depth, new))
+        return best
+
+
+def load_accepted(deck_paths: Iterable[str], normalizer: Callable[[str], str]) -> AcceptedAnswers:
+    """读取题库旁的多答案文件并编译
+
+    文件不存在时跳过；格式错误的文件或模式记入 errors 后跳过，不影响练习。
+
+    Args:
+        deck_paths: 题库JSON文件路径
+        normalizer: 文本规范化函数
+
+    Returns:
+        各题其他可接受答案的前缀树
+    """
+    answers = AcceptedAnswers(normalizer)
+    for deck_path in deck_paths:
+        path = accepted_path(deck_path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            answers.errors.append(f"无法读取 {path}: {e}")
+            continue
+        if not isinstance(entries, dict):
+            answers.errors.append(f"{path} 应为 {{英文: [可接受的答案, ...]}} 格式")
+            continue
+        for english, patterns in entries.items():
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            try:
+                answers.add(english, patterns)
+            except (TypeError, ValueError) as e:
+                answers.errors.append(f"{path} 中 {english!r} 的答案模式有误: {e}")
+    return answers
@@ -0,0 +1,229 @@
+"""
+音效模块
+功能：以低延迟播放答对/答错等反馈音效，朗读进行中也能立即响起
+特点：
+1. 音效只解码一次：解码后的 PCM 按混音器格式保存在磁盘上，之后启动直接载入原始数据，不再解码 mp3
+2. 去掉音效开头的静音，送入混音器的第一帧就有声音
+3. 混音器以较小的缓冲区打开(可配置)，缓冲区越小，从触发到发声的延迟越短
+4. 保留独立的声道：反馈音效与朗读各用一个，互不抢占；新的反馈音效打断上一个
+5. 每次播放记录从触发到送入声卡的延迟(调用耗时 + 一个缓冲区的时长)
+
+用法：
+    python audio.py [--buffer 256] [-n 20]   # 测量各音效的载入耗时与触发延迟
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from array import array
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from metrics import Metrics
+
+if TYPE_CHECKING:
+    import pygame
+
+DEFAULT_FREQUENCY = 44100
+# 每个缓冲区的采样帧数：256 帧在 44.1kHz 下约 6 毫秒；声音断续时调大(如 512、1024)
+DEFAULT_BUFFER = 256
+DEFAULT_PCM_DIR = os.path.join(os.path.expanduser("~"), ".cache", "practice-audio")
+PCM_SUFFIX = ".pcm"
+
+# 保留的声道编号：Sound.play() 不会自动选用这些声道，反馈音效与朗读不会互相抢占
+FEEDBACK_CHANNEL = 0
+SPEECH_CHANNEL = 1
+RESERVED_CHANNELS = 2
+
+# 振幅不超过满刻度的这一比例视为静音
+SILENCE_LEVEL = 0.01
+
+
+def open_mixer(frequency: int = DEFAULT_FREQUENCY, buffer: int = DEFAULT_BUFFER) -> float:
+    """以小缓冲区打开混音器，并保留反馈与朗读声道
+
+    Args:
+        frequency: 采样率
+        buffer: 缓冲区帧数(2 的幂)
+
+    Returns:
+        一个缓冲区的时长(秒)，即音效送入混音器后最多还要等待多久才到达声卡
+
+    Raises:
+        pygame.error: 没有可用的音频设备
+    """
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    pygame.mixer.init(frequency=frequency, size=-16, channels=2, buffer=buffer)
+    pygame.mixer.set_reserved(RESERVED_CHANNELS)
+    # 设备可能不支持指定的采样率，以实际打开的为准
+    return buffer / pygame.mixer.get_init()[0]
+
+
+def trim_silence(raw: bytes, mixer_format: Tuple[int, int, int]) -> Tuple[bytes, float]:
+    """去掉 PCM 开头的静音
+
+    只处理 16 位有符号采样(open_mixer 打开的格式)，其他格式原样返回。
+
+    Args:
+        raw: 混音器格式的 PCM 数据
+        mixer_format: pygame.mixer.get_init() 的返回值 (采样率, 采样格式, 声道数)
+
+    Returns:
+        (去掉开头静音后的 PCM, 去掉的时长(秒))
+    """
+    frequency, size, channels = mixer_format
+    if size != -16:
+        return raw, 0.0
+    samples = array("h")
+    samples.frombytes(raw[:len(raw) - len(raw) % samples.itemsize])
+    level = int(SILENCE_LEVEL * 32767)
+    for index, sample in enumerate(samples):
+        if sample > level or sample < -level:
+            break
+    else:
+        return raw, 0.0  # 整段都是静音，不裁剪
+    frames = index // channels
+    return raw[frames * channels * samples.itemsize:], frames / frequency
+
+
+class FeedbackSound:
+    """在反馈专用声道上播放的音效
+
+    Args:
+        sound: 已解码的音效
+        channel: 反馈声道
+        output_latency: 混音器一个缓冲区的时长(秒)
+        trimmed: 载入时去掉的开头静音(秒)
+        metrics: 耗时统计，每次播放记录 feedback_start；为 None 时不统计
+    """
+
+    def __init__(self, sound: "pygame.mixer.Sound", channel: "pygame.mixer.Channel",
+                 output_latency: float, trimmed: float = 0.0, metrics: Optional[Metrics] = None):
+        self.sound = sound
+        self.channel = channel
+        self.output_latency = output_latency
+        self.trimmed = trimmed
+        self.metrics = metrics or Metrics(enabled=False)
+
+    def play(self) -> None:
+        """立即播放(打断反馈声道上正在播放的音效，不影响朗读)"""
+        start = time.perf_counter()
+        self.channel.play(self.sound)
+        # 从触发到声卡开始播放：调用本身的耗时加上最多一个缓冲区的等待
+        self.metrics.observe("feedback_start", time.perf_counter() - start + self.output_latency)
+
+
+def load_pcm(path: str, cache_dir: Optional[str] = DEFAULT_PCM_DIR) -> Tuple["pygame.mixer.Sound", float]:
+    """载入音效：优先读取已解码的 PCM，没有时解码音频文件、去掉开头静音并保存
+
+    缓存文件名由音频文件的路径、大小、修改时间和混音器格式决定，任何一项改变都会重新解码。
+
+    Args:
+        path: 音频文件路径(mp3、wav、ogg 等)
+        cache_dir: 已解码 PCM 的保存目录，为 None 时不保存
+
+    Returns:
+        (音效, 去掉的开头静音(秒))；读取缓存时静音已在保存前去掉，返回 0
+
+    Raises:
+        pygame.error: 无法解码音频文件
+        OSError: 音频文件不存在
+    """
+    import pygame
+
+    mixer_format = pygame.mixer.get_init()
+    stat = os.stat(path)
+    cached = None
+    if cache_dir is not None:
+        raw_key = f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\0{mixer_format}"
+        cached = os.path.join(cache_dir, hashlib.sha256(raw_key.encode("utf-8")).hexdigest() + PCM_SUFFIX)
+        try:
+            with open(cached, "rb") as f:
+                return pygame.mixer.Sound(buffer=f.read()), 0.0
+        except OSError:
+            pass
+
+    raw, trimmed = trim_silence(pygame.mixer.Sound(path).get_raw(), mixer_format)
+    if cached is not None:
+        # 先写临时文件再改名，并行启动的另一个进程不会读到写了一半的缓存
+        temp = f"{cached}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(temp, "wb") as f:
+                f.write(raw)
+            os.replace(temp, cached)
+        except OSError:
+            pass  # 缓存目录不可写时每次启动重新解码
+    return pygame.mixer.Sound(buffer=raw), trimmed
+
+
+def load_feedback(files: Dict[str, str], output_latency: float, cache_dir: Optional[str] = DEFAULT_PCM_DIR,
+                  metrics: Optional[Metrics] = None) -> Dict[str, FeedbackSound]:
+    """载入全部反馈音效，共用反馈声道
+
+    Args:
+        files: {名称: 音频文件路径}
+        output_latency: open_mixer 的返回值
+        cache_dir: 已解码 PCM 的保存目录，为 None 时不保存
+        metrics: 耗时统计(每个音效的载入耗时与每次播放的触发延迟)
+
+    Returns:
+        {名称: 反馈音效}
+    """
+    import pygame
+
+    metrics = metrics or Metrics(enabled=False)
+    channel = pygame.mixer.Channel(FEEDBACK_CHANNEL)
+    sounds = {}
+    for name, path in files.items():
+        with metrics.time("feedback_load"):
+            sound, trimmed = load_pcm(path, cache_dir)
+        sounds[name] = FeedbackSound(sound, channel, output_latency, trimmed, metrics)
+    return sounds
+
+
+def main():
+    """程序主入口：测量反馈音效的载入耗时与触发延迟"""
+    from practice import AUDIO_SETTINGS, COLORS, SOUND_FILES
+
+    parser = argparse.ArgumentParser(description="测量反馈音效的载入耗时与从触发到发声的延迟")
+    parser.add_argument("--buffer", type=int, default=AUDIO_SETTINGS['buffer'], help="混音器缓冲区帧数")
+    parser.add_argument("--frequency", type=int, default=AUDIO_SETTINGS['frequency'], help="采样率")
+    parser.add_argument("-n", "--repeat", type=int, default=20, help="每个音效播放的次数")
+    parser.add_argument("--no-cache", action="store_true", help="不使用已解码的 PCM，每次都重新解码")
+    args = parser.parse_args()
+
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    try:
+        output_latency = open_mixer(args.frequency, args.buffer)
+    except pygame.error as e:
+        print(f"{COLORS['wrong']}無法初始化音訊裝置: {e}{COLORS['reset']}")
+        return
+    cache_dir = None if args.no_cache else AUDIO_SETTINGS['pcm_cache_dir']
+    print(f"{COLORS['prompt']}混音器 {pygame.mixer.get_init()}，緩衝區 {args.buffer} 幀 "
+          f"({output_latency * 1000:.1f} ms){COLORS['reset']}")
+
+    for name, path in SOUND_FILES.items():
+        metrics = Metrics()
+        try:
+            sound = load_feedback({name: path}, output_latency, cache_dir, metrics)[name]
+        except (pygame.error, OSError) as e:
+            print(f"{COLORS['wrong']}{name}: 無法載入 {path}: {e}{COLORS['reset']}")
+            continue
+        for _ in range(max(1, args.repeat)):
+            sound.play()
+            time.sleep(0.05)
+        sound.channel.stop()
+        load = metrics.histogram("feedback_load")
+        start = metrics.histogram("feedback_start")
+        print(f"{COLORS['correct']}{name}: 載入 {load.total * 1000:.1f} ms，去掉開頭靜音 {sound.trimmed * 1000:.0f} ms，"
+              f"觸發延遲 平均 {start.total / start.count * 1000:.2f} ms、最大 {start.max * 1000:.2f} ms{COLORS['reset']}")
+    pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+批量判题程序
+功能：一次性批改大量(用户答案, 正确答案)对，例如导出的班级作业
+特点：
+1. 判定结果与提示和交互练习完全相同；写入文件的提示不含终端颜色，缺少的部分以 [ ] 括起、多余的部分以 { } 括起
+2. 相同的正确答案只规范化一次；题库旁 .accept.json 中的其他可接受答案同样判对
+3. 数据量大时自动分块并用多进程并行判题
+
+用法：
+    python batch_grade.py submissions.json [-o results.json] [-j 进程数] [--deck-dir json]
+
+submissions.json 为列表，每一项可以是 {"answer": ..., "reference": ...}
+或 [用户答案, 正确答案]
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from answers import AcceptedAnswers, load_accepted
+from catalog import discover_decks
+from deck import Card
+from metrics import Metrics
+from practice import COLORS, PRACTICE_SETTINGS, build_hint, normalize_text
+from session import grade_attempt
+from similarity import ALMOST, CORRECT, WRONG
+
+# 少于该数量时直接在当前进程判题，避免启动进程池的开销
+PARALLEL_MIN_PAIRS = 2000
+
+# 工作进程中的其他可接受答案，由进程池的初始化函数设置一次，不随每个分块传送
+_worker_answers: Optional[AcceptedAnswers] = None
+
+
+class GradeResult(NamedTuple):
+    """单个答案的判题结果"""
+    answer: str       # 用户答案
+    reference: str    # 正确答案
+    verdict: str      # CORRECT / ALMOST / WRONG
+    similarity: float # 相似度(达不到阈值时为上界)
+    hint: str         # 差一点时的差异提示(长句按单词，不含颜色)，否则为空
+    accepted: Optional[str] = None  # 按其他可接受的写法判题时为该写法
+
+
+def _init_worker(answers: Optional[AcceptedAnswers]) -> None:
+    global _worker_answers
+    _worker_answers = answers
+
+
+def _grade_chunk(pairs: Sequence[Tuple[str, str]], threshold: float,
+                 answers: Optional[AcceptedAnswers] = None) -> List[GradeResult]:
+    """在单个进程内批改一组答案，正确答案的规范化结果在组内共享
+
+    与命令列版走同一判题流程(session.grade_attempt)，含其他可接受的答案。
+    """
+    if answers is None:
+        answers = _worker_answers
+    metrics = Metrics(enabled=False)
+    cards: Dict[str, Card] = {}
+    results = []
+    for answer, reference in pairs:
+        card = cards.get(reference)
+        if card is None:
+            card = cards[reference] = Card(reference, "", normalize_text(reference))
+        attempt = grade_attempt(card, answer, normalize_text, threshold, metrics, answers=answers)
+        hint = ""
+        if attempt.verdict == ALMOST:
+            hint = build_hint(answer, attempt.accepted or reference, attempt.alignment, color=False)
+        results.append(GradeResult(answer, reference, attempt.verdict, attempt.similarity, hint, attempt.accepted))
+    return results
+
+
+def grade_many(pairs: Iterable[Tuple[str, str]],
+               threshold: Optional[float] = None,
+               workers: Optional[int] = None,
+               answers: Optional[AcceptedAnswers] = None) -> List[GradeResult]:
+    """批量判题
+
+    Args:
+        pairs: (用户答案, 正确答案)序列
+        threshold: 相似度阈值，默认使用 PRACTICE_SETTINGS 中的设置
+        workers: 进程数，默认为 CPU 核心数；为 1 时不使用进程池
+        answers: 各题其他可接受的答案(见 answers.load_accepted)，为 None 时只接受正确答案本身
+
+    Returns:
+        与输入顺序一致的判题结果列表
+    """
+    pairs = list(pairs)
+    if threshold is None:
+        threshold = PRACTICE_SETTINGS['similarity_threshold']
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(pairs) < PARALLEL_MIN_PAIRS:
+        return _grade_chunk(pairs, threshold, answers)
+
+    # 按正确答案排序后再分块，让同一题的答案尽量落在同一进程以共享规范化结果
+    order = sorted(range(len(pairs)), key=lambda i: pairs[i][1])
+    chunk_size = -(-len(pairs) // (workers * 4))
+    chunks = [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+    results: List[Optional[GradeResult]] = [None] * len(pairs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(answers,)) as pool:
+        futures = [pool.submit(_grade_chunk, [pairs[i] for i in chunk], threshold) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            for i, result in zip(chunk, future.result()):
+                results[i] = result
+    return results
+
+
+def load_submissions(file_path: str) -> List[Tuple[str, str]]:
+    """读取作业文件
+
+    Args:
+        file_path: JSON文件路径
+
+    Returns:
+        (用户答案, 正确答案)列表
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    pairs = []
+    for item in data:
+        if isinstance(item, dict):
+            pairs.append((item["answer"], item["reference"]))
+        else:
+            answer, reference = item
+            pairs.append((answer, reference))
+    return pairs
+
+
+def main():
+    """程序主入口"""
+    parser = argparse.ArgumentParser(description="批量批改翻译答案")
+    parser.add_argument("submissions", help="作业JSON文件")
+    parser.add_argument("-o", "--output", help="结果输出的JSON文件")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="进程数(默认为CPU核心数)")
+    parser.add_argument("--deck-dir", default=PRACTICE_SETTINGS['deck_dir'],
+                        help="题库目录(读取其中的 .accept.json 作为其他可接受的答案)")
+    args = parser.parse_args()
+
+    answers = load_accepted(discover_decks(args.deck_dir).values(), normalize_text)
+    for error in answers.errors:
+        print(f"{COLORS['wrong']}警告：{error}{COLORS['reset']}")
+    pairs = load_submissions(args.submissions)
+    results = grade_many(pairs, workers=args.workers, answers=answers)
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.verdict] = counts.get(result.verdict, 0) + 1
+    print(
+        f"{COLORS['question']}共批改 {len(results)} 題: "
+        f"{COLORS['correct']}正確 {counts.get(CORRECT, 0)}{COLORS['reset']}, "
+        f"{COLORS['almost']}差一點 {counts.get(ALMOST, 0)}{COLORS['reset']}, "
+        f"{COLORS['wrong']}錯誤 {counts.get(WRONG, 0)}{COLORS['reset']}"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([result._asdict() for result in results], f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
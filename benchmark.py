@@ -0,0 +1,239 @@
+"""
+性能基准测试
+功能：用合成题库测量判题与加载各环节的速度和内存，并与保存的基准比较
+特点：
+1. 按指定规模(1千到100万句)生成短词和长句两种风格的题库与答案
+2. 分别测量缩写扩展、答案规范化、相似度判题、字母差异提示、判题连同提示、JSON加载、题库索引
+   以及相近句子索引、题目搜索索引的建立与查询
+   (逐个答案的项目最多抽取 ANSWER_SAMPLE 份答案)
+3. 输出每秒处理量与峰值内存；与基准相比明显变慢的项目会被标出，并以非零状态退出
+
+用法：
+    python benchmark.py                         # 默认规模 1000,10000,100000
+    python benchmark.py --scales 1000000        # 指定规模(逗号分隔)
+    python benchmark.py --save                  # 把本次结果保存为基准
+"""
+
+import argparse
+import difflib
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from practice import (ABBREVIATION_MAPPING, COLORS, PRACTICE_SETTINGS, build_hint, expand_abbreviations,
+                      highlight_letter_differences, load_json_file, normalize_text)
+from deck import DeckIndex
+from nearest import SentenceIndex
+from search import CardSearch
+from similarity import ALMOST, grade, grade_aligned
+
+DEFAULT_BASELINE = "bench_baseline.json"
+DEFAULT_SCALES = (1000, 10000, 100000)
+STYLES = ("words", "quotes")
+# 比基准慢超过该比例即视为退步
+DEFAULT_TOLERANCE = 0.2
+# 逐个答案的项目(判题、提示等)耗时与题库大小无关，最多只测这么多份答案
+ANSWER_SAMPLE = 20000
+
+_SYLLABLES = ("ba", "co", "de", "fi", "gu", "ha", "jo", "ki", "lu", "me", "no", "pa",
+              "qui", "ro", "sa", "te", "vo", "wa", "xe", "yo", "zu", "st", "th", "ing")
+# 合成中文提示所用的常用字
+_HANZI = ("的一是不了人我在有他这中大来上个国到说们为子和你地出道也时年得就那要下以生会自着去之过家学对可她里后"
+          "小么心多天而能好都然没日于起还发成事只作当想看文无开手十用主行方又如前所本见经头面公同三已老从动两长知")
+
+
+class Result(NamedTuple):
+    """单项测量结果"""
+    name: str          # 项目名称，如 normalize_text/quotes/10000
+    seconds: float     # 多次运行中最快的一次
+    items: int         # 处理的条目数
+    peak_bytes: int    # 峰值内存
+
+
+def _make_vocabulary(rng: random.Random, size: int = 5000) -> List[str]:
+    words = {"".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(size)}
+    return sorted(words) + list(ABBREVIATION_MAPPING)
+
+
+def make_deck(scale: int, style: str, seed: int = 0) -> Dict[str, str]:
+    """生成合成题库{英文: 中文}
+
+    Args:
+        scale: 句子数
+        style: "words"(1-3个单词的短词) 或 "quotes"(15-40个单词的长句)
+        seed: 随机种子，相同参数生成相同题库
+    """
+    rng = random.Random(seed)
+    # 中文提示另用一个随机数生成器，英文句子与加入中文前生成的完全相同
+    chinese_rng = random.Random(seed + 1)
+    vocabulary = _make_vocabulary(rng)
+    low, high = (1, 3) if style == "words" else (15, 40)
+    deck: Dict[str, str] = {}
+    while len(deck) < scale:
+        words = rng.choices(vocabulary, k=rng.randint(low, high))
+        sentence = " ".join(words).capitalize() + rng.choice((".", "?", "!", ""))
+        deck[sentence] = "".join(chinese_rng.choices(_HANZI, k=chinese_rng.randint(low + 2, high + 6)))
+    return deck
+
+
+def make_answers(deck: Dict[str, str], seed: int = 0) -> List[Tuple[str, str]]:
+    """为每个句子生成一份答案：原句、少量拼写错误或大量错误各占一部分"""
+    rng = random.Random(seed)
+    answers = []
+    for english in deck:
+        roll = rng.random()
+        chars = list(english)
+        if roll >= 0.4 and chars:
+            typos = 1 if roll < 0.8 else max(1, len(chars) // 3)
+            for _ in range(typos):
+                chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+        answers.append(("".join(chars), english))
+    return answers
+
+
+def grade_and_hint(answer: str, reference: str, user: str, correct: str, threshold: float) -> str:
+    """交互练习中的判题流程：判题，差一点时用同一次对齐结果生成提示"""
+    verdict, _, alignment = grade_aligned(user, correct, threshold)
+    return build_hint(answer, reference, alignment) if verdict == ALMOST else ""
+
+
+def measure(name: str, func: Callable[[], int], repeat: int) -> Result:
+    """运行 repeat 次取最快时间，再单独运行一次测量峰值内存"""
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = func()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Result(name, best, items, peak)
+
+
+def run_suite(scales, styles=STYLES, repeat: int = 3,
+              baseline: Optional[Dict[str, float]] = None) -> List[Result]:
+    """在各规模、各风格下测量全部热点，边测边输出(有基准时附上变化比例)"""
+    threshold = PRACTICE_SETTINGS['similarity_threshold']
+    results = []
+    for style in styles:
+        for scale in scales:
+            deck = make_deck(scale, style)
+            answers = make_answers(deck)[:ANSWER_SAMPLE]
+            user_answers = [answer for answer, _ in answers]
+            normalized = [(normalize_text(answer), normalize_text(reference)) for answer, reference in answers]
+            suffix = f"{style}/{scale}"
+            cards = DeckIndex(deck, normalize_text)
+            sentence_index = SentenceIndex(cards).build()
+            card_search = CardSearch(cards).build()
+            # 每份答案对应一次搜索：题目中文提示的前两个字加英文句子的第一个单词
+            queries = [f"{deck[reference][:2]} {reference.split()[0]}" for _, reference in answers]
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "deck.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(deck, f, ensure_ascii=False)
+
+                cases = [
+                    ("expand_abbreviations",
+                     lambda: sum(1 for answer in user_answers if expand_abbreviations(answer.lower()) is not None)),
+                    ("normalize_text",
+                     lambda: sum(1 for answer in user_answers if normalize_text(answer) is not None)),
+                    ("grade",
+                     lambda: sum(1 for user, correct in normalized if grade(user, correct, threshold))),
+                    ("sequence_matcher",
+                     lambda: sum(1 for user, correct in normalized
+                                 if difflib.SequenceMatcher(None, user, correct).ratio() >= 0)),
+                    ("highlight_letter_differences",
+                     lambda: sum(1 for answer, reference in answers
+                                 if highlight_letter_differences(answer.lower(), reference.lower()) is not None)),
+                    ("grade_and_hint",
+                     lambda: sum(1 for (answer, reference), (user, correct) in zip(answers, normalized)
+                                 if grade_and_hint(answer, reference, user, correct, threshold) is not None)),
+                    ("load_json_file", lambda: len(load_json_file(path))),
+                    ("deck_index", lambda: len(DeckIndex(deck, normalize_text))),
+                    ("nearest_index", lambda: len(SentenceIndex(cards).build())),
+                    ("nearest",
+                     lambda: sum(1 for user, _ in normalized if sentence_index.nearest(user, threshold) is not None)),
+                    ("search_index", lambda: len(CardSearch(cards).build())),
+                    ("search", lambda: sum(1 for query in queries if card_search.find(query, limit=50) is not None)),
+                ]
+                for name, func in cases:
+                    result = measure(f"{name}/{suffix}", func, repeat)
+                    results.append(result)
+                    print(format_result(result, baseline), flush=True)
+    return results
+
+
+def format_result(result: Result, baseline: Optional[Dict[str, float]] = None) -> str:
+    """一行测量结果：耗时、吞吐、峰值内存(以及相对基准的变化)"""
+    rate = result.items / result.seconds if result.seconds else float("inf")
+    line = (f"{result.name:<45} {result.seconds * 1000:>10.2f} ms {rate:>14,.0f} /s "
+            f"{result.peak_bytes / 1024 / 1024:>9.1f} MB")
+    if baseline and result.name in baseline:
+        change = result.seconds / baseline[result.name] - 1
+        line += f" {change:>+8.1%}"
+    return line
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    """读取基准{项目名称: 秒}，不存在时为空"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def find_regressions(results: List[Result], baseline: Dict[str, float], tolerance: float) -> List[Result]:
+    """比基准慢超过 tolerance 的项目"""
+    return [result for result in results
+            if result.name in baseline and result.seconds > baseline[result.name] * (1 + tolerance)]
+
+
+def main():
+    """程序主入口"""
+    parser = argparse.ArgumentParser(description="判题与加载热点的性能基准测试")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="题库规模，逗号分隔(默认 1000,10000,100000)")
+    parser.add_argument("--styles", default=",".join(STYLES), help="题库风格: words,quotes")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="每项重复次数，取最快一次(默认3)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基准文件路径")
+    parser.add_argument("--save", action="store_true", help="把本次结果保存为基准")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="允许比基准慢的比例(默认0.2)")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    styles = [style for style in args.styles.split(",") if style in STYLES]
+    baseline = load_baseline(args.baseline)
+
+    print(f"{'项目':<43} {'耗时':>12} {'吞吐':>16} {'峰值内存':>10}")
+    results = run_suite(scales, styles, args.repeat, baseline)
+
+    if args.save:
+        baseline.update({result.name: result.seconds for result in results})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"{COLORS['prompt']}基准已保存到 {args.baseline}{COLORS['reset']}")
+        return
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for result in regressions:
+        print(f"{COLORS['wrong']}退步: {result.name} "
+              f"{baseline[result.name] * 1000:.2f} ms → {result.seconds * 1000:.2f} ms{COLORS['reset']}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+题库目录模块
+功能：找出目录下的所有题库，并行加载后合并成一个带标签的总目录
+特点：
+1. 用线程池同时加载、校验各个题库
+2. 每道题记录它出现在哪些题库中(标签)，重复的句子只保留一份
+3. 规范化后相同的句子(如"It's OK"与"it is ok")会被列为重复项
+4. 练习时可以任选几个题库组合，不需要重新加载
+5. 可按中文提示或英文单词搜索全部题库，把找到的题目组成临时题库
+"""
+
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from answers import ACCEPT_SUFFIX
+from deck import Card, DeckIndex
+from search import CardSearch
+
+
+class Catalog:
+    """合并后的题库目录
+
+    Args:
+        decks: {题库名: 题库}，题库可以是 DeckIndex、StreamingDeck 或 CompiledDeck
+        normalizer: 文本规范化函数
+    """
+
+    def __init__(self, decks: Dict[str, Iterable[Card]], normalizer: Callable[[str], str]):
+        self.normalizer = normalizer
+        self.deck_names: List[str] = list(decks)
+        self._cards: List[Card] = []
+        self._tags: List[List[str]] = []  # 与 _cards 对应：每道题所属的题库
+        self._by_english: Dict[str, int] = {}
+        self._by_normalized: Dict[str, List[int]] = {}
+        self.skipped: Dict[str, int] = {}  # 各题库中因格式不符被跳过的条目数
+        self._search: Optional[CardSearch] = None
+
+        for name, deck in decks.items():
+            for card in deck:
+                if not isinstance(card.chinese, str) or not card.normalized:
+                    self.skipped[name] = self.skipped.get(name, 0) + 1
+                    continue
+                position = self._by_english.get(card.english)
+                if position is None:
+                    position = self._by_english[card.english] = len(self._cards)
+                    self._cards.append(card)
+                    self._tags.append([])
+                    self._by_normalized.setdefault(card.normalized, []).append(position)
+                if name not in self._tags[position]:
+                    self._tags[position].append(name)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def __contains__(self, english: object) -> bool:
+        return english in self._by_english
+
+    def card(self, english: str) -> Card:
+        """按英文取题目(含预先计算的判题键)
+
+        Raises:
+            KeyError: 句子不在任何题库中
+        """
+        return self._cards[self._by_english[english]]
+
+    def tags(self, english: str) -> List[str]:
+        """句子所属的题库名称"""
+        return list(self._tags[self._by_english[english]])
+
+    def duplicates(self) -> List[List[Tuple[str, List[str]]]]:
+        """列出重复的句子
+
+        Returns:
+            每组为[(英文, 所属题库), ...]：同一句子出现在多个题库，
+            或不同写法规范化后相同的句子
+        """
+        groups = []
+        for positions in self._by_normalized.values():
+            if len(positions) > 1 or len(self._tags[positions[0]]) > 1:
+                groups.append([(self._cards[p].english, list(self._tags[p])) for p in positions])
+        return groups
+
+    def select(self, deck_names: Optional[Iterable[str]] = None) -> DeckIndex:
+        """取出若干题库的题目组成练习用的题库索引(沿用已计算的判题键)
+
+        Args:
+            deck_names: 题库名称，为 None 时选取全部题库
+
+        Returns:
+            题库索引；重复的句子只出现一次
+
+        Raises:
+            KeyError: 题库名称不存在
+        """
+        if deck_names is None:
+            return DeckIndex.from_cards(self._cards, self.normalizer)
+        wanted = self._wanted(deck_names)
+        cards = (card for card, tags in zip(self._cards, self._tags) if wanted.intersection(tags))
+        return DeckIndex.from_cards(cards, self.normalizer)
+
+    def search_index(self) -> CardSearch:
+        """中文两字组与英文单词的搜索索引(第一次使用时建立)"""
+        if self._search is None:
+            self._search = CardSearch(self._cards)
+        return self._search
+
+    def search(self, query: str, deck_names: Optional[Iterable[str]] = None,
+               limit: Optional[int] = None) -> DeckIndex:
+        """按中文提示或英文单词查找题目，组成练习用的题库索引(沿用已计算的判题键)
+
+        Args:
+            query: 查询文字，多个词以空格分隔，须全部出现(见 search.CardSearch.find)
+            deck_names: 只在这些题库中查找，为 None 时查找全部题库
+            limit: 最多取出的题目数，为 None 时不限
+
+        Returns:
+            题库索引，按目录顺序排列，可直接交给 practice_session
+
+        Raises:
+            KeyError: 题库名称不存在
+        """
+        accept = None
+        if deck_names is not None:
+            wanted, tags = self._wanted(deck_names), self._tags
+            accept = lambda number: not wanted.isdisjoint(tags[number])
+        numbers = self.search_index().find(query, accept, limit)
+        return DeckIndex.from_cards((self._cards[number] for number in numbers), self.normalizer)
+
+    def _wanted(self, deck_names: Iterable[str]) -> Set[str]:
+        wanted = set(deck_names)
+        unknown = wanted.difference(self.deck_names)
+        if unknown:
+            raise KeyError(f"未知的题库: {', '.join(sorted(unknown))}")
+        return wanted
+
+
+def discover_decks(directory: str) -> Dict[str, str]:
+    """找出目录下的所有JSON题库(不含题库旁的多答案文件)
+
+    Returns:
+        {题库名(文件名去掉扩展名): 文件路径}，按名称排序
+    """
+    paths = [path for path in sorted(glob.glob(os.path.join(directory, "*.json")))
+             if not path.endswith(ACCEPT_SUFFIX)]
+    return {os.path.splitext(os.path.basename(path))[0]: path for path in paths}
+
+
+def load_catalog(directory: str,
+                 loader: Callable[[str], Iterable[Card]],
+                 normalizer: Callable[[str], str],
+                 max_workers: Optional[int] = None) -> Catalog:
+    """并行加载目录下的所有题库并合并
+
+    Args:
+        directory: 题库目录
+        loader: 加载单个题库的函数(如 practice.load_deck)，失败时返回空题库
+        normalizer: 文本规范化函数
+        max_workers: 线程数，默认由线程池决定
+
+    Returns:
+        合并后的题库目录(空题库不计入)
+    """
+    paths = discover_decks(directory)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        loaded = list(pool.map(loader, paths.values()))
+    decks = {name: deck for name, deck in zip(paths, loaded) if deck}
+    return Catalog(decks, normalizer)
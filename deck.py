@@ -0,0 +1,143 @@
+"""
+题库索引模块
+功能：在加载题库时一次性计算每个句子的判题键，判题时只需规范化用户输入
+并提供随机出题的游标，每题 O(1) 选取，整副题库出完之前不会重复
+"""
+
+import random
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class Card(NamedTuple):
+    """一道题目及其预先计算好的判题键"""
+    english: str      # 英文句子(正确答案)
+    chinese: str      # 中文提示
+    normalized: str   # 规范化后的正确答案，用于相似度比较
+
+
+class DeckIndex:
+    """题库索引：保持原始顺序，并按英文句子快速查找题目
+
+    Args:
+        sentences: 中英对照句子字典{英文: 中文}
+        normalizer: 文本规范化函数(如 practice.normalize_text)
+    """
+
+    def __init__(self, sentences: Mapping[str, str], normalizer: Callable[[str], str]):
+        self.normalizer = normalizer
+        self._cards: Dict[str, Card] = {
+            english: Card(english, chinese, normalizer(english))
+            for english, chinese in sentences.items()
+        }
+        self._order: List[Card] = list(self._cards.values())
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Card], normalizer: Callable[[str], str]) -> "DeckIndex":
+        """直接由已计算好的题目构建索引，不再重复规范化"""
+        deck = cls.__new__(cls)
+        deck.normalizer = normalizer
+        deck._cards = {card.english: card for card in cards}
+        deck._order = list(deck._cards.values())
+        return deck
+
+    def subset(self, englishes: Iterable[str]) -> "DeckIndex":
+        """取出部分题目组成新索引(如错题本)，沿用已计算的判题键"""
+        return DeckIndex.from_cards((self._cards[e] for e in englishes), self.normalizer)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards.values())
+
+    def __contains__(self, english: object) -> bool:
+        return english in self._cards
+
+    def __getitem__(self, english: str) -> Card:
+        return self._cards[english]
+
+    def cards(self) -> List[Card]:
+        """按题库顺序返回全部题目"""
+        return list(self._order)
+
+    def card_at(self, position: int) -> Card:
+        """按题库顺序取第 position 道题"""
+        return self._order[position]
+
+    def available(self, at_least: int = 1) -> int:
+        """已可出题的数量(全部题目已在内存中，直接返回总数)"""
+        return len(self._order)
+
+    def items(self) -> List[Tuple[str, str]]:
+        """与字典相同的(英文, 中文)视图，方便旧代码直接使用"""
+        return [(card.english, card.chinese) for card in self._cards.values()]
+
+    def normalized(self, english: str) -> str:
+        """返回某个句子预先规范化好的答案"""
+        return self._cards[english].normalized
+
+
+class DeckCursor:
+    """随机出题游标(不放回抽样)
+
+    每一轮把整副题库随机出完一次后才进入下一轮，每次取题只需 O(1)；
+    新一轮的第一题不会与上一轮的最后一题相同。
+    对边读边解析的流式题库，只在已解析的题目中抽取，无需等待整个文件读完。
+
+    Args:
+        deck: 题库索引(DeckIndex 或 deck_stream.StreamingDeck)
+        rng: 随机数生成器(固定种子时可复现出题顺序)
+    """
+
+    def __init__(self, deck, rng: Optional[random.Random] = None):
+        self._deck = deck
+        self._order: List[int] = []
+        self._pos = 0
+        self._rng = rng or random.Random()
+        self._pending: Optional[Card] = None
+        self.epoch = 0  # 已完整出完的轮数
+
+    def __iter__(self) -> "DeckCursor":
+        return self
+
+    def __next__(self) -> Card:
+        if self._pending is not None:
+            card, self._pending = self._pending, None
+            return card
+        return self._draw()
+
+    @property
+    def round_finished(self) -> bool:
+        """本轮题目是否已全部取出"""
+        return self._pending is None and self._pos == self._deck.available(self._pos + 1)
+
+    def one_round(self) -> Iterator[Card]:
+        """依次取出本轮剩余的题目"""
+        while not self.round_finished:
+            yield next(self)
+
+    def peek(self) -> Card:
+        """查看下一题但不取出(如用于预先合成语音)"""
+        if self._pending is None:
+            self._pending = self._draw()
+        return self._pending
+
+    def _draw(self) -> Card:
+        # 流式题库会在需要时继续解析，使可用题目数大于当前位置
+        n = self._deck.available(self._pos + 1)
+        if n > len(self._order):
+            self._order.extend(range(len(self._order), n))
+        if not n:
+            raise StopIteration
+        if self._pos == n:
+            self._pos = 0
+            self.epoch += 1
+        # 逐步进行 Fisher-Yates 洗牌：在尚未出过的题中随机选一题换到当前位置。
+        # 新一轮开始时上一题位于末尾，排除末位即可避免立即重复
+        stop = n - 1 if self._pos == 0 and self.epoch and n > 1 else n
+        j = self._rng.randrange(self._pos, stop)
+        order = self._order
+        order[self._pos], order[j] = order[j], order[self._pos]
+        card = self._deck.card_at(order[self._pos])
+        self._pos += 1
+        return card
@@ -0,0 +1,319 @@
+"""
+二进制题库模块
+功能：把JSON题库编译成紧凑的二进制文件，启动时直接内存映射，不再解析JSON
+特点：
+1. 文件包含字符串表、偏移数组和预先规范化好的答案
+2. 记录源文件的大小、修改时间和SHA-256，源文件内容变化后自动重新编译
+3. 记录规范化规则(缩写表)的指纹，规则变化后同样重新编译；
+   编译可以放在后台线程中进行，期间先以流式方式出题
+4. 读取时零拷贝：偏移数组直接映射为数组视图，只在取题时解码对应的字符串
+5. 附带按英文句子查找的散列表，判断句子是否在题库中时不必解码全部题目
+
+文件结构(小端序)：
+    文件头 | 偏移数组 uint64 × (3N + 1) | 散列表 uint64 × M | 字符串表(UTF-8)
+    每道题依次存放 英文、中文、规范化答案 三个字符串
+    散列表按英文句子 UTF-8 的 CRC32 线性探测，槽中存放题目序号 + 1(0 为空槽)，M 为不小于 2N 的 2 的幂
+
+用法：
+    python deck_binary.py json/english_sentence.json [更多题库 ...]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from typing import Callable, Iterator, Mapping, Optional, Set, Tuple
+
+from deck import Card
+
+MAGIC = b"PDECKBIN"
+FORMAT_VERSION = 2
+COMPILED_SUFFIX = ".deckbin"
+# 魔数, 版本, 字节序标记, 题目数, 源文件大小, 源文件修改时间(纳秒), 源文件SHA-256, 规范化规则指纹
+_HEADER = struct.Struct("<8sIIQQq32s32s")
+_LITTLE_ENDIAN = 1
+_FIELDS_PER_CARD = 3
+
+# 正在后台编译的源文件，同一题库不会同时编译两次
+_compiling: Set[str] = set()
+_compiling_lock = threading.Lock()
+
+
+def compiled_path(source_path: str) -> str:
+    """源JSON对应的二进制题库路径(与源文件放在同一目录)"""
+    return os.path.splitext(source_path)[0] + COMPILED_SUFFIX
+
+
+def _table_size(count: int) -> int:
+    """散列表的槽数：不小于题目数两倍的 2 的幂，装载率不超过一半"""
+    return 1 << max(1, 2 * count - 1).bit_length()
+
+
+def _file_sha256(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def compile_deck(source_path: str, sentences: Mapping[str, str], normalizer: Callable[[str], str],
+                 normalizer_tag: bytes, output_path: Optional[str] = None) -> str:
+    """把题库编译成二进制文件
+
+    Args:
+        source_path: 源JSON文件路径(用于记录大小、修改时间和校验和)
+        sentences: 已解析的题库{英文: 中文}
+        normalizer: 文本规范化函数
+        normalizer_tag: 规范化规则指纹(32字节)
+        output_path: 输出路径，默认为 compiled_path(source_path)
+
+    Returns:
+        输出文件路径
+
+    Raises:
+        ValueError: 题库不是{英文: 中文}格式(如顶层为数组或题目不是字符串)
+    """
+    if not isinstance(sentences, Mapping):
+        raise ValueError(f"{source_path} 不是 {{英文: 中文}} 格式的JSON对象")
+    output_path = output_path or compiled_path(source_path)
+    stat = os.stat(source_path)
+
+    offsets = array("Q", [0])
+    mask = _table_size(len(sentences)) - 1
+    table = array("Q", bytes(8 * (mask + 1)))
+    blob = bytearray()
+    for position, (english, chinese) in enumerate(sentences.items()):
+        if not isinstance(english, str) or not isinstance(chinese, str):
+            raise ValueError(f"{source_path} 第 {position + 1} 题不是字符串：{english!r}: {chinese!r}")
+        encoded = english.encode("utf-8")
+        slot = zlib.crc32(encoded) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = position + 1
+        for text in (encoded, chinese.encode("utf-8"), normalizer(english).encode("utf-8")):
+            blob += text
+            offsets.append(len(blob))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+        table.byteswap()
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _LITTLE_ENDIAN, len(sentences),
+                          stat.st_size, stat.st_mtime_ns, _file_sha256(source_path), normalizer_tag)
+    # 先写临时文件再改名，其他进程不会读到写了一半的文件
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        offsets.tofile(f)
+        table.tofile(f)
+        f.write(blob)
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+class CompiledDeck:
+    """内存映射的二进制题库
+
+    与 deck.DeckIndex、deck_stream.StreamingDeck 提供相同的出题接口。
+
+    Args:
+        path: 二进制题库路径
+        normalizer: 文本规范化函数(用于错题本等后续处理)
+
+    Raises:
+        ValueError: 文件不是有效的二进制题库
+    """
+
+    def __init__(self, path: str, normalizer: Callable[[str], str]):
+        self.path = path
+        self.normalizer = normalizer
+        self._view = self._offsets = self._table = self._blob = None
+        with open(path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{path} 是空文件")
+        if len(self._data) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} 不是有效的二进制题库")
+        (magic, version, byte_order, self._count, self.source_size, self.source_mtime_ns,
+         self.source_sha256, self.normalizer_tag) = _HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != FORMAT_VERSION or byte_order != _LITTLE_ENDIAN:
+            self.close()
+            raise ValueError(f"{path} 不是有效的二进制题库")
+
+        view = self._view = memoryview(self._data)
+        offsets_end = _HEADER.size + 8 * (_FIELDS_PER_CARD * self._count + 1)
+        table_end = offsets_end + 8 * _table_size(self._count)
+        if len(self._data) < table_end:
+            self.close()
+            raise ValueError(f"{path} 不是有效的二进制题库")
+        if sys.byteorder == "little":
+            # 零拷贝：偏移数组与散列表直接映射为 uint64 视图
+            self._offsets = view[_HEADER.size:offsets_end].cast("Q")
+            self._table = view[offsets_end:table_end].cast("Q")
+        else:
+            self._offsets = array("Q", view[_HEADER.size:offsets_end])
+            self._offsets.byteswap()
+            self._table = array("Q", view[offsets_end:table_end])
+            self._table.byteswap()
+        self._blob = view[table_end:]
+
+    def close(self) -> None:
+        """释放内存映射"""
+        for view in (self._offsets, self._table, self._blob, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._view = self._offsets = self._table = self._blob = None
+        self._data.close()
+
+    def is_fresh(self, source_path: str, normalizer_tag: bytes) -> bool:
+        """源文件和规范化规则是否与编译时一致
+
+        通常只比较大小和修改时间，不读源文件；大小相同而修改时间不同时(如重新检出或复制后)
+        再用SHA-256确认内容，内容没变就不必重新编译。
+        """
+        if normalizer_tag != self.normalizer_tag:
+            return False
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return True  # 源文件已不存在，继续使用编译结果
+        if stat.st_size != self.source_size:
+            return False
+        return stat.st_mtime_ns == self.source_mtime_ns or self.verify(source_path)
+
+    def verify(self, source_path: str) -> bool:
+        """用SHA-256确认编译结果与源文件内容一致(源文件无法读取时视为不一致)"""
+        try:
+            return _file_sha256(source_path) == self.source_sha256
+        except OSError:
+            return False
+
+    # ---------- 出题接口 ----------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def available(self, at_least: int = 1) -> int:
+        """可出题的数量(全部题目都已在文件中)"""
+        return self._count
+
+    def position(self, english: str) -> Optional[int]:
+        """按英文句子查找题目序号(查散列表，只比较候选题目的原始字节)，不在题库中时为 None"""
+        encoded = english.encode("utf-8")
+        table, offsets = self._table, self._offsets
+        mask = len(table) - 1
+        slot = zlib.crc32(encoded) & mask
+        while table[slot]:
+            base = (table[slot] - 1) * _FIELDS_PER_CARD
+            if self._blob[offsets[base]:offsets[base + 1]] == encoded:
+                return table[slot] - 1
+            slot = (slot + 1) & mask
+        return None
+
+    def __contains__(self, english: object) -> bool:
+        return isinstance(english, str) and self.position(english) is not None
+
+    def _field(self, index: int) -> str:
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def entry(self, position: int) -> Tuple[str, str]:
+        """按题库顺序取第 position 个(英文, 中文)"""
+        base = position * _FIELDS_PER_CARD
+        return self._field(base), self._field(base + 1)
+
+    def card_at(self, position: int) -> Card:
+        """按题库顺序取第 position 道题，规范化答案直接读取编译结果"""
+        base = position * _FIELDS_PER_CARD
+        return Card(self._field(base), self._field(base + 1), self._field(base + 2))
+
+    def __iter__(self) -> Iterator[Card]:
+        return (self.card_at(position) for position in range(self._count))
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """与字典相同的(英文, 中文)视图"""
+        return (self.entry(position) for position in range(self._count))
+
+
+def open_fresh(source_path: str, normalizer: Callable[[str], str], normalizer_tag: bytes) -> Optional[CompiledDeck]:
+    """打开源JSON对应的二进制题库，只在它与源文件和规范化规则一致时返回
+
+    Returns:
+        二进制题库；缺失、无效或过期时为 None
+    """
+    try:
+        deck = CompiledDeck(compiled_path(source_path), normalizer)
+    except (OSError, ValueError):
+        return None
+    if deck.is_fresh(source_path, normalizer_tag):
+        return deck
+    deck.close()
+    return None
+
+
+def compile_in_background(source_path: str, normalizer: Callable[[str], str], normalizer_tag: bytes,
+                          load_source: Callable[[str], Mapping[str, str]]) -> Optional[threading.Thread]:
+    """在后台线程中(重新)编译题库，供下次启动直接使用
+
+    线程不是守护线程：程序退出前会等编译写完，不留下写了一半的临时文件。
+
+    Args:
+        source_path: 源JSON文件路径
+        normalizer: 文本规范化函数
+        normalizer_tag: 规范化规则指纹
+        load_source: 解析源JSON的函数(如 practice.load_json_file)
+
+    Returns:
+        编译线程；该题库已在编译时为 None
+    """
+    with _compiling_lock:
+        if source_path in _compiling:
+            return None
+        _compiling.add(source_path)
+
+    def run() -> None:
+        try:
+            sentences = load_source(source_path)
+            if sentences:
+                compile_deck(source_path, sentences, normalizer, normalizer_tag)
+        except (OSError, ValueError):
+            pass  # 目录不可写等情况下只是下次仍以流式方式加载
+        finally:
+            with _compiling_lock:
+                _compiling.discard(source_path)
+
+    thread = threading.Thread(target=run, name="deck-compiler")
+    thread.start()
+    return thread
+
+
+def main():
+    """程序主入口：编译题库"""
+    from practice import COLORS, load_json_file, normalize_text, normalizer_fingerprint
+
+    parser = argparse.ArgumentParser(description="把JSON题库编译成二进制格式，加快启动")
+    parser.add_argument("decks", nargs="+", help="题库JSON文件")
+    args = parser.parse_args()
+
+    tag = normalizer_fingerprint()
+    for source_path in args.decks:
+        sentences = load_json_file(source_path)
+        if not sentences:
+            continue
+        try:
+            output_path = compile_deck(source_path, sentences, normalize_text, tag)
+        except (OSError, ValueError) as e:
+            print(f"{COLORS['wrong']}错误：{e}{COLORS['reset']}")
+            continue
+        print(f"{COLORS['correct']}{source_path} → {output_path} ({len(sentences)} 題){COLORS['reset']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+流式题库模块
+功能：边读边解析超大的题库JSON文件，第一题解析出来即可开始练习
+特点：
+1. 文件以内存映射方式打开，内容留在磁盘上，由系统按需读入
+2. 只记录每个句子在文件中的字节位置，用到时才解码和规范化
+3. 启动时间和内存占用不再随题库大小线性增长
+"""
+
+import json
+import mmap
+import re
+from array import array
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, Set, Tuple
+
+from deck import Card
+
+# JSON 字符串(字节形式)。UTF-8 多字节字符中不会出现 '"' 与 '\'，可直接按字节扫描
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_ENTRY = re.compile(rb'\s*(' + _STRING + rb')\s*:\s*(' + _STRING + rb')\s*([,}])', re.DOTALL)
+_OPEN = re.compile(rb'\s*\{\s*(\})?')
+
+# 每次继续解析的条目数
+SCAN_CHUNK = 4096
+# 已解码题目的缓存数量
+CARD_CACHE_SIZE = 1024
+
+
+class StreamingDeck:
+    """按需解析的题库
+
+    与 deck.DeckIndex 提供相同的出题接口(available、card_at、len)，
+    可直接交给 DeckCursor 与 practice_session 使用。
+
+    Args:
+        file_path: 题库JSON文件路径(格式为 {英文: 中文})
+        normalizer: 文本规范化函数(如 practice.normalize_text)
+
+    Raises:
+        ValueError: 文件不是 {英文: 中文} 格式的JSON对象
+    """
+
+    def __init__(self, file_path: str, normalizer: Callable[[str], str]):
+        self.file_path = file_path
+        self.normalizer = normalizer
+        self._file = open(file_path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            self._file.close()
+            raise ValueError(f"{file_path} 是空文件")
+        # 每个条目记录 4 个偏移：英文起止、中文起止(含引号)
+        self._offsets = array("Q")
+        self._cache: "OrderedDict[int, Card]" = OrderedDict()
+        self._english: Optional[Set[bytes]] = None  # 全部英文句子的 UTF-8，第一次判断句子是否在题库中时建立
+
+        match = _OPEN.match(self._data)
+        if match is None:
+            self.close()
+            raise ValueError(f"{file_path} 不是JSON对象")
+        self._scan_pos = match.end()
+        self._complete = match.group(1) is not None
+
+    def close(self) -> None:
+        """关闭内存映射和文件"""
+        self._data.close()
+        self._file.close()
+
+    # ---------- 解析 ----------
+
+    def _scan(self, limit: int) -> None:
+        """继续解析最多 limit 个条目，只记录偏移不解码"""
+        data, offsets, pos = self._data, self._offsets, self._scan_pos
+        for _ in range(limit):
+            match = _ENTRY.match(data, pos)
+            if match is None:
+                raise ValueError(f"{self.file_path} 在第 {pos} 字节处格式错误")
+            offsets.extend((match.start(1), match.end(1), match.start(2), match.end(2)))
+            pos = match.end()
+            if match.group(3) == b"}":
+                self._complete = True
+                break
+        self._scan_pos = pos
+
+    def available(self, at_least: int = 1) -> int:
+        """已解析的题目数；不足 at_least 时继续解析，直到足够或文件结束"""
+        while len(self) < at_least and not self._complete:
+            self._scan(SCAN_CHUNK)
+        return len(self._offsets) // 4
+
+    def scan_all(self) -> int:
+        """解析全部条目的偏移，返回题目总数"""
+        while not self._complete:
+            self._scan(SCAN_CHUNK)
+        return len(self._offsets) // 4
+
+    @property
+    def complete(self) -> bool:
+        """是否已解析到文件末尾"""
+        return self._complete
+
+    def __len__(self) -> int:
+        """已解析的题目数(调用 scan_all 后即为总数)"""
+        return len(self._offsets) // 4
+
+    def __bool__(self) -> bool:
+        return self.available(1) > 0
+
+    # ---------- 取题 ----------
+
+    def _decode(self, start: int, end: int) -> str:
+        return json.loads(self._data[start:end])
+
+    def entry(self, position: int) -> Tuple[str, str]:
+        """按文件顺序取第 position 个(英文, 中文)，只解码不规范化"""
+        base = position * 4
+        offsets = self._offsets
+        return (self._decode(offsets[base], offsets[base + 1]),
+                self._decode(offsets[base + 2], offsets[base + 3]))
+
+    def card_at(self, position: int) -> Card:
+        """按文件顺序取第 position 道题，首次使用时才解码和规范化"""
+        card = self._cache.get(position)
+        if card is not None:
+            self._cache.move_to_end(position)
+            return card
+        english, chinese = self.entry(position)
+        card = Card(english, chinese, self.normalizer(english))
+        self._cache[position] = card
+        if len(self._cache) > CARD_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return card
+
+    def __contains__(self, english: object) -> bool:
+        """句子是否在题库中
+
+        第一次调用时解析全部偏移，直接取文件中英文字符串的原始字节建立集合，
+        只有含转义的字符串才需要解码，不规范化任何题目。
+        """
+        if self._english is None:
+            self.scan_all()
+            data, offsets = self._data, self._offsets
+            found = set()
+            for base in range(0, len(offsets), 4):
+                raw = data[offsets[base] + 1:offsets[base + 1] - 1]
+                if b"\\" in raw:
+                    raw = self._decode(offsets[base], offsets[base + 1]).encode("utf-8")
+                found.add(raw)
+            self._english = found
+        return isinstance(english, str) and english.encode("utf-8") in self._english
+
+    def __iter__(self) -> Iterator[Card]:
+        """按文件顺序逐题产出，边解析边产出"""
+        position = 0
+        while position < self.available(position + 1):
+            yield self.card_at(position)
+            position += 1
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """与字典相同的(英文, 中文)视图，边解析边产出"""
+        position = 0
+        while position < self.available(position + 1):
+            yield self.entry(position)
+            position += 1
+
+
+def open_deck(file_path: str, normalizer: Callable[[str], str]) -> StreamingDeck:
+    """以流式方式打开题库，并解析出第一题
+
+    Raises:
+        OSError: 文件无法打开
+        ValueError: 文件格式错误
+    """
+    deck = StreamingDeck(file_path, normalizer)
+    try:
+        deck.available(1)
+    except ValueError:
+        deck.close()
+        raise
+    return deck
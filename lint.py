@@ -0,0 +1,413 @@
+"""
+题库检查程序
+功能：找出题库中拼错的单词、重复的句子与几乎相同的句子
+特点：
+1. 多进程分块处理：规范化、对照词表检查拼写、计算 MinHash 签名都在工作进程中完成
+2. 不在词表中的单词列为可能的拼写错误，并给出词表中只差一个字母的写法
+   (词表为 wordlist.txt，取自与题库无关的英文词频表；系统有 /usr/share/dict/words 时一并使用)
+3. 规范化后相同的句子(含同一文件中重复的键)列为重复
+4. 相近句子先用 MinHash/LSH 分桶找出候选对(每段的分桶在一个工作进程中进行)，
+   候选对的相似度也由多个进程计算，不必两两比较
+
+用法：
+    python lint.py                                   # 检查 json/ 下的所有题库
+    python lint.py json/单字.json json/日常.json      # 只检查指定的题库
+    python lint.py --wordlist my_words.txt --threshold 0.85 [-j 进程数]
+
+发现问题时以非零状态退出，可在提交题库前运行。
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import string
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from catalog import discover_decks
+from nearest import GRAM_SIZE
+from practice import COLORS, normalize_text
+from similarity import bounded_ratio
+
+DEFAULT_DECK_DIR = "json"
+DEFAULT_WORDLISTS = (os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlist.txt"),
+                     "/usr/share/dict/words")
+# 比这更短的单词(a、is、to…)不检查拼写
+MIN_WORD_LENGTH = 3
+# 相似度达到该值的两个不同句子列为相近(与 SequenceMatcher.ratio() 相同的尺度)
+NEAR_DUPLICATE_THRESHOLD = 0.9
+# 每个工作进程一次处理的句子数
+CHUNK_SIZE = 5000
+
+# MinHash 签名：一次哈希把三元组分到 BANDS * ROWS 个桶，每桶取最小值；
+# 第 j 段由第 j, j+BANDS, ... 个桶组成，两句某一段完全相同即成为候选对。
+# 相似度 0.9 的句子约有 97% 至少有一段相同，而不相关的句子很少落在同一段
+BANDS = 16
+ROWS = 4
+_BINS = BANDS * ROWS
+_MASK = 0xFFFFFFFF
+_MIX = 0x9E3779B1
+# 空桶按固定的随机顺序借用其他非空桶的值，所有进程的顺序相同
+_rng = random.Random(0x5EED)
+_PROBES = [[other for other in _rng.sample(range(_BINS), _BINS) if other != bin_] for bin_ in range(_BINS)]
+# 同一段键值的句子超过这么多时不再两两比较(通常是大量共用的短语)，只计数
+MAX_BUCKET = 200
+
+_WORD = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+
+# 工作进程中的词表
+_words: FrozenSet[str] = frozenset()
+
+
+class Location(NamedTuple):
+    """题目所在位置"""
+    deck: str      # 题库名
+    english: str   # 英文句子(题库中的键)
+
+
+class Report(NamedTuple):
+    """检查结果"""
+    sentences: int                                      # 检查的句子数
+    problems: List[Tuple[str, str]]                     # [(题库名, 格式问题)]
+    misspellings: List[Tuple[str, Optional[str], List[Location]]]  # [(单词, 建议写法, 出现位置)]
+    duplicates: List[List[Location]]                    # 每组为规范化后相同的句子
+    near_duplicates: List[Tuple[float, Location, Location]]  # [(相似度, 句子, 句子)]
+    skipped_buckets: int                                # 因过大而没有比较的段
+
+    @property
+    def issues(self) -> int:
+        return len(self.problems) + len(self.misspellings) + len(self.duplicates) + len(self.near_duplicates)
+
+
+def load_wordlist(paths: Iterable[str]) -> Dict[str, int]:
+    """读取词表(每行一个单词，# 开头为注释)，不存在的文件略过
+
+    Returns:
+        {单词: 第一次出现的序号}；词表按常用程度排列时序号越小越常用
+    """
+    words: Dict[str, int] = {}
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    word = line.strip().lower()
+                    if word and not line.startswith("#"):
+                        words.setdefault(word, len(words))
+        except FileNotFoundError:
+            continue
+    return words
+
+
+class _Pairs(list):
+    """JSON 对象的(键, 值)列表，与顶层为数组的 JSON 区分开"""
+
+
+def read_deck(file_path: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """读取题库中的全部条目(含重复的键)
+
+    Returns:
+        ([(英文, 中文)], 格式问题)
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            pairs = json.load(f, object_pairs_hook=_Pairs)
+    except (OSError, UnicodeDecodeError) as error:
+        return [], [f"無法讀取: {error}"]
+    except json.JSONDecodeError as error:
+        return [], [f"不是有效的JSON格式: {error}"]
+    if not isinstance(pairs, _Pairs):
+        return [], ["頂層不是物件"]
+    entries, problems = [], []
+    for english, chinese in pairs:
+        if not isinstance(chinese, str):
+            problems.append(f"{english!r} 的翻譯不是字串")
+        else:
+            entries.append((english, chinese))
+    return entries, problems
+
+
+def words(text: str) -> List[str]:
+    """句子中需要检查拼写的单词(小写，含 don't 这类带撇号的词)"""
+    return [word for word in _WORD.findall(text.lower()) if len(word) >= MIN_WORD_LENGTH]
+
+
+def is_known(word: str, wordlist: FrozenSet[str]) -> bool:
+    """单词是否在词表中；带撇号的词(teacher's)也接受撇号前的部分"""
+    return word in wordlist or ("'" in word and word.split("'", 1)[0] in wordlist)
+
+
+def signature(normalized: str) -> array:
+    """规范化句子的 MinHash 段键值(BANDS 个 32 位整数)
+
+    只哈希一次(one permutation hashing)：每个三元组按哈希值分到一个桶，每桶保留最小值；
+    短句的空桶按 _PROBES 的顺序借用非空桶的值，使每个桶仍近似一次独立的 MinHash。
+    用 zlib.crc32 而非 hash()，各进程算出的值相同。
+    """
+    data = normalized.encode("utf-8")
+    hashes = sorted({(zlib.crc32(data[i:i + GRAM_SIZE]) * _MIX) & _MASK
+                     for i in range(max(1, len(data) - GRAM_SIZE + 1))}, reverse=True)
+    # 从大到小写入，每个桶最后留下的是最小值
+    minimums = {(value * _BINS) >> 32: value for value in hashes}
+    if len(minimums) < _BINS:
+        filled = minimums.__contains__
+        values = [minimums[bin_] if bin_ in minimums else minimums[next(filter(filled, _PROBES[bin_]))]
+                  for bin_ in range(_BINS)]
+    else:
+        values = [minimums[bin_] for bin_ in range(_BINS)]
+    return array("I", (hash(tuple(values[band::BANDS])) & _MASK for band in range(BANDS)))
+
+
+def _init_worker(wordlist: FrozenSet[str]) -> None:
+    global _words
+    _words = wordlist
+
+
+def _scan_chunk(sentences: Sequence[str]) -> Tuple[List[str], array, List[Tuple[int, str]], Counter]:
+    """在工作进程中处理一组英文句子
+
+    Returns:
+        (规范化句子, 段键值(每句 BANDS 个，依次排列), [(句子序号, 词表中没有的单词)], 单词出现次数)
+    """
+    normalized = [normalize_text(sentence) for sentence in sentences]
+    keys = array("I")
+    for text in normalized:
+        keys.extend(signature(text))
+    unknown = []
+    frequency: Counter = Counter()
+    for number, sentence in enumerate(sentences):
+        tokens = words(sentence)
+        frequency.update(tokens)
+        unknown.extend((number, word) for word in tokens if not is_known(word, _words))
+    return normalized, keys, unknown, frequency
+
+
+def suggest(word: str, wordlist: Dict[str, int], frequency: Counter) -> Optional[str]:
+    """词表中与 word 只差一个字母(删除、插入、替换或相邻交换)的写法
+
+    题库中出现最多的优先，次数相同时取词表中靠前(更常用)的。
+    """
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    edits = {left + right[1:] for left, right in splits if right}
+    edits.update(left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1)
+    for letter in string.ascii_lowercase:
+        edits.update(left + letter + right[1:] for left, right in splits if right)
+        edits.update(left + letter + right for left, right in splits)
+    candidates = edits & wordlist.keys()
+    candidates.discard(word)
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: (-frequency[candidate], wordlist[candidate], candidate))
+
+
+def _band_pairs(column: array, lengths: array, stretch: float) -> Tuple[array, int]:
+    """在工作进程中处理一段：这一段键值相同且长度相近的句子两两配对
+
+    Args:
+        column: 每句在这一段的键值
+        lengths: 每句的长度
+        stretch: 配对的两句中较长的一句最多是较短一句的多少倍
+
+    Returns:
+        (候选对，每对编码为 较小序号 × 句子数 + 较大序号, 因过大而没有比较的桶数)
+    """
+    count = len(column)
+    sizes = Counter(column)
+    shared = {key for key, size in sizes.items() if 1 < size <= MAX_BUCKET}
+    skipped = sum(1 for size in sizes.values() if size > MAX_BUCKET)
+    buckets: Dict[int, List[int]] = {}
+    for number, key in enumerate(column):
+        if key in shared:
+            buckets.setdefault(key, []).append(number)
+    pairs = array("Q")
+    for members in buckets.values():
+        # 按长度排列，每句只与长度相近的句子配对
+        members.sort(key=lengths.__getitem__)
+        for position, first in enumerate(members):
+            longest = lengths[first] * stretch
+            for second in members[position + 1:]:
+                if lengths[second] > longest:
+                    break
+                pairs.append(first * count + second if first < second else second * count + first)
+    return pairs, skipped
+
+
+def candidate_pairs(texts: Sequence[str], keys: array, threshold: float,
+                    mapper: Callable = map) -> Tuple[List[Tuple[int, int]], int]:
+    """用 MinHash 段键值找出可能相近的句子对(至少有一段相同且长度相近)
+
+    Args:
+        texts: 互不相同的规范化句子
+        keys: 每句 BANDS 个段键值(signature 的结果依次排列)
+        threshold: 相似度下限
+        mapper: 与 map 相同的函数，传入进程池的 map 时各段在不同进程中分桶
+
+    Returns:
+        ([(句子序号, 句子序号)], 因过大而没有比较的段数)
+    """
+    count = len(texts)
+    lengths = array("I", map(len, texts))
+    # 较长的句子超过较短句子的这个倍数时，相似度不可能达到阈值
+    stretch = (2 - threshold) / threshold
+    columns = [keys[band::BANDS] for band in range(BANDS)]
+    seen: Set[int] = set()
+    pairs = []
+    skipped = 0
+    for band_pairs, band_skipped in mapper(_band_pairs, columns, itertools.repeat(lengths, BANDS),
+                                           itertools.repeat(stretch, BANDS)):
+        skipped += band_skipped
+        for pair in band_pairs:
+            if pair not in seen:  # 同一对常在好几段中相同
+                seen.add(pair)
+                pairs.append(divmod(pair, count))
+    return pairs, skipped
+
+
+def _check_pairs(pairs: Sequence[Tuple[str, str]], threshold: float) -> List[float]:
+    """在工作进程中计算一组候选句子对的相似度(低于阈值时为不超过阈值的上界)"""
+    return [bounded_ratio(first, second, threshold) for first, second in pairs]
+
+
+def lint(paths: Dict[str, str], wordlist: Dict[str, int], threshold: float = NEAR_DUPLICATE_THRESHOLD,
+         workers: Optional[int] = None, find_near: bool = True) -> Report:
+    """检查题库
+
+    Args:
+        paths: {题库名: 文件路径}
+        wordlist: 拼写检查用的词表(load_wordlist 的结果)
+        threshold: 相近句子的相似度下限
+        workers: 进程数，默认为 CPU 核心数
+        find_near: 是否查找相近句子
+
+    Returns:
+        检查结果
+    """
+    locations: List[Location] = []
+    problems: List[Tuple[str, str]] = []
+    for name, path in paths.items():
+        entries, deck_problems = read_deck(path)
+        locations.extend(Location(name, english) for english, _ in entries)
+        problems.extend((name, problem) for problem in deck_problems)
+
+    known = frozenset(wordlist)
+    sentences = [location.english for location in locations]
+    chunks = [sentences[i:i + CHUNK_SIZE] for i in range(0, len(sentences), CHUNK_SIZE)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks) or 1)
+    # 只有一块时直接在本进程中处理，省去启动进程的时间
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(known,))
+    else:
+        _init_worker(known)
+    mapper = pool.map if pool is not None else map
+    try:
+        normalized: List[str] = []
+        keys = array("I")
+        unknown: Dict[str, List[Location]] = {}
+        frequency: Counter = Counter()
+        for chunk_normalized, chunk_keys, chunk_unknown, chunk_frequency in mapper(_scan_chunk, chunks):
+            offset = len(normalized)
+            normalized.extend(chunk_normalized)
+            keys.extend(chunk_keys)
+            for number, word in chunk_unknown:
+                unknown.setdefault(word, []).append(locations[offset + number])
+            frequency.update(chunk_frequency)
+
+        misspellings = [(word, suggest(word, wordlist, frequency), places) for word, places in sorted(unknown.items())]
+
+        # 规范化后相同的句子只保留第一次出现的，用于查找相近句子
+        groups: Dict[str, List[int]] = {}
+        for number, text in enumerate(normalized):
+            if text:
+                groups.setdefault(text, []).append(number)
+            else:
+                problems.append((locations[number].deck, f"{locations[number].english!r} 規範化後為空"))
+        duplicates = [[locations[number] for number in numbers] for numbers in groups.values() if len(numbers) > 1]
+
+        near: List[Tuple[float, Location, Location]] = []
+        skipped = 0
+        if find_near:
+            texts = list(groups)
+            firsts = [numbers[0] for numbers in groups.values()]
+            unique_keys = array("I")
+            for number in firsts:
+                unique_keys.extend(keys[number * BANDS:(number + 1) * BANDS])
+            pairs, skipped = candidate_pairs(texts, unique_keys, threshold, mapper)
+            batches = [[(texts[a], texts[b]) for a, b in pairs[i:i + CHUNK_SIZE]]
+                       for i in range(0, len(pairs), CHUNK_SIZE)]
+            similarities = itertools.chain.from_iterable(
+                mapper(_check_pairs, batches, itertools.repeat(threshold, len(batches))))
+            near = sorted(((similarity, locations[firsts[a]], locations[firsts[b]])
+                           for (a, b), similarity in zip(pairs, similarities) if similarity >= threshold),
+                          key=lambda item: -item[0])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return Report(len(locations), problems, misspellings, duplicates, near, skipped)
+
+
+def _place(location: Location) -> str:
+    return f"{location.english!r} ({location.deck})"
+
+
+def print_report(report: Report) -> None:
+    """以彩色文字输出检查结果"""
+    wrong, almost, prompt, reset = COLORS['wrong'], COLORS['almost'], COLORS['prompt'], COLORS['reset']
+    for deck, problem in report.problems:
+        print(f"{wrong}格式 [{deck}] {problem}{reset}")
+    for word, suggestion, places in report.misspellings:
+        hint = f" → {suggestion}" if suggestion else ""
+        shown = "、".join(_place(place) for place in places[:3])
+        more = f" 等 {len(places)} 處" if len(places) > 3 else ""
+        print(f"{wrong}拼寫 {word}{hint}{reset}  {shown}{more}")
+    for group in report.duplicates:
+        print(f"{almost}重複 {'、'.join(_place(place) for place in group)}{reset}")
+    for similarity, first, second in report.near_duplicates:
+        print(f"{almost}相近 {similarity:.3f} {_place(first)} ≈ {_place(second)}{reset}")
+    if report.skipped_buckets:
+        print(f"{prompt}有 {report.skipped_buckets} 組共用同一段簽名的句子過多(超過 {MAX_BUCKET} 句)，未逐一比較{reset}")
+
+
+def main():
+    """程序主入口"""
+    parser = argparse.ArgumentParser(description="检查题库的拼写错误、重复与相近的句子")
+    parser.add_argument("decks", nargs="*", help=f"题库JSON文件(默认为 {DEFAULT_DECK_DIR}/ 下的全部题库)")
+    parser.add_argument("--wordlist", action="append", default=[], metavar="PATH",
+                        help="额外的词表(每行一个单词，可重复指定)")
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                        help=f"相近句子的相似度下限(默认{NEAR_DUPLICATE_THRESHOLD})")
+    parser.add_argument("--no-near", action="store_true", help="不查找相近的句子")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="进程数(默认为CPU核心数)")
+    args = parser.parse_args()
+
+    if args.decks:
+        paths = {os.path.splitext(os.path.basename(path))[0]: path for path in args.decks}
+    else:
+        paths = discover_decks(DEFAULT_DECK_DIR)
+    wordlist = load_wordlist(list(DEFAULT_WORDLISTS) + args.wordlist)
+    if not wordlist:
+        print(f"{COLORS['wrong']}錯誤：找不到詞表 {DEFAULT_WORDLISTS[0]}{COLORS['reset']}")
+        sys.exit(2)
+
+    start = time.perf_counter()
+    report = lint(paths, wordlist, args.threshold, args.workers, find_near=not args.no_near)
+    elapsed = time.perf_counter() - start
+
+    print_report(report)
+    color = COLORS['wrong'] if report.issues else COLORS['correct']
+    print(f"{color}{len(paths)} 個題庫、{report.sentences} 句：{len(report.problems)} 個格式問題、"
+          f"{len(report.misspellings)} 個可能拼錯的單詞、{len(report.duplicates)} 組重複、"
+          f"{len(report.near_duplicates)} 對相近的句子，耗時 {elapsed:.2f} 秒{COLORS['reset']}")
+    if report.issues:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
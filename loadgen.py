@@ -0,0 +1,131 @@
+"""
+判题服务压测程序
+功能：模拟大量同时练习的用户向 server.py 提交答案，统计每秒请求数与延迟分布
+特点：
+1. 每个模拟用户使用一条长连接，连续提交 /api/grade 请求
+2. 答案从题库中抽取，并随机加入拼写错误，覆盖正确、差一点和错误三种情况
+3. 输出每秒请求数以及 p50/p90/p99/最大延迟
+
+用法：
+    python server.py &
+    python loadgen.py [-c 并发用户数] [-d 持续秒数] [--host 127.0.0.1] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List, Tuple
+from urllib.parse import quote
+
+
+def _mutate(sentence: str, rng: random.Random) -> str:
+    """随机制造答案：原句、少量拼写错误或完全不同的句子"""
+    roll = rng.random()
+    if roll < 0.5 or not sentence:
+        return sentence
+    chars = list(sentence)
+    typos = 1 if roll < 0.8 else len(chars) // 2
+    for _ in range(typos):
+        chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+async def _fetch_json(host: str, port: int, path: str):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    """读取一个响应，返回状态码"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(lines[0].split(" ")[1])
+
+
+async def _learner(host: str, port: int, sentences: List[str], deadline: float, seed: int,
+                   latencies: List[float], errors: List[int]) -> None:
+    """一个模拟用户：在一条长连接上连续提交答案直到截止时间"""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            reference = rng.choice(sentences)
+            body = json.dumps({"answer": _mutate(reference, rng), "reference": reference}).encode("utf-8")
+            request = (f"POST /api/grade HTTP/1.1\r\nHost: {host}\r\n"
+                       f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run(host: str, port: int, concurrency: int, duration: float) -> Tuple[int, float, List[float], List[int]]:
+    """执行压测
+
+    Returns:
+        (请求数, 实际耗时, 各请求延迟(秒), 非200状态码)
+    """
+    decks = await _fetch_json(host, port, "/api/decks")
+    sentences: List[str] = []
+    for deck in decks:
+        sentences.extend(await _fetch_json(host, port, f"/api/decks/{quote(deck['name'])}"))
+    if not sentences:
+        raise SystemExit("服务端没有可用的题库")
+
+    latencies: List[float] = []
+    errors: List[int] = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        _learner(host, port, sentences, deadline, seed, latencies, errors)
+        for seed in range(concurrency)
+    ))
+    return len(latencies), time.perf_counter() - start, latencies, errors
+
+
+def main():
+    """程序主入口"""
+    parser = argparse.ArgumentParser(description="判题服务压测")
+    parser.add_argument("--host", default="127.0.0.1", help="服务地址(默认127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="服务端口(默认8000)")
+    parser.add_argument("-c", "--concurrency", type=int, default=200, help="并发用户数(默认200)")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="持续秒数(默认10)")
+    args = parser.parse_args()
+
+    count, elapsed, latencies, errors = asyncio.run(
+        run(args.host, args.port, args.concurrency, args.duration))
+    latencies.sort()
+    print(f"并发用户: {args.concurrency}  请求数: {count}  耗时: {elapsed:.1f}s  "
+          f"吞吐: {count / elapsed:.0f} req/s  错误: {len(errors)}")
+    print("延迟(ms): " + "  ".join(
+        f"{label} {_percentile(latencies, fraction) * 1000:.2f}"
+        for label, fraction in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("max", 1.0))
+    ))
+
+
+if __name__ == "__main__":
+    main()
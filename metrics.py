@@ -0,0 +1,191 @@
+"""
+耗时统计模块
+功能：记录练习中各环节(朗读、规范化、判题、提示、等待输入、画面帧)的耗时分布
+特点：
+1. 每个环节一个直方图，只保存各区间的计数，内存占用固定
+2. 关闭时计时器不做任何事，不影响练习速度
+3. 可导出为 JSON 或 Prometheus 文本格式，便于比较不同机器与版本
+"""
+
+import bisect
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# 直方图区间上限(秒)，覆盖从亚毫秒级的判题到数十秒的等待输入
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_NAME = "practice_latency_seconds"
+
+
+class Histogram:
+    """固定区间的耗时直方图
+
+    Args:
+        buckets: 递增的区间上限(秒)，超过最后一个上限的值计入溢出区间
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """记录一次耗时"""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram") -> None:
+        """并入另一个区间相同的直方图(如其他进程的统计)"""
+        if other.buckets != self.buckets:
+            raise ValueError("histogram buckets differ")
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, fraction: float) -> float:
+        """估计分位数：返回包含该分位的区间上限(溢出区间返回最大值)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for upper, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(upper, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": {str(upper): count for upper, count in zip(self.buckets, self.counts)},
+            "overflow": self.counts[-1],
+        }
+
+
+class Metrics:
+    """各环节耗时的集合
+
+    Args:
+        enabled: 为 False 时所有记录操作直接返回
+        buckets: 直方图区间上限(秒)
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()  # 朗读线程与主线程都会记录
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """记录某个环节的一次耗时"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """计时上下文：with metrics.time("normalize"): ..."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def stages(self) -> List[str]:
+        """已有记录的环节名称"""
+        with self._lock:
+            return sorted(self._histograms)
+
+    def histogram(self, stage: str) -> Optional[Histogram]:
+        return self._histograms.get(stage)
+
+    def snapshot(self) -> Dict[str, Histogram]:
+        """各环节直方图的副本，可传给其他进程后用 merge 合并"""
+        with self._lock:
+            snapshot = {}
+            for stage, histogram in self._histograms.items():
+                copy = snapshot[stage] = Histogram(histogram.buckets)
+                copy.merge(histogram)
+            return snapshot
+
+    def merge(self, histograms: Dict[str, Histogram]) -> None:
+        """并入 snapshot 得到的直方图"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for stage, histogram in histograms.items():
+                mine = self._histograms.get(stage)
+                if mine is None:
+                    mine = self._histograms[stage] = Histogram(histogram.buckets)
+                mine.merge(histogram)
+
+    # ---------- 导出 ----------
+
+    def to_json(self) -> str:
+        with self._lock:
+            data = {stage: histogram.to_dict() for stage, histogram in sorted(self._histograms.items())}
+        return json.dumps(data, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus 文本格式，每个环节为 stage 标签"""
+        lines = [
+            f"# HELP {METRIC_NAME} Latency of each practice stage in seconds.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for upper, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{upper}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """导出到文件：扩展名为 .json 时导出 JSON，否则为 Prometheus 格式；"-" 表示标准输出"""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        if path == "-":
+            sys.stdout.write(text)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def summary(self) -> List[str]:
+        """每个环节一行的摘要(次数、平均、p50、p99、最大，单位毫秒)"""
+        lines = []
+        for stage in self.stages():
+            h = self._histograms[stage]
+            lines.append(f"{stage:<16} n={h.count:<5} mean={h.total / h.count * 1000:8.1f}ms "
+                         f"p50≤{h.quantile(0.5) * 1000:8.1f}ms p99≤{h.quantile(0.99) * 1000:8.1f}ms "
+                         f"max={h.max * 1000:8.1f}ms")
+        return lines
@@ -0,0 +1,146 @@
+"""
+相近句子索引模块
+功能：答错时找出用户答案最接近的其他句子，提示“您翻译的是另一句”
+特点：
+1. 以规范化句子的字符三元组(trigram)建立倒排索引，每个三元组对应含有它的句子编号
+2. 由相似度阈值推出候选句子至少要共有的三元组数，查询时只需扫描答案中
+   最稀有的几个三元组的倒排表(前缀过滤)，常见的三元组不必扫描
+3. 句子按长度编号，只扫描长度可能达到阈值的一段倒排表
+4. 只对共有三元组最多的少数候选计算相似度：短句题库每次查询不到一毫秒，
+   三万句 15-40 个单词的长句约 2 毫秒，十万句长句约 4 毫秒
+5. 索引可在后台线程中建立(十万句长句约需十秒)，建立完成前查询直接返回空结果，答题不必等待
+"""
+
+import bisect
+import heapq
+import math
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from deck import Card
+from similarity import bounded_ratio
+
+GRAM_SIZE = 3
+# 进入精确比较的候选数量上限
+MAX_CANDIDATES = 8
+# 长句的前缀可能很长；相似度达到阈值的句子几乎共有答案的全部三元组，
+# 只扫描最稀有的这么多个倒排表已足以把它排进候选
+MAX_PREFIX = 12
+
+
+def grams(text: str) -> Set[str]:
+    """文本的字符三元组集合(不足三个字符时为整个文本)"""
+    if len(text) <= GRAM_SIZE:
+        return {text} if text else set()
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class SentenceIndex:
+    """题库句子的三元组倒排索引
+
+    索引在第一次查询时才建立，或由 build_in_background 在后台线程中建立，不拖慢启动与答题。
+
+    Args:
+        cards: 题库中的题目(DeckIndex、StreamingDeck、CompiledDeck 或 Card 序列)
+    """
+
+    def __init__(self, cards: Iterable[Card]):
+        self._source: Optional[Iterable[Card]] = cards
+        self._cards: List[Card] = []
+        self._lengths = array("I")  # 每个规范化句子的长度
+        self._postings: Dict[str, array] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def build(self) -> "SentenceIndex":
+        """立即建立索引(如服务启动时)；已建立时什么也不做，后台正在建立时等它完成"""
+        with self._lock:
+            if self._source is None:
+                return self
+            # 句子按规范化后的长度编号，倒排表中的编号也就按长度排列，
+            # 查询时用二分查找即可只取长度相近的一段
+            cards = sorted(self._source, key=lambda card: len(card.normalized))
+            postings_of: Dict[str, array] = {}
+            for number, card in enumerate(cards):
+                for gram in grams(card.normalized):
+                    postings = postings_of.get(gram)
+                    if postings is None:
+                        postings = postings_of[gram] = array("I")
+                    postings.append(number)
+            self._cards, self._postings = cards, postings_of
+            self._lengths = array("I", (len(card.normalized) for card in cards))
+            self._source = None  # 最后才标记为已建立，查询线程不会看到建了一半的索引
+        return self
+
+    def build_in_background(self) -> "SentenceIndex":
+        """在后台线程中建立索引，建立完成前 nearest 返回空列表"""
+        if self._source is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._build_quietly, name="nearest-index", daemon=True)
+            self._thread.start()
+        return self
+
+    def _build_quietly(self) -> None:
+        try:
+            self.build()
+        except (OSError, ValueError):
+            pass  # 题库读取失败(如文件已被删除)时不再提示相近句子
+
+    @property
+    def ready(self) -> bool:
+        """索引是否已建立"""
+        return self._source is None
+
+    def __len__(self) -> int:
+        return len(self.build()._cards)
+
+    def nearest(self, normalized: str, threshold: float, limit: int = 3,
+                exclude: Optional[str] = None) -> List[Tuple[Card, float]]:
+        """找出与规范化答案最相近的句子
+
+        Args:
+            normalized: 规范化后的用户答案
+            threshold: 相似度下限(与 SequenceMatcher.ratio() 相同的尺度)
+            limit: 最多返回的句子数
+            exclude: 不返回的英文句子(通常是当前题目)
+
+        Returns:
+            [(题目, 相似度)]，按相似度从高到低排列；后台尚未建好索引时为空列表
+        """
+        query = grams(normalized)
+        if not query or threshold <= 0:
+            return []
+        if not self.ready:
+            if self._thread is not None:
+                return []
+            self.build()
+        # 相似度达到 threshold 的句子与答案的编辑(插入/删除)次数不超过 edits，
+        # 每次编辑最多破坏 GRAM_SIZE 个三元组，因此两者至少共有 need 个三元组，
+        # 且必定出现在答案任意 len(query) - need + 1 个三元组之一的倒排表中
+        length = len(normalized)
+        edits = 2 * (1 - threshold) * length / threshold
+        need = max(1, math.ceil(len(query) - GRAM_SIZE * edits))
+        # 长度相差过大的句子相似度不可能达到阈值，只取编号在 [first, last) 内的一段
+        first = bisect.bisect_left(self._lengths, length * threshold / (2 - threshold))
+        last = bisect.bisect_right(self._lengths, length * (2 - threshold) / threshold)
+        known = [postings for postings in map(self._postings.get, query) if postings is not None]
+        prefix = len(known) - need + 1
+        if prefix <= 0:
+            return []
+        # 取整体最稀有的几个三元组，只统计其中长度相近的一段
+        counts: Counter = Counter()
+        for postings in heapq.nsmallest(min(prefix, MAX_PREFIX), known, key=len):
+            start = bisect.bisect_left(postings, first)
+            counts.update(postings[start:bisect.bisect_left(postings, last, start)])
+
+        results = []
+        for number, _ in counts.most_common(MAX_CANDIDATES):
+            card = self._cards[number]
+            if card.english == exclude or len(query & grams(card.normalized)) < need:
+                continue
+            similarity = bounded_ratio(normalized, card.normalized, threshold)
+            if similarity >= threshold:
+                results.append((card, similarity))
+        results.sort(key=lambda item: -item[1])
+        return results[:limit]
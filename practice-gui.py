@@ -1,19 +1,41 @@
 # 导入必要的库和模块
-import random  # 用于随机选择句子
+import argparse  # 命令行参数
+import time  # 计时
+STARTED_AT = time.perf_counter()  # 开始导入的时间，用于统计从启动到显示第一帧的耗时
 import pygame  # 用于游戏界面和事件处理
-import re  # 正则表达式库，用于文本处理
-import pyttsx3  # 用于文字转语音
-import time  # 用于时间控制
-import json  # 用于读取JSON数据
-import difflib  # 用于计算字符串相似度
-
-# 初始化pygame
-pygame.init()
+from practice import PRACTICE_SETTINGS, PROGRESS_SETTINGS, TTS_CACHE_SETTINGS, init_tts_engine, load_deck, normalize_text, restore_progress, start_audio_system, SilentSound  # 与命令列版共用的题库加载、答案规范化(含缩写扩展)、进度与TTS设置
+from progress import ProgressStore  # 学习进度数据库
+from tts import SpeechWorker  # 后台朗读线程，朗读时不阻塞主循环
+from tts_cache import AudioCache  # 磁盘语音缓存
+from srs import Scheduler  # 间隔重复调度器
+from session import grade_attempt  # 与命令列版、网页版共用的判题流程(含其他可接受的答案)
+from similarity import WRONG  # 判定结果
+from metrics import Metrics  # 各环节耗时统计
+from answers import load_accepted  # 题库旁 .accept.json 中的其他可接受答案
+
+# 命令行参数：--metrics 统计朗读、判题、等待输入与每帧耗时，退出时导出；--no-audio 不初始化音频和朗读
+parser = argparse.ArgumentParser(description="英语口语练习(图形界面)")
+parser.add_argument("--metrics", metavar="PATH",
+                    help="统计各环节耗时，退出时导出到文件(.json 为 JSON，其他为 Prometheus 格式，- 为标准输出)")
+parser.add_argument("--no-audio", action="store_true", help="无声模式：不播放音效也不朗读")
+args = parser.parse_args()
+metrics = Metrics(enabled=args.metrics is not None)
+
+# 只初始化画面和字体，音频在后台线程中初始化，不拖慢窗口出现
+pygame.display.init()
+pygame.font.init()
 
 # 加载数据和资源
-# 从"多鄰國.json"文件加载英文句子数据
-with open("json/english_sentence.json", "r", encoding="utf-8") as f:
-    english_sentence = json.load(f) # 使用 `json.load(f)` 将 JSON 文件的内容解析为 Python 数据结构 並存入變量english_sentencer
+# 从"english_sentence.json"文件加载英文句子数据并建立题库索引：
+# 每个正确答案只规范化一次，判题时只需处理用户输入；大题库会边读边出题
+deck = load_deck("json/english_sentence.json")
+# 其他可接受的答案(如 "Are you kidding" 之于 "Are you joking")，加载时编译成前缀树
+answers = load_accepted(["json/english_sentence.json"], normalize_text)
+# 间隔重复调度器：先复习到期的句子，再随机出新句子，每题 O(log n) 选取
+scheduler = Scheduler(deck)
+# 学习进度数据库(与命令列版共用)：载入上次的复习进度，作答记录由后台线程批量写入
+store = ProgressStore(PROGRESS_SETTINGS['db_path'], source="gui")
+restore_progress(store, scheduler, deck)
 
 # 设置窗口尺寸和创建主屏幕
 width, height = 800, 600
@@ -31,39 +53,23 @@ font_answer = pygame.font.SysFont("SimHei", 30)  # 答案字体
 font_tips = pygame.font.SysFont("SimHei", 25)  # 提示信息字体
 font_score = pygame.font.SysFont("SimHei", 25)  # 分数显示字体
 
-# 加载音频文件
-right_sound = pygame.mixer.Sound("sound/right.mp3")  # 正确回答音效
-wrong_sound = pygame.mixer.Sound("sound/wrong.wav")  # 错误回答音效
-
-# 初始化文字转语音引擎并设置参数
-engine = pyttsx3.init()
-engine.setProperty("voice", engine.getProperty("voices")[1].id)  # 设置语音类型
-engine.setProperty("rate", 145)  # 设置语速
-
-# 缩写词与全称映射字典
-abbreviation_mapping = {
-    # 示例缩写与全称配对
-    "it's": "it is",
-    "can't": "cannot",
-    "i'll": "i will",
-    "won't": "will not",
-    "i'm": "i am",
-    "you're": "you are",
-    "they're": "they are",
-    "we're": "we are",
-    "don't": "do not",
-    "didn't": "did not",
-    "doesn't": "does not",
-    # 添加更多的缩写和其对应的完整形式
-}
-
-# 扩展缩写的函数
-def expand_abbreviations(text):
-    """将文本中的缩写扩展为其全称"""
-    for abbr, full in abbreviation_mapping.items(): #abbr{縮寫} full{全寫}
-        text = text.replace(abbr, full) #用replace將abbr{縮寫} 替換為full{全寫}
-    text = text.replace(" ", "") #將文本中的空格替換為無
-    return text
+if args.no_audio:
+    right_sound, wrong_sound = SilentSound(), SilentSound()
+    engine = None  # 不朗读
+else:
+    # 在后台加载音频文件，加载完成前的音效不发声
+    right_sound, wrong_sound, _ = start_audio_system(metrics)  # 正确、错误回答音效
+
+    # 初始化文字转语音引擎并设置参数(引擎在后台线程中创建和使用，主循环只投递朗读请求)
+    engine = SpeechWorker(
+        lambda: init_tts_engine(voice_type=1, speech_rate=145),  # 语音类型、语速
+        cache=AudioCache(TTS_CACHE_SETTINGS['cache_dir'], TTS_CACHE_SETTINGS['max_mb'] * 1024 * 1024),
+        metrics=metrics,
+    )
+
+# 自定义事件：答对后延迟一段时间再切换到下一题(由计时器触发，不阻塞主循环)
+NEXT_QUESTION_EVENT = pygame.USEREVENT + 1
+FEEDBACK_DELAY_MS = 1000  # 答对后停留的毫秒数
 
 # 定义练习状态类
 class PracticeState:
@@ -74,93 +80,143 @@ class PracticeState:
         self.incorrect_num = 0  # 错误回答数量
         self.errors = {}  # 记录错误答案及其正确句子
         self.current_sentence = None  # 当前展示的句子
+        self.current_card = None  # 当前题目(含预先计算的判题键)
         self.current_english_sentence = None  # 当前英语句子
         self.current_answer = None  # 当前正确答案
         self.user_input_text = ""  # 用户输入的答案
         self.show_answer = False  # 是否显示答案
-
-    def practice(self):
-        """开始新的练习题目"""
-        # 随机选取一个问题
-        sentence_keys = list(english_sentence.keys())
-        random.shuffle(sentence_keys)
-        self.current_answer = sentence_keys[0]
+        self.waiting_next = False  # 答对后是否正在等待切换到下一题
+        self.reviewed = False  # 本题的首次作答结果是否已交给调度器
+        self.shown_at = 0.0  # 本题出现(或上次提交)的时间，用于统计等待输入的耗时
+        self.finished = False  # 题库中是否已没有可练习的句子(如题库为空或加载失败)
+
+    def practice(self, keep_input=False):
+        """开始新的练习题目，没有可练习的句子时回到开始界面并返回 False
+
+        keep_input 为 True 时保留等待期间用户已输入的文字
+        """
+        # 跳过未作答的题目稍后再出
+        if self.current_card is not None and not self.reviewed:
+            scheduler.postpone(self.current_card)
+        # 从调度器取出下一个问题(没有到期和新的句子时提前复习最早到期的句子)
+        self.current_card = scheduler.next_card(learn_ahead=True)
+        self.reviewed = False
+        if self.current_card is None:
+            self.is_running = False
+            self.finished = True
+            self.waiting_next = False
+            pygame.time.set_timer(NEXT_QUESTION_EVENT, 0)
+            return False
+        self.current_answer = self.current_card.english
         self.current_english_sentence = self.current_answer
-        self.current_sentence = english_sentence[self.current_answer]
-        self.user_input_text = ""  # 清空用户输入
+        self.current_sentence = self.current_card.chinese
+        if not keep_input:
+            self.user_input_text = ""  # 清空用户输入
         self.show_answer = False  # 隐藏答案
+        self.waiting_next = False
+        pygame.time.set_timer(NEXT_QUESTION_EVENT, 0)  # 取消尚未触发的切题计时器
         self.question_num += 1  # 问题计数加一
+        self.shown_at = time.perf_counter()
+        return True
 
     def check_answer(self, answer):
         """检查用户答案是否正确"""
-        # 处理答案（去除特殊字符，转换为小写，去空格），并展开缩写
-
-        #移除傳入參數answer非字母、数字、空白字符及撇号，将其转换为小写并删除空格，再将缩写展开为完整形式
-
-        #该表达式的含义为：r 表示这是一个 原始字符串（raw string）。使用原始字符串时，反斜杠 \ 不会被解释为转义字符，而是会被保留为普通字符。`^` 表示“非”，`\w` 表示所有字母和数字，`\s` 表示空白字符（空格、制表符等），`'’` 表示撇号和右撇号。
-        # re.sub()` 函数将这些匹配的字符替换为空字符串 `""`，即删除它们。
-
-        def normalize(text):
-            text = text.lower()  # 转小写
-            text = expand_abbreviations(text)  # 扩展缩写
-            text = re.sub(r"[^a-z0-9]", "", text)  # 去掉所有非字母数字字符
-            return text
-
-        # 使用difflib计算答案与正确答案的相似度
-        normalized_answer = normalize(answer)
-        normalized_correct = normalize(self.current_answer)
-
-        # 使用 difflib 计算相似度
-        ratio = difflib.SequenceMatcher(None, normalized_answer, normalized_correct).ratio()
-
-        # 如果相似度超过阈值，则认为回答正确
-        if ratio > 0.95:
+        now = time.perf_counter()
+        metrics.observe("input_wait", now - self.shown_at)
+        self.shown_at = now
+        # 与命令列版走同一判题流程：规范化(含缩写扩展)、相似度阈值与其他可接受的答案都相同
+        attempt = grade_attempt(self.current_card, answer, normalize_text,
+                                PRACTICE_SETTINGS['similarity_threshold'], metrics, answers=answers)
+
+        # 达到相似度阈值(含差一点)即认为回答正确
+        if attempt.verdict != WRONG:
+            self.record(attempt.verdict, answer, attempt.similarity)
             self.correct_num += 1
             right_sound.play()  # 播放正确音效
-            time.sleep(1)  # 等待一秒
-            self.practice()  # 进入下一题
+            self.user_input_text = ""  # 清空输入框，等待期间的输入会留给下一题
+            # 一秒后由计时器事件进入下一题，期间主循环照常绘制和接收按键
+            self.waiting_next = True
+            pygame.time.set_timer(NEXT_QUESTION_EVENT, FEEDBACK_DELAY_MS, 1)
             return True
         else:
+            self.record(WRONG, answer, attempt.similarity)
             self.incorrect_num += 1
             wrong_sound.play()  # 播放错误音效
-            time.sleep(1)  # 等待一秒
             # 记录错误答案
             self.errors.setdefault(self.current_answer, self.current_sentence)
             self.user_input_text = ""  # 清空输入框
             return False
 
+    def record(self, verdict, answer, similarity):
+        """保存每次作答；只有本题的首次作答交给调度器安排复习(重试只记入历史)"""
+        review_state = None
+        if not self.reviewed:
+            review_state = scheduler.review(self.current_card, verdict)
+            self.reviewed = True
+        store.record(self.current_card, answer, verdict, similarity, review_state)
+
 # 实例化练习状态
 state = PracticeState()
 
 # 文字转语音的函数
 def speak(audio):
-    """朗读文本"""
-    engine.say(audio)
-    engine.runAndWait()
+    """朗读文本(后台朗读，立即返回)"""
+    if engine is None:
+        return
+    with metrics.time("speak"):
+        engine.speak(audio)
+
+# 绘制缓存与帧率设置
+TEXT_CACHE_LIMIT = 256  # 文字图像缓存的最大数量，超过后整体清空
+ACTIVE_FPS = 60  # 有输入时的帧率
+IDLE_FPS = 10  # 无输入时的帧率，降低闲置时的CPU占用
+IDLE_AFTER_MS = 500  # 超过该毫秒数没有事件或画面变化即视为闲置
+
+# 按钮区域(绘制与点击判断共用)
+START_BUTTON = pygame.Rect(width // 2 - 100, 450, 150, 50)  # “开始练习”按钮
+NEXT_BUTTON = pygame.Rect(width - 200, height - 70, 150, 50)  # “下一题”按钮
+ANSWER_BUTTON = pygame.Rect(70, height - 70, 150, 50)  # “显示答案”按钮
+
+WHITE = (255, 255, 255)
+
+# 文字图像缓存：相同的(字体, 文字, 颜色)只渲染一次
+text_cache = {}
+
+def render_text(font, text, color=WHITE):
+    """渲染文字并缓存结果，内容不变时直接复用"""
+    key = (font, text, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        if len(text_cache) >= TEXT_CACHE_LIMIT:
+            text_cache.clear()
+        surface = text_cache[key] = font.render(text, True, color)
+    return surface
+
+def draw_text(font, text, **position):
+    """在指定位置绘制文字，返回占用的矩形(位置参数同 get_rect，如 center=(x, y))"""
+    surface = render_text(font, text)
+    rect = surface.get_rect(**position)
+    screen.blit(surface, rect)
+    return rect
+
+def is_hovered(rect):
+    """鼠标是否位于矩形内"""
+    return rect.collidepoint(pygame.mouse.get_pos())
 
 # 绘制按钮函数
-def draw_button(x, y, text, color, hover_color):
-    """绘制按钮并返回是否被点击"""
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    rect = pygame.Rect(x, y, 150, 50)  # 按钮矩形
-    clicked = False
-    if rect.collidepoint((mouse_x, mouse_y)):
-        pygame.draw.rect(screen, hover_color, rect)
-        # 鼠标左键按下则返回 True
-        if pygame.mouse.get_pressed()[0]:
-            clicked = True
-    else:
-        pygame.draw.rect(screen, color, rect)
+def draw_button(rect, text, color, hover_color):
+    """绘制按钮并返回按钮矩形(点击由事件处理负责)"""
+    pygame.draw.rect(screen, hover_color if is_hovered(rect) else color, rect)
     # 绘制文字
-    text_surface = font_answer.render(text, True, (0, 0, 0))
-    text_rect = text_surface.get_rect(center=(x + 75, y + 25))
+    text_surface = render_text(font_answer, text, (0, 0, 0))
+    text_rect = text_surface.get_rect(center=rect.center)
     screen.blit(text_surface, text_rect)
-    return clicked
+    return rect
 
 
 # 绘制用户输入文本的函数
 def draw_input_text(text, current_english_sentence):
-    """绘制用户输入框及提示文本"""
+    """绘制用户输入框及提示文本，返回输入框矩形"""
     # 计算输入框的宽度：获取 `current_english_sentence` 字符串的像素宽度，增加 30 像素的额外空间，
     # 并确保输入框宽度至少为 300 像素，以便足够容纳用户输入的文本。
     #font_input.size(current_english_sentence) 返回一个元组，包含了渲染文本的宽度和高度。[0] 是用来访问这个元组中的第一个元素，也就是文本的宽度。
@@ -168,45 +224,125 @@ def draw_input_text(text, current_english_sentence):
     # 创建输入框的矩形区域
     input_answer = pygame.Rect(width // 2 - input_text_width // 2, 250, input_text_width, 60)# 创建输入框的矩形区域（Rect）：将输入框水平居中对齐（计算方法为屏幕宽度的一半减去输入框宽度的一半），纵向位置固定在 y=250，輸入框的寬度為要輸入文本的寬度，高度为 60 像素。
     pygame.draw.rect(screen, (255, 255, 255), input_answer, 2)  # 在屏幕上绘制一个白色矩形，作为输入框的边框。矩形的位置和大小由 `input_answer` 定义，边框宽度为 2 像素。
-    # 创建并绘制用户输入的文本
-    input_text_surface = font_input.render(text, True, (255, 255, 255))# 使用 `font_input` 字体将 `text` 渲染为一张图像（Surface），文本颜色为白色 (255, 255, 255)，`True` 参数表示启用抗锯齿，确保文本边缘更平滑。
+    # 创建并绘制用户输入的文本(输入内容不变时复用缓存的图像)
+    input_text_surface = render_text(font_input, text)
 
     """輸入框 輸入文本的位置"""
     input_text_rect = input_text_surface.get_rect(topleft=(input_answer.left + 15, input_answer.top)) # 获取渲染后的文本图像的矩形边界（Rect），并将其左上角位置设置在输入框内的 (input_answer.left + 15, input_answer.top)，使文本在输入框内有适当的边距。
     screen.blit(input_text_surface, input_text_rect) # 获取渲染后的文本图像的矩形边界（Rect），并将其左上角位置设置在输入框内的 (input_answer.left + 15, input_answer.top)，使文本在输入框内有适当的边距。
-
-# 开始第一次练习
-state.practice()# 调用 `state.practice()` 方法，开始或重新开始一个新的练习题目。这将随机选择一个句子作为当前问题，并初始化用户输入等状态信息。
+    return input_answer.union(input_text_rect)
+
+
+# 开始界面的功能介绍
+start_tips = [
+    "功能特点:",
+    "1. 支持语音朗读英文句子",
+    "2. 自动检测翻译准确度",
+    "3. 记录错题并提供复习功能",
+    "4. 支持缩写自动扩展",
+    "5. 按Tab键重复朗读句子",
+    "6. 按Ctrl键显示答案",
+]
+
+def draw_start_tips():
+    """绘制开始界面的功能介绍，返回占用的矩形"""
+    rects = [draw_text(font_tips, tip, topleft=(width//2 - 250, 200 + i*35)) for i, tip in enumerate(start_tips)]
+    return rects[0].unionall(rects[1:])
+
+def scene_elements():
+    """列出当前画面的所有元素
+
+    每个元素为(名称, 内容键, 绘制函数)。内容键不变的元素无需重绘；
+    绘制函数返回元素占用的矩形(不显示时返回 None)。
+    """
+    elements = []
+    if state.is_running:
+        # 标题、当前句子、输入框、提示信息
+        elements.append(("title", None, lambda: draw_text(font_title, "英文单词练习", center=(width // 2, 100))))
+        elements.append(("sentence", state.current_sentence,
+                         lambda: state.current_sentence and draw_text(font_sentence, f'"{state.current_sentence}"', center=(width // 2, 200))))
+        elements.append(("input", (state.user_input_text, state.current_english_sentence),
+                         lambda: draw_input_text(state.user_input_text, state.current_english_sentence)))
+        elements.append(("tips", None, lambda: draw_text(font_tips, "请用英文翻译句子", center=(width // 2, 450))))
+        # 显示答案
+        elements.append(("answer", (state.show_answer, state.current_answer),
+                         lambda: state.show_answer and draw_text(font_answer, f"答案: {state.current_answer}", center=(width // 2, 500))))
+        # “下一题”与“显示答案”按钮，颜色为白色，鼠标悬停时变为灰色
+        elements.append(("next_button", is_hovered(NEXT_BUTTON),
+                         lambda: draw_button(NEXT_BUTTON, "下一题", (255, 255, 255), (200, 200, 200))))
+        elements.append(("answer_button", is_hovered(ANSWER_BUTTON),
+                         lambda: draw_button(ANSWER_BUTTON, "显示答案", (255, 255, 255), (200, 200, 200))))
+    else:
+        # 开始界面：标题、功能介绍、开始按钮
+        elements.append(("title", None, lambda: draw_text(font_title, "英文口语练习", midtop=(width // 2, 100))))
+        elements.append(("tips", None, draw_start_tips))
+        elements.append(("finished", state.finished,
+                         lambda: state.finished and draw_text(font_tips, "题库中没有可练习的句子，请检查题库文件",
+                                                              center=(width // 2, 540))))
+        elements.append(("start_button", is_hovered(START_BUTTON),
+                         lambda: draw_button(START_BUTTON, "开始练习", (0,255,0), (255,255,0))))
+    # 显示分数
+    elements.append(("score", state.correct_num,
+                     lambda: draw_text(font_score, f"答对: {state.correct_num}", topright=(width - 20, 20))))
+    return elements
+
+def next_question(keep_input=False):
+    """进入下一题并朗读，同时在后台预先合成再下一题的语音"""
+    if not state.practice(keep_input):
+        return
+    speak(state.current_english_sentence)  # 朗读当前的英语句子
+    upcoming = scheduler.peek(learn_ahead=True)
+    if upcoming is not None and engine is not None:
+        engine.prefetch(upcoming.english)
+
+def start_practice():
+    """开始练习并朗读第一题"""
+    state.is_running = True  # 开始练习
+    next_question()  # 启动新的练习
+
+# 第一题在按下“开始练习”时才从调度器取出，开始界面停留期间不占用题目
 
 running = True # 当 `running` 为 `True` 时，主循环将持续运行；当 `running` 变为 `False` 时，主循环将退出。
 
 clock = pygame.time.Clock()# 创建一个 `Clock` 对象，用于控制游戏主循环的帧率。通过调用 `clock.tick()` 方法，可以限制循环的速度，确保游戏运行平稳。
 
+# 上一帧绘制的画面与各元素的内容键、矩形，用于计算需要重绘的区域
+drawn_scene = None
+drawn_keys = {}
+drawn_rects = {}
+last_activity = pygame.time.get_ticks()  # 最近一次有事件或画面变化的时间
+startup_recorded = False  # 是否已记录从启动到第一帧的耗时
+
 while running:
     # 主循环：当 `running` 为 `True` 时，持续执行以下代码块，以处理事件和更新屏幕。
+    frame_start = time.perf_counter()  # 统计每帧处理事件与绘制的耗时(不含等待下一帧的时间)
 
     # 事件处理
-    for event in pygame.event.get():
+    events = pygame.event.get()
+    for event in events:
         # 处理所有从 Pygame 事件队列中获取的事件
         if event.type == pygame.QUIT:
             # 如果事件类型为 `QUIT`（例如点击关闭窗口），将 `running` 设置为 `False`，退出主循环
             running = False
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            # 如果事件类型为 `MOUSEBUTTONDOWN`（鼠标点击事件）
+        elif event.type == pygame.VIDEOEXPOSE:
+            # 窗口被遮挡后重新显示，下一帧整屏重绘
+            drawn_scene = None
+        elif event.type == NEXT_QUESTION_EVENT:
+            # 答对后的停留时间结束，进入下一题并保留等待期间输入的文字
+            if state.waiting_next:
+                next_question(keep_input=True)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            # 如果事件类型为 `MOUSEBUTTONDOWN`（鼠标左键点击事件）
             if not state.is_running:
-                # 如果练习尚未开始
-                if width // 2 - 75 <= event.pos[0] <= width // 2 + 75 and height // 2 - 25 <= event.pos[1] <= height // 2 + 25:
-                    # 检查鼠标点击位置是否在“开始练习”按钮区域内
-                    state.is_running = True  # 开始练习
-                    state.practice()  # 启动新的练习
-                    speak(state.current_english_sentence)  # 朗读当前的英语句子
+                # 如果练习尚未开始，检查鼠标点击位置是否在“开始练习”按钮区域内
+                if START_BUTTON.collidepoint(event.pos):
+                    start_practice()
             else:
                 # 如果练习正在进行
-                if width - 200 <= event.pos[0] <= width - 50 and height - 70 <= event.pos[1] <= height - 20:
+                if NEXT_BUTTON.collidepoint(event.pos):
                     # 检查鼠标点击位置是否在“下一题”按钮区域内
-                    state.practice()  # 进入下一题
-                    speak(state.current_english_sentence)  # 朗读当前的英语句子
-                if 70 <= event.pos[0] <= 220 and height - 70 <= event.pos[1] <= height - 20:
+                    next_question()  # 进入下一题并朗读
+                if ANSWER_BUTTON.collidepoint(event.pos):
                     # 检查鼠标点击位置是否在“显示答案”按钮区域内
                     state.show_answer = True  # 显示当前题目的答案
         elif event.type == pygame.KEYDOWN and state.is_running:
@@ -216,11 +352,9 @@ while running:
                 if state.user_input_text.strip() == "":
                     # 输入框为空，朗读当前句子
                     speak(state.current_english_sentence)
-                else:
-                    # 输入框有文字，提交答案
-                    if state.check_answer(state.user_input_text):
-                        state.practice()  # 如果正确，进入下一题
-                        speak(state.current_english_sentence)
+                elif not state.waiting_next:
+                    # 输入框有文字，提交答案；答对时由计时器事件进入下一题
+                    state.check_answer(state.user_input_text)
 
             elif event.key == pygame.K_BACKSPACE:
                 # 如果按下的是退格键
@@ -235,101 +369,55 @@ while running:
                 # 如果按下的是左 Ctrl 键
                 state.show_answer = True  # 显示当前题目的答案
 
-    # 绘制界面元素
-    screen.blit(image, (0, 0))  # 在屏幕上绘制背景图片
-
-    # 绘制标题
-    title_surface = font_title.render("英文单词练习", True, (255, 255, 255))
-    # 使用 `font_title` 字体渲染标题文本，颜色为白色，启用抗锯齿
-    title_rect = title_surface.get_rect(center=(width // 2, 100))
-    # 获取文本矩形区域，并将其中心设置在屏幕上方的指定位置
-    screen.blit(title_surface, title_rect)
-    # 在屏幕上绘制标题
-
-    # 绘制当前句子
-    if state.current_sentence:
-        sentence_surface = font_sentence.render(f'"{state.current_sentence}"', True, (255, 255, 255))
-        # 使用 `font_sentence` 字体渲染当前句子文本，颜色为白色，启用抗锯齿
-        sentence_rect = sentence_surface.get_rect(center=(width // 2, 200))
-        # 获取文本矩形区域，并将其中心设置在屏幕中间的指定位置
-        screen.blit(sentence_surface, sentence_rect)
-        # 在屏幕上绘制当前句子
-
-    # 绘制用户输入框
-    draw_input_text(state.user_input_text, state.current_english_sentence)
-    # 调用 `draw_input_text` 函数绘制用户输入框及当前英语句子
-
-    # 绘制提示信息
-    tips_surface = font_tips.render("请用英文翻译句子", True, (255, 255, 255))
-    # 使用 `font_tips` 字体渲染提示信息文本，颜色为白色，启用抗锯齿
-    tips_rect = tips_surface.get_rect(center=(width // 2, 450))
-    # 获取文本矩形区域，并将其中心设置在屏幕下方的指定位置
-    screen.blit(tips_surface, tips_rect)
-    # 在屏幕上绘制提示信息
-
-    # 显示答案
-    if state.show_answer:
-        answer_surface = font_answer.render(f"答案: {state.current_answer}", True, (255, 255, 255))
-        # 使用 `font_answer` 字体渲染答案文本，颜色为白色，启用抗锯齿
-        answer_rect = answer_surface.get_rect(center=(width // 2, 500))
-        # 获取文本矩形区域，并将其中心设置在屏幕下方的指定位置
-        screen.blit(answer_surface, answer_rect)
-        # 在屏幕上绘制当前题目的答案
-
-    # 绘制开始/继续练习按钮和显示答案按钮
-
-
-    if not state.is_running:
-        # 背景
-        screen.blit(image, (0,0))
-
-        # 标题
-        title = font_title.render("英文口语练习", True, (255,255,255))
-        screen.blit(title, (width//2 - title.get_width()//2, 100))
-
-        # 功能介绍
-        tips = [
-            "功能特点:",
-            "1. 支持语音朗读英文句子",
-            "2. 自动检测翻译准确度",
-            "3. 记录错题并提供复习功能",
-            "4. 支持缩写自动扩展",
-            "5. 按Tab键重复朗读句子",
-            "6. 按Ctrl键显示答案",
-        ]
-        for i, tip in enumerate(tips):
-            text = font_tips.render(tip, True, (255,255,255))
-            screen.blit(text, (width//2 - 250, 200 + i*35))
-
-        # 开始按钮
-        if draw_button(width//2 - 100, 450, "开始练习", (0,255,0), (255,255,0)):
-            state.is_running = True
-            state.practice()
-            speak(state.current_english_sentence)  # 朗读当前的英语句子
-
+    # 绘制界面元素：只重绘内容发生变化的元素，并只刷新这些区域
+    elements = scene_elements()
+    if state.is_running != drawn_scene:
+        # 切换画面(开始界面 ↔ 练习界面)时整屏重绘
+        screen.blit(image, (0, 0))  # 在屏幕上绘制背景图片
+        drawn_keys.clear()
+        drawn_rects.clear()
+        for name, key, draw in elements:
+            drawn_keys[name] = key
+            drawn_rects[name] = draw() or None
+        drawn_scene = state.is_running
+        pygame.display.flip()
+        last_activity = pygame.time.get_ticks()
+        if not startup_recorded:
+            metrics.observe("startup", time.perf_counter() - STARTED_AT)
+            startup_recorded = True
     else:
-        # 如果练习正在进行
-        draw_button(width - 200, height - 70, "下一题", (255, 255, 255), (200, 200, 200))
-        # 绘制“下一题”按钮，颜色为白色，鼠标悬停时变为灰色
-        draw_button(70, height - 70, "显示答案", (255, 255, 255), (200, 200, 200))
-        # 绘制“显示答案”按钮，颜色为白色，鼠标悬停时变为灰色
-
-    # 显示分数
-    score_surface = font_score.render(f"答对: {state.correct_num}", True, (255, 255, 255))
-    # 使用 `font_score` 字体渲染分数文本，颜色为白色，启用抗锯齿
-    score_rect = score_surface.get_rect(topright=(width - 20, 20))
-    # 获取文本矩形区域，并将其右上角设置在屏幕的指定位置
-    screen.blit(score_surface, score_rect)
-    # 在屏幕上绘制当前的分数
-
-    # 更新屏幕
-    pygame.display.flip()
-    # 更新整个屏幕显示，将所有绘制的内容刷新到屏幕上
-
-    # 控制帧率
-    clock.tick(60)
-    # 控制主循环的最大帧率为 60 帧每秒，确保游戏运行平稳
-
-# 退出pygame
+        dirty_rects = []
+        for name, key, draw in elements:
+            if drawn_keys.get(name) == key:
+                continue
+            # 先用背景盖住旧内容，再绘制新内容
+            old_rect = drawn_rects.get(name)
+            if old_rect:
+                screen.blit(image, old_rect, old_rect)
+                dirty_rects.append(old_rect)
+            new_rect = draw() or None
+            if new_rect:
+                dirty_rects.append(new_rect)
+            drawn_keys[name] = key
+            drawn_rects[name] = new_rect
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+            # 更新有变化的区域，而不是整个屏幕
+            last_activity = pygame.time.get_ticks()
+
+    if events:
+        last_activity = pygame.time.get_ticks()
+    metrics.observe("gui_frame", time.perf_counter() - frame_start)
+
+    # 控制帧率：有输入时 60 帧每秒，闲置时降低帧率以节省CPU
+    idle = pygame.time.get_ticks() - last_activity > IDLE_AFTER_MS
+    clock.tick(IDLE_FPS if idle else ACTIVE_FPS)
+
+# 停止后台朗读线程并退出pygame
+if engine is not None:
+    engine.close()
+store.close()
+if args.metrics:
+    metrics.dump(args.metrics)
 pygame.quit()
 # 退出 Pygame 库，释放资源并关闭游戏窗口
@@ -9,18 +9,44 @@
 5. 支持缩写自动扩展(如将"it's"转为"it is")
 """
 
+import time
+
+# 开始导入的时间，用于统计从启动到出现第一题的耗时
+STARTED_AT = time.perf_counter()
+
+import argparse
+import hashlib
+import itertools
 import json
-import pygame
 import os
-import pyttsx3
 import re
-import random
 import difflib
-import time
-from typing import Dict, Tuple
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from abbreviations import APOSTROPHES, AbbreviationExpander
+from answers import AcceptedAnswers, load_accepted
+from audio import DEFAULT_BUFFER, DEFAULT_FREQUENCY, DEFAULT_PCM_DIR, FeedbackSound, load_feedback, open_mixer
+from catalog import discover_decks, load_catalog
+from deck import Card, DeckIndex
+from deck_binary import CompiledDeck, compile_in_background, compiled_path, open_fresh
+from deck_stream import StreamingDeck, open_deck
+from metrics import Metrics
+from nearest import SentenceIndex
+from progress import DEFAULT_DB_PATH, ProgressStore
+from session import Attempt, PracticeSession, ReviewSession
+from similarity import ALMOST, CORRECT, WRONG, Alignment
+from srs import Scheduler
+from tts import SpeechWorker
+from tts_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_MB, AudioCache
+
+# pygame 与 pyttsx3 只在真正需要声音时才导入，无声模式下完全不加载
+if TYPE_CHECKING:
+    import pygame
+    import pyttsx3
 
 # ===================== 可自定义参数区域 =====================
-# 缩写词与全称映射字典 - 可自行添加更多缩写
+# 缩写词与全称映射字典 - 可自行添加更多缩写(大小写不敏感，按完整单词匹配)
 ABBREVIATION_MAPPING = {
     "it's": "it is", "can't": "cannot", "won't": "will not",
     "i'm": "i am", "you're": "you are", "they're": "they are",
@@ -35,6 +61,17 @@ VOICE_SETTINGS = {
     'speech_rate': 135  # 语速(正常值约100-200)
 }
 
+# 语音缓存设置(已合成的句子保存在磁盘上，重播时直接播放文件)
+TTS_CACHE_SETTINGS = {
+    'cache_dir': DEFAULT_CACHE_DIR,  # 缓存目录
+    'max_mb': DEFAULT_MAX_MB  # 容量上限(MB)，超过时删除最久未使用的语音
+}
+
+# 学习进度设置(作答记录与复习进度保存在 SQLite 数据库中，命令列版与图形版共用)
+PROGRESS_SETTINGS = {
+    'db_path': DEFAULT_DB_PATH  # 数据库文件路径
+}
+
 # 音频文件路径
 SOUND_FILES = {
     'correct': "sound/right.mp3",
@@ -42,10 +79,21 @@ SOUND_FILES = {
     'success': "sound/success.mp3"
 }
 
+# 音效设置(音效解码一次后以 PCM 保存，答对/答错音效与朗读使用各自的声道)
+AUDIO_SETTINGS = {
+    'frequency': DEFAULT_FREQUENCY,  # 采样率
+    'buffer': DEFAULT_BUFFER,  # 混音器缓冲区帧数：越小音效越及时，声音断续时调大(如 512、1024)
+    'pcm_cache_dir': DEFAULT_PCM_DIR  # 已解码音效的保存目录
+}
+
 # 练习设置
 PRACTICE_SETTINGS = {
     'similarity_threshold': 0.95,  # 答案相似度阈值(0-1之间)
-    'retry_wrong_questions': True  # 是否自动重做错题
+    'retry_wrong_questions': True,  # 是否自动重做错题
+    'show_nearest': True,  # 答错时是否提示答案与题库中哪一句相近(可能翻译成了另一题)
+    'word_hint_min_length': 60,  # 正确答案(规范化后)达到该长度时，提示按整个单词标出差异
+    'streaming_min_mb': 8,  # 题库文件超过该大小(MB)时边读边出题，不一次性载入内存
+    'deck_dir': "json"  # 题库目录(使用 --deck/--all 选择题库时从这里查找)
 }
 
 # 颜色代码(控制台输出颜色)
@@ -60,18 +108,25 @@ COLORS = {
 }
 # ===================== 可自定义参数区域结束 =====================
 
+# 预编译的缩写扩展器，CLI 与 GUI 共用；运行时新增缩写请调用 abbreviation_expander.update()
+abbreviation_expander = AbbreviationExpander(ABBREVIATION_MAPPING)
+# 规范化时保留的字符(字母数字、空白与直/弯撇号)；弯撇号随后统一为直撇号
+_PUNCTUATION = re.compile(rf"[^\w\s{APOSTROPHES}]")
+_KEPT = re.compile(rf"[\w\s{APOSTROPHES}]+")
+_FOLD_APOSTROPHES = str.maketrans(APOSTROPHES, "'" * len(APOSTROPHES))
+
 def expand_abbreviations(text: str) -> str:
     """扩展文本中的缩写为完整形式
 
+    所有缩写预先编译为一个正则，单次扫描完成替换，且只匹配完整单词。
+
     Args:
         text: 需要处理的文本
 
     Returns:
         处理后的文本，所有已知缩写已被替换为完整形式
     """
-    for abbr, full in ABBREVIATION_MAPPING.items():
-        text = text.replace(abbr, full)
-    return text
+    return abbreviation_expander.expand(text)
 
 def load_json_file(file_path: str) -> Dict[str, str]:
     """加载包含练习句子的JSON文件
@@ -92,24 +147,112 @@ def load_json_file(file_path: str) -> Dict[str, str]:
         print(f"{COLORS['wrong']}错误：文件 {file_path} 不是有效的JSON格式{COLORS['reset']}")
         return {}
 
-def init_audio_system() -> Tuple[pygame.mixer.Sound, pygame.mixer.Sound, pygame.mixer.Sound]:
-    """初始化音频系统并加载音效
+def normalizer_fingerprint() -> bytes:
+    """规范化规则的指纹(缩写表或保留的字符变化时随之改变)，用于判断二进制题库是否过期"""
+    rules = [_PUNCTUATION.pattern, sorted(abbreviation_expander.mapping.items())]
+    return hashlib.sha256(json.dumps(rules, ensure_ascii=False).encode("utf-8")).digest()
+
+def load_deck(file_path: str) -> Union[DeckIndex, StreamingDeck, CompiledDeck]:
+    """加载题库并建立索引，每个句子的规范化答案只在加载时计算一次
+
+    已编译过(或超过 streaming_min_mb)的题库在编译结果与源JSON、缩写表一致时直接内存映射二进制文件；
+    编译结果缺失或过期时先流式加载(第一题解析出来即可开始，其余句子用到时才解码和规范化)，
+    同时在后台重新编译，下次启动即可直接使用。
+
+    Args:
+        file_path: JSON文件路径
+
+    Returns:
+        题库索引(加载失败时为空索引)
+    """
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        size = 0
+    is_large = size > PRACTICE_SETTINGS['streaming_min_mb'] * 1024 * 1024
+    if is_large or os.path.exists(compiled_path(file_path)):
+        tag = normalizer_fingerprint()
+        deck = open_fresh(file_path, normalize_text, tag)
+        if deck is not None:
+            return deck
+        try:
+            deck = open_deck(file_path, normalize_text)
+        except ValueError:
+            deck = None  # 流式解析只支持 {英文: 中文} 字符串，其他写法改为一次性载入
+        if deck is not None:
+            compile_in_background(file_path, normalize_text, tag, load_json_file)
+            return deck
+    return DeckIndex(load_json_file(file_path), normalize_text)
+
+class SilentSound:
+    """不发声的音效，用于无声模式或没有音频设备的环境"""
+
+    def play(self) -> None:
+        return None
+
+
+class LazySound:
+    """在后台加载的音效：加载完成前播放不发声"""
+
+    def __init__(self):
+        self.sound: Optional[Union[FeedbackSound, SilentSound]] = None
+
+    def play(self) -> None:
+        sound = self.sound
+        if sound is not None:
+            sound.play()
+
+
+def init_audio_system(metrics: Optional[Metrics] = None) -> Tuple[FeedbackSound, FeedbackSound, FeedbackSound]:
+    """以小缓冲区初始化音频系统并载入已解码的音效
+
+    没有音频设备(如通过 SSH 或在容器中运行)时返回不发声的音效。
+
+    Args:
+        metrics: 耗时统计(音效载入耗时与每次播放的触发延迟)，为 None 时不统计
 
     Returns:
         包含三个音效的元组：(正确音效, 错误音效, 成功音效)
     """
-    pygame.mixer.init()
+    # 在后台导入时不输出 pygame 的欢迎信息，以免插入到输入提示中
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
     try:
-        right = pygame.mixer.Sound(SOUND_FILES['correct'])
-        wrong = pygame.mixer.Sound(SOUND_FILES['wrong'])
-        success = pygame.mixer.Sound(SOUND_FILES['success'])
-        return right, wrong, success
+        output_latency = open_mixer(AUDIO_SETTINGS['frequency'], AUDIO_SETTINGS['buffer'])
     except pygame.error as e:
+        print(f"{COLORS['wrong']}无法初始化音频设备: {e}{COLORS['reset']}")
+        return SilentSound(), SilentSound(), SilentSound()
+    try:
+        sounds = load_feedback(SOUND_FILES, output_latency, AUDIO_SETTINGS['pcm_cache_dir'], metrics)
+        return sounds['correct'], sounds['wrong'], sounds['success']
+    except (pygame.error, OSError) as e:
         print(f"{COLORS['wrong']}音频加载错误: {e}{COLORS['reset']}")
         # 返回空音效以避免程序崩溃
-        return pygame.mixer.Sound(), pygame.mixer.Sound(), pygame.mixer.Sound()
+        return SilentSound(), SilentSound(), SilentSound()
+
+def start_audio_system(metrics: Optional[Metrics] = None) -> Tuple[LazySound, LazySound, LazySound]:
+    """在后台线程中导入 pygame、初始化音频系统并加载音效，立即返回
+
+    加载完成前练习已可开始，期间的音效不发声。
 
-def init_tts_engine(voice_type: int, speech_rate: int) -> pyttsx3.Engine:
+    Args:
+        metrics: 耗时统计，为 None 时不统计
+
+    Returns:
+        包含三个音效的元组：(正确音效, 错误音效, 成功音效)
+    """
+    sounds = (LazySound(), LazySound(), LazySound())
+
+    def load() -> None:
+        for lazy, sound in zip(sounds, init_audio_system(metrics)):
+            lazy.sound = sound
+
+    # 非守护线程：立即退出时等加载结束，避免解释器关闭时中断 pygame 的导入
+    threading.Thread(target=load, name="audio-init").start()
+    return sounds
+
+def init_tts_engine(voice_type: int, speech_rate: int) -> "pyttsx3.Engine":
     """初始化文本转语音(TTS)引擎
 
     Args:
@@ -119,6 +262,8 @@ def init_tts_engine(voice_type: int, speech_rate: int) -> pyttsx3.Engine:
     Returns:
         配置好的TTS引擎实例
     """
+    import pyttsx3
+
     engine = pyttsx3.init()
 
     # 设置语音属性
@@ -131,21 +276,38 @@ def init_tts_engine(voice_type: int, speech_rate: int) -> pyttsx3.Engine:
     engine.setProperty('rate', speech_rate)
     return engine
 
-def speak(engine: pyttsx3.Engine, text: str) -> None:
+def speak(engine: Union["pyttsx3.Engine", SpeechWorker, None], text: str) -> None:
     """使用TTS引擎朗读文本
 
+    传入 SpeechWorker 时在后台朗读并立即返回，否则阻塞直到朗读结束。
+
     Args:
-        engine: 已初始化的TTS引擎
+        engine: 已初始化的TTS引擎或后台朗读线程，为 None(无声模式)时不朗读
         text: 要朗读的文本
     """
+    if engine is None:
+        return
+    if isinstance(engine, SpeechWorker):
+        engine.speak(text)
+        return
     engine.say(text)
     engine.runAndWait()
 
+def prefetch_speech(engine: Union["pyttsx3.Engine", SpeechWorker, None], text: str) -> None:
+    """在用户作答时预先合成下一句的语音(仅后台朗读线程支持)
+
+    Args:
+        engine: 已初始化的TTS引擎或后台朗读线程
+        text: 下一题的英文句子
+    """
+    if isinstance(engine, SpeechWorker):
+        engine.prefetch(text)
+
 def normalize_text(text: str) -> str:
     """规范化用户输入的文本以便比较
 
     处理步骤:
-    1. 移除非字母数字字符(保留空格和撇号)
+    1. 移除非字母数字字符(保留空格和撇号，弯撇号统一为直撇号)
     2. 转换为小写
     3. 扩展缩写
     4. 移除所有空格
@@ -157,7 +319,7 @@ def normalize_text(text: str) -> str:
         规范化后的文本
     """
     # 移除非字母数字字符(保留空格和撇号)
-    cleaned = re.sub(r"[^\w\s'']", "", text)
+    cleaned = _PUNCTUATION.sub("", text).translate(_FOLD_APOSTROPHES)
     # 转换为小写并扩展缩写
     normalized = expand_abbreviations(cleaned.lower())
     # 移除所有空格
@@ -179,214 +341,409 @@ def print_result(correct_count: int, wrong_count: int) -> None:
     )
 
 
+def normalize_with_spans(text: str) -> Tuple[str, List[int], List[int]]:
+    """与 normalize_text 相同的规范化，并记下每个字符来自原文的哪一段
+
+    Returns:
+        (规范化后的文本, 每个字符在原文中的起始位置, 在原文中的最后一个位置)
+    """
+    kept: List[int] = []  # 清除标点后每个字符在原文中的位置
+    pieces: List[str] = []
+    for match in _KEPT.finditer(text):
+        kept += range(match.start(), match.end())
+        pieces.append(match.group())
+    lowered = "".join(pieces).lower().translate(_FOLD_APOSTROPHES)
+    if len(lowered) != len(kept):
+        # 极少数字符转小写后长度改变，无法逐字对应，退回整句
+        kept = [0] * len(lowered)
+    expanded, firsts, lasts = abbreviation_expander.expand_with_spans(lowered)
+    present = list(map(" ".__ne__, expanded))
+    return (expanded.replace(" ", ""),
+            list(itertools.compress(map(kept.__getitem__, firsts), present)),
+            list(itertools.compress(map(kept.__getitem__, lasts), present)))
+
+
+def _word_spans(text: str, position: int) -> Tuple[int, int]:
+    """原文中包含 position 的整个单词(以空白分隔)的范围"""
+    start = position
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    end = position
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return start, end
+
+
+def build_hint(user_answer: str, correct_answer: str, alignment: Optional[Alignment] = None,
+               word_level: Optional[bool] = None, color: bool = True) -> str:
+    """根据判题时的对齐结果标出用户答案缺少或多余的部分
+    - 缺少的字母标黄(显示正确答案中的写法)，不用颜色时以 [ ] 括起
+    - 多余的字母标红，不用颜色时以 { } 括起
+
+    Args:
+        user_answer: 用户输入的原文
+        correct_answer: 正确答案原文
+        alignment: 判题时求得的对齐结果(grade_aligned 的返回值)，为 None 时重新比较
+        word_level: 是否按整个单词标出；为 None 时正确答案较长(见 word_hint_min_length)才按单词
+        color: 是否以终端颜色标出差异；写入文件等场合传 False，改用括号标出
+
+    Returns:
+        以小写显示的正确答案，差异部分带颜色(或括号)
+    """
+    user, user_starts, user_lasts = normalize_with_spans(user_answer)
+    correct, correct_starts, correct_lasts = normalize_with_spans(correct_answer)
+    # 对齐结果须与这里的规范化结果一致(如缩写表已改变则重新比较)
+    if alignment is None or (alignment and (alignment[-1][2], alignment[-1][4]) != (len(user), len(correct))):
+        alignment = difflib.SequenceMatcher(None, user, correct).get_opcodes()
+    if word_level is None:
+        word_level = len(correct) >= PRACTICE_SETTINGS['word_hint_min_length']
+    text = correct_answer.lower()
+    if len(text) != len(correct_answer):
+        text = correct_answer
+    answer = user_answer.lower()
+    if len(answer) != len(user_answer):
+        answer = user_answer
+
+    # 正确答案原文中缺少的字符，以及插在某个位置之前的多余输入
+    missing = bytearray(len(text))
+    extras: Dict[int, List[str]] = {}
+    for tag, i1, i2, j1, j2 in alignment:
+        if tag in ("replace", "insert"):
+            for start, last in zip(correct_starts[j1:j2], correct_lasts[j1:j2]):
+                missing[start:last + 1] = b"\x01" * (last + 1 - start)
+        elif tag == "delete":
+            first, last = user_starts[i1], user_lasts[i2 - 1] + 1
+            # 紧接在前一个字母之后的多余输入(如 teh 的 h)标在该字母后面，否则标在下一个字母前面
+            if j1 > 0 and first > 0 and not answer[first - 1].isspace():
+                at = correct_lasts[j1 - 1] + 1
+                word = _word_spans(text, at - 1)
+            else:
+                at = correct_starts[j1] if j1 < len(correct_starts) else len(text)
+                word = _word_spans(text, at) if at < len(text) else (at, at)
+            whole = _word_spans(answer, first)[0] == first and _word_spans(answer, last - 1)[1] == last
+            if word_level:
+                if not whole:
+                    # 拼错的单词：正确的写法标黄，用户输入的整个单词标红
+                    missing[word[0]:word[1]] = b"\x01" * (word[1] - word[0])
+                at = word[0]
+                first, last = _word_spans(answer, first)[0], _word_spans(answer, last - 1)[1]
+            extra = answer[first:last]
+            if (whole or word_level) and at == word[0]:
+                # 与前后的单词隔开
+                extra = extra + " " if at < len(text) else " " + extra
+            if extra not in extras.get(at, ()):
+                extras.setdefault(at, []).append(extra)
+    if word_level:
+        for match in re.finditer(r"\S+", text):
+            start, end = match.span()
+            if any(missing[start:end]):
+                missing[start:end] = b"\x01" * (end - start)
+
+    missing_open, missing_close = (COLORS['answer'], COLORS['reset']) if color else ("[", "]")
+    extra_open, extra_close = (COLORS['wrong'], COLORS['reset']) if color else ("{", "}")
+    cuts = sorted({0, len(text), *extras, *(i for i in range(1, len(text)) if missing[i] != missing[i - 1])})
+    pieces: List[str] = []
+    for start, end in zip(cuts, cuts[1:] + [None]):
+        for extra in extras.get(start, ()):
+            pieces.append(f"{extra_open}{extra}{extra_close}")
+        if end is None:
+            break
+        segment = text[start:end]
+        pieces.append(f"{missing_open}{segment}{missing_close}" if missing[start] else segment)
+    return "".join(pieces)
+
+
 def highlight_letter_differences(user_answer: str, correct_answer: str) -> str:
     """
-    对比用户输入与正确答案，标注缺少或多余的字母
+    对比用户输入与正确答案，逐个字母标注缺少或多余的字母
     - 缺少的字母标黄
     - 多余的字母标红
     """
-    ua = user_answer
-    ca = correct_answer
-    s = difflib.SequenceMatcher(None, ua, ca)
-    result = ""
-
-    for tag, i1, i2, j1, j2 in s.get_opcodes():
-        if tag == "equal":
-            result += ca[j1:j2]  # 相同部分直接加
-        elif tag == "replace":
-            # 用户输入错或少了，正确答案显示黄色
-            result += f"{COLORS['answer']}{ca[j1:j2]}{COLORS['reset']}"
-        elif tag == "insert":
-            # 正确答案多，用户少输入 → 黄色
-            result += f"{COLORS['answer']}{ca[j1:j2]}{COLORS['reset']}"
-        elif tag == "delete":
-            # 用户多输入 → 红色
-            result += f"{COLORS['wrong']}{ua[i1:i2]}{COLORS['reset']}"
-    return result
+    return build_hint(user_answer, correct_answer, word_level=False)
+
 
+def format_question(number: int, chinese: str) -> str:
+    """构建第 number 题的问题字符串"""
+    return (
+        f"\n{COLORS['prompt']}{number}. 請用英文翻譯{COLORS['reset']} "
+        f"\"{COLORS['question']}{chinese}{COLORS['reset']}\"\n"
+        f"{COLORS['prompt']}翻譯:{COLORS['reset']} "
+    )
+
+def ask(engine: Union["pyttsx3.Engine", SpeechWorker, None], card: Card, question: str) -> str:
+    """朗读英文句子并等待输入，空输入时重新朗读
 
-def review_wrong_questions(wrong_answers: Dict[str, str],
-                          engine: pyttsx3.Engine,
-                          right_sound: pygame.mixer.Sound,
-                          wrong_sound: pygame.mixer.Sound) -> None:
+    Returns:
+        用户输入的答案(非空)
+    """
+    speak(engine, card.english)
+    user_answer = input(question)
+    while not user_answer.strip():
+        speak(engine, card.english)
+        user_answer = input(question)
+    return user_answer
+
+def show_attempt(attempt: Attempt, right_sound: "pygame.mixer.Sound",
+                 wrong_sound: "pygame.mixer.Sound", metrics: Optional[Metrics] = None) -> None:
+    """播放音效并显示判定结果(差一点时高亮缺少的字母，答错时显示正确翻译)"""
+    if attempt.verdict == CORRECT:
+        right_sound.play()
+        print(f"{COLORS['correct']}————翻譯正確😊{COLORS['reset']}")
+    elif attempt.verdict == ALMOST:
+        right_sound.play()
+        print(f"{COLORS['almost']}————差一點哦😅{COLORS['reset']}")
+        # 输出提示：用判题时的对齐结果高亮缺少的字母(长句按单词)；按其他写法判题时对照该写法
+        with (metrics or Metrics(enabled=False)).time("hint"):
+            highlighted = build_hint(attempt.answer, attempt.accepted or attempt.card.english, attempt.alignment)
+        print(f"{COLORS['prompt']}提示: {COLORS['reset']}{highlighted}")
+    else:
+        wrong_sound.play()
+        print(f"{COLORS['wrong']}————翻譯錯誤😡{COLORS['reset']}")
+        print(f"{COLORS['answer']}正確翻譯: {attempt.card.english}{COLORS['reset']}")
+        # 答案与题库中的另一句相近：很可能翻译成了另一题
+        for other, _ in attempt.nearest:
+            print(f"{COLORS['almost']}您翻譯的是另一句: {other.english} ({other.chinese}){COLORS['reset']}")
+    if attempt.verdict != WRONG and attempt.accepted is not None:
+        # 按其他可接受的写法判对时，也列出题库中的标准译法
+        print(f"{COLORS['answer']}標準譯法: {attempt.card.english}{COLORS['reset']}")
+
+
+def review_wrong_questions(wrong_answers: Union[DeckIndex, Dict[str, str]],
+                          engine: Union["pyttsx3.Engine", SpeechWorker, None],
+                          right_sound: "pygame.mixer.Sound",
+                          wrong_sound: "pygame.mixer.Sound",
+                          index: Optional[SentenceIndex] = None,
+                          answers: Optional[AcceptedAnswers] = None,
+                          store: Optional[ProgressStore] = None) -> None:
     """复习错题功能
 
     Args:
-        wrong_answers: 错题字典{英文: 中文}
-        engine: TTS引擎
+        wrong_answers: 错题索引或错题字典{英文: 中文}
+        engine: TTS引擎或后台朗读线程
         right_sound: 回答正确音效
         wrong_sound: 回答错误音效
+        index: 整个题库的相近句子索引，答错时提示相近的其他句子；为 None 时不提示
+        answers: 各题其他可接受的答案，为 None 时只接受题目的英文句子
+        store: 学习进度数据库，复习中的作答记入历史(不改变复习安排)；为 None 时不保存
     """
     if not wrong_answers:
         return
 
+    if not isinstance(wrong_answers, DeckIndex):
+        wrong_answers = DeckIndex(wrong_answers, normalize_text)
+
     print(f"\n{COLORS['wrong']}開始複習錯題:{COLORS['reset']}")
-    question_num = 0
-
-    # 复制一份错题字典以避免修改迭代中的字典
-    remaining_questions = wrong_answers.copy()
-
-    while remaining_questions:
-        for english, chinese in list(remaining_questions.items()):
-            question_num += 1
-            # 构建问题字符串
-            question = (
-                f"\n{COLORS['prompt']}{question_num}. 請用英文翻譯{COLORS['reset']} "
-                f'"{COLORS['question']}{chinese}{COLORS['reset']}"\n'
-                f"{COLORS['prompt']}翻譯:{COLORS['reset']} "
-            )
-
-            # 朗读英文句子
-            speak(engine, english)
-            user_answer = input(question)
+    review = ReviewSession(wrong_answers, PRACTICE_SETTINGS['similarity_threshold'], index=index, answers=answers,
+                           store=store)
 
-            # 处理空输入
-            while not user_answer.strip():
-                speak(engine, english)
-                user_answer = input(question)
-
-            # 检查是否要退出
-            if user_answer.lower() == "quit":
-                print(f"{COLORS['prompt']}退出複習模式{COLORS['reset']}")
-                return
-
-            # 规范化答案并比较
-            normalized_user = normalize_text(user_answer)
-            normalized_correct = normalize_text(english)
-            similarity = difflib.SequenceMatcher(None, normalized_user, normalized_correct).ratio()
-
-            if similarity > PRACTICE_SETTINGS['similarity_threshold']:
-                right_sound.play()
-                print(f"{COLORS['correct']}————翻譯正確😊{COLORS['reset']}")
-                del remaining_questions[english]
-            elif similarity >= PRACTICE_SETTINGS['similarity_threshold']:
-              right_sound.play()
-              print(f"{COLORS['almost']}————差一點哦😅{COLORS['reset']}")
-              # 输出提示：高亮缺少的字母
-              highlighted = highlight_letter_differences(user_answer.lower(), english.lower())
-              print(f"{COLORS['prompt']}提示: {COLORS['reset']}{highlighted}")
-              del remaining_questions[english]
-            else:
-                wrong_sound.play()
-                print(f"{COLORS['wrong']}————翻譯錯誤😡{COLORS['reset']}")
-                print(f"{COLORS['answer']}正確翻譯: {english}{COLORS['reset']}")
+    for question_num, card in enumerate(review.questions(), 1):
+        user_answer = ask(engine, card, format_question(question_num, card.chinese))
 
-        # 所有错题都回答正确后显示祝贺信息
-        if not remaining_questions:
-            time.sleep(1)
-            print(f"{COLORS['correct']}————恭喜您已將錯題全部清空，請再繼續吧(≧▽≦q)！{COLORS['reset']}")
+        # 检查是否要退出
+        if user_answer.lower() == "quit":
+            print(f"{COLORS['prompt']}退出複習模式{COLORS['reset']}")
+            return
 
+        show_attempt(review.submit(card, user_answer), right_sound, wrong_sound)
 
-quit_early = False
+    # 所有错题都回答正确后显示祝贺信息
+    time.sleep(1)
+    print(f"{COLORS['correct']}————恭喜您已將錯題全部清空，請再繼續吧(≧▽≦q)！{COLORS['reset']}")
 
-def practice_session(sentences: Dict[str, str],
-                    right_sound: pygame.mixer.Sound,
-                    wrong_sound: pygame.mixer.Sound,
-                    success_sound: pygame.mixer.Sound,
-                    engine: pyttsx3.Engine) -> None:
+
+def practice_session(sentences: Union[DeckIndex, StreamingDeck, CompiledDeck, Dict[str, str]],
+                    right_sound: "pygame.mixer.Sound",
+                    wrong_sound: "pygame.mixer.Sound",
+                    success_sound: "pygame.mixer.Sound",
+                    engine: Union["pyttsx3.Engine", SpeechWorker, None],
+                    scheduler: Optional[Scheduler] = None,
+                    store: Optional[ProgressStore] = None,
+                    metrics: Optional[Metrics] = None,
+                    answers: Optional[AcceptedAnswers] = None) -> None:
     """主练习会话
 
+    出题、判题与复习安排由 PracticeSession 完成，这里只负责朗读、输入与显示。
+
     Args:
-        sentences: 中英对照句子字典{英文: 中文}
+        sentences: 题库索引(含流式、二进制题库)或中英对照句子字典{英文: 中文}
         right_sound: 正确回答音效
         wrong_sound: 错误回答音效
         success_sound: 成功音效
-        engine: TTS引擎
+        engine: TTS引擎或后台朗读线程，为 None 时不朗读
+        scheduler: 间隔重复调度器，默认为题库新建一个
+        store: 学习进度数据库，为 None 时不保存作答记录
+        metrics: 各环节耗时统计，为 None 时不统计
+        answers: 各题其他可接受的答案(题库旁的 .accept.json)，为 None 时只接受题目的英文句子
     """
     if not sentences:
         print(f"{COLORS['wrong']}错误: 没有可用的练习句子{COLORS['reset']}")
         return
 
-    # 随机打乱问题顺序
-    sentence_items = list(sentences.items())
-    random.shuffle(sentence_items)
-
-    wrong_answers = {}
-    correct_count = wrong_count = 0
-
-    for idx, (english, chinese) in enumerate(sentence_items, 1):
-        # 构建问题字符串
-        question = (
-            f"\n{COLORS['prompt']}{idx}. 請用英文翻譯{COLORS['reset']} "
-            f'"{COLORS['question']}{chinese}{COLORS['reset']}"\n'
-            f"{COLORS['prompt']}翻譯:{COLORS['reset']} "
-        )
-
-        # 朗读英文句子
-        speak(engine, english)
-        user_answer = input(question)
-
-        # 处理空输入
-        while not user_answer.strip():
-            speak(engine, english)
+    # 判题键只在建立索引时计算一次
+    if isinstance(sentences, (DeckIndex, StreamingDeck, CompiledDeck)):
+        deck = sentences
+    else:
+        deck = DeckIndex(sentences, normalize_text)
+    if metrics is None:
+        metrics = Metrics(enabled=False)
+
+    # 间隔重复出题：先复习到期的句子，再随机出新句子(整副题库出完前不会重复)
+    session = PracticeSession(deck, normalize_text, PRACTICE_SETTINGS['similarity_threshold'],
+                              scheduler=scheduler, store=store, metrics=metrics,
+                              find_nearest=PRACTICE_SETTINGS['show_nearest'], answers=answers)
+
+    for idx, card in enumerate(session.questions(), 1):
+        # 朗读英文句子(后台朗读时提示会立即出现)，并预先合成下一题
+        with metrics.time("speak"):
+            speak(engine, card.english)
+            upcoming = session.peek()
+            if upcoming is not None:
+                prefetch_speech(engine, upcoming.english)
+        if idx == 1:
+            # 从开始导入到出现第一题的耗时
+            metrics.observe("startup", time.perf_counter() - STARTED_AT)
+        with metrics.time("input_wait"):
+            question = format_question(idx, card.chinese)
             user_answer = input(question)
+            # 处理空输入
+            if not user_answer.strip():
+                user_answer = ask(engine, card, question)
 
         # 检查是否要退出
         if user_answer.lower() == "quit":
-            print_result(correct_count, wrong_count)
-            quit_early = True
             break
 
-        # 规范化答案并比较
-        normalized_user = normalize_text(user_answer)
-        normalized_correct = normalize_text(english)
-        similarity = difflib.SequenceMatcher(None, normalized_user, normalized_correct).ratio()
-
-        if similarity == 1:
-            correct_count += 1
-            right_sound.play()
-            print(f"{COLORS['correct']}————翻譯正確😊{COLORS['reset']}")
-        elif similarity >= PRACTICE_SETTINGS['similarity_threshold']:
-            correct_count += 1
-            right_sound.play()
-            print(f"{COLORS['almost']}————差一點哦😅{COLORS['reset']}")
-            # 输出提示：高亮缺少的字母
-            highlighted = highlight_letter_differences(user_answer.lower(), english.lower())
-            print(f"{COLORS['prompt']}提示: {COLORS['reset']}{highlighted}")
-        else:
-            wrong_count += 1
-            wrong_sound.play()
-            wrong_answers[english] = chinese
-            print(f"{COLORS['wrong']}————翻譯錯誤😡{COLORS['reset']}")
-            print(f"{COLORS['answer']}正確翻譯: {english}{COLORS['reset']}")
+        # 规范化答案并比较(正确答案的规范化结果已在索引中)
+        show_attempt(session.submit(card, user_answer), right_sound, wrong_sound, metrics)
 
     # 显示最终结果
-    if not quit_early:
-      print_result(correct_count, wrong_count)
+    print_result(session.correct_count, session.wrong_count)
 
     # 如果有错题且设置为需要复习，则进入复习模式
-    if wrong_answers and PRACTICE_SETTINGS['retry_wrong_questions']:
+    if session.wrong_cards and PRACTICE_SETTINGS['retry_wrong_questions']:
         print("\n" + "---" * 20)
         choice = input(f"{COLORS['prompt']}是否要練習錯題? (按Enter開始，或输入quit退出){COLORS['reset']} ")
         if choice.lower() != "quit":
-            review_wrong_questions(wrong_answers, engine, right_sound, wrong_sound)
+            review_wrong_questions(session.review().deck, engine, right_sound, wrong_sound, session.index,
+                                   session.answers, session.store)
+
+
+def restore_progress(store: ProgressStore, scheduler: Scheduler,
+                     deck: Union[DeckIndex, StreamingDeck, CompiledDeck]) -> int:
+    """把数据库中属于当前题库的复习进度载入调度器
+
+    Returns:
+        载入的句子数
+    """
+    if not len(store):
+        return 0
+    # 各种题库都能按句子判断是否在题库中(二进制题库查文件中的散列表)，不必先解码全部题目
+    return store.restore(scheduler, normalize_text, deck)
+
+def parse_args() -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="英语口语练习(中翻英)")
+    parser.add_argument("-d", "--deck", action="append", metavar="NAME",
+                        help="只练习指定题库(文件名，不含.json)，可重复指定以混合多个题库")
+    parser.add_argument("--all", action="store_true", help="混合练习题库目录下的所有题库")
+    parser.add_argument("-s", "--search", metavar="QUERY",
+                        help="只练习中文提示或英文句子含有查询词的题目(多个词以空格分隔)，可与 --deck 合用")
+    parser.add_argument("--list", action="store_true", help="列出所有题库及重复的句子后退出")
+    parser.add_argument("--worst", nargs="?", const=100, type=int, metavar="N",
+                        help="列出最常答错的 N 个句子(默认100)后退出")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="统计各环节耗时，结束时导出到文件(.json 为 JSON，其他为 Prometheus 格式，- 为标准输出)")
+    parser.add_argument("--no-audio", action="store_true",
+                        help="无声模式：不加载 pygame 与 pyttsx3，不播放音效也不朗读(适合 SSH 或容器)")
+    return parser.parse_args()
 
 def main():
     """程序主入口"""
+    args = parse_args()
+
+    if args.worst is not None:
+        store = ProgressStore(PROGRESS_SETTINGS['db_path'])
+        for rank, stats in enumerate(store.worst(args.worst), 1):
+            print(f"{COLORS['prompt']}{rank}. {COLORS['question']}{stats.english}{COLORS['reset']} "
+                  f"({stats.chinese}) {COLORS['wrong']}錯 {stats.wrong}{COLORS['reset']} / 共 {stats.attempts}")
+        store.close()
+        return
+
     # 1. 加载练习数据
-    data_file = "json/english_sentence.json"  # 可修改为您的JSON文件路径
-    sentences = load_json_file(data_file)
+    if args.deck or args.all or args.list or args.search:
+        # 并行加载题库目录下的所有题库，再按需选取
+        catalog = load_catalog(PRACTICE_SETTINGS['deck_dir'], load_deck, normalize_text)
+        if args.list:
+            for name in catalog.deck_names:
+                print(f"{COLORS['question']}{name}{COLORS['reset']}")
+            for group in catalog.duplicates():
+                entries = ", ".join(f"{english} ({'/'.join(tags)})" for english, tags in group)
+                print(f"{COLORS['almost']}重複: {entries}{COLORS['reset']}")
+            return
+        try:
+            if args.search:
+                # 在所选题库(默认全部)中搜索，找到的题目组成临时题库
+                sentences = catalog.search(args.search, args.deck)
+                print(f"{COLORS['prompt']}搜尋「{args.search}」找到 {len(sentences)} 題{COLORS['reset']}")
+            else:
+                sentences = catalog.select(None if args.all else args.deck)
+        except KeyError as e:
+            print(f"{COLORS['wrong']}错误：{e.args[0]}{COLORS['reset']}")
+            return
+        deck_paths = list(discover_decks(PRACTICE_SETTINGS['deck_dir']).values())
+    else:
+        data_file = "json/english_sentence.json"  # 可修改为您的JSON文件路径
+        sentences = load_deck(data_file)
+        deck_paths = [data_file]
 
     if not sentences:
         return
-
-    # 2. 初始化音频系统
-    right_sound, wrong_sound, success_sound = init_audio_system()
-
-    # 3. 初始化TTS引擎
-    tts_engine = init_tts_engine(
-        voice_type=VOICE_SETTINGS['voice_type'],
-        speech_rate=VOICE_SETTINGS['speech_rate']
-    )
+    # 题库旁的 .accept.json 列出的其他可接受答案，加载时编译成前缀树
+    answers = load_accepted(deck_paths, normalize_text)
+    for error in answers.errors:
+        print(f"{COLORS['wrong']}警告：{error}{COLORS['reset']}")
+
+    # 2. 初始化音频系统与TTS引擎：都在后台线程中加载，第一题不必等待；无声模式下完全跳过
+    metrics = Metrics(enabled=args.metrics is not None)
+    if args.no_audio:
+        right_sound, wrong_sound, success_sound = SilentSound(), SilentSound(), SilentSound()
+        tts_engine = None
+    else:
+        right_sound, wrong_sound, success_sound = start_audio_system(metrics)
+        tts_engine = SpeechWorker(lambda: init_tts_engine(
+            voice_type=VOICE_SETTINGS['voice_type'],
+            speech_rate=VOICE_SETTINGS['speech_rate']
+        ), cache=AudioCache(TTS_CACHE_SETTINGS['cache_dir'], TTS_CACHE_SETTINGS['max_mb'] * 1024 * 1024),
+            metrics=metrics)
+
+    # 3. 载入学习进度：到期的句子优先复习，已学过的句子不再作为新题出现
+    store = ProgressStore(PROGRESS_SETTINGS['db_path'])
+    scheduler = Scheduler(sentences)
+    resumed = restore_progress(store, scheduler, sentences)
+    if resumed:
+        print(f"{COLORS['prompt']}已載入 {resumed} 個句子的學習進度{COLORS['reset']}")
 
     # 4. 开始练习会话
-    practice_session(
-        sentences=sentences,
-        right_sound=right_sound,
-        wrong_sound=wrong_sound,
-        success_sound=success_sound,
-        engine=tts_engine
-    )
+    try:
+        practice_session(
+            sentences=sentences,
+            right_sound=right_sound,
+            wrong_sound=wrong_sound,
+            success_sound=success_sound,
+            engine=tts_engine,
+            scheduler=scheduler,
+            store=store,
+            metrics=metrics,
+            answers=answers
+        )
+    finally:
+        if tts_engine is not None:
+            tts_engine.close()
+        store.close()
+        if args.metrics:
+            for line in metrics.summary():
+                print(f"{COLORS['prompt']}{line}{COLORS['reset']}")
+            metrics.dump(args.metrics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,240 @@
+"""
+学习进度模块
+功能：把每次作答和每个句子的统计保存到 SQLite 数据库，命令列版和图形版共用
+特点：
+1. 数据库使用 WAL 模式，写入时不阻塞读取
+2. 作答记录交给后台写入线程，攒成一批后在一个事务中写入，答题循环不等待磁盘
+3. 每个句子保存作答次数、对错次数和间隔重复状态，下次启动时从上次的进度继续
+4. 按错误次数建有索引，可快速查出"最常错的句子"
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Container, List, NamedTuple, Optional, Tuple
+
+from deck import Card
+from similarity import WRONG
+from srs import ReviewState, Scheduler
+
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "practice", "progress.sqlite3")
+# 后台写入：每批最多条数，以及攒批的最长等待时间(秒)
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    english TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    answered_at REAL NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_english ON attempts(english);
+CREATE TABLE IF NOT EXISTS sentences (
+    english TEXT PRIMARY KEY,
+    chinese TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    wrong INTEGER NOT NULL DEFAULT 0,
+    last_verdict TEXT,
+    last_at REAL,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL,
+    repetitions INTEGER NOT NULL,
+    due REAL NOT NULL,
+    lapses INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sentences_worst ON sentences(wrong DESC, correct);
+CREATE INDEX IF NOT EXISTS sentences_due ON sentences(due);
+"""
+
+_INSERT_ATTEMPT = """
+INSERT INTO attempts (english, answer, verdict, similarity, answered_at, source)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_SENTENCE = """
+INSERT INTO sentences (english, chinese, attempts, correct, wrong, last_verdict, last_at,
+                       ease, interval, repetitions, due, lapses)
+VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(english) DO UPDATE SET
+    chinese = excluded.chinese,
+    attempts = attempts + 1,
+    correct = correct + excluded.correct,
+    wrong = wrong + excluded.wrong,
+    last_verdict = excluded.last_verdict,
+    last_at = excluded.last_at,
+    ease = excluded.ease,
+    interval = excluded.interval,
+    repetitions = excluded.repetitions,
+    due = excluded.due,
+    lapses = excluded.lapses
+"""
+
+# 不影响复习安排的作答(如错题复习)：只累计作答统计，保留间隔重复状态
+_UPDATE_COUNTS = """
+UPDATE sentences SET
+    attempts = attempts + 1,
+    correct = correct + ?,
+    wrong = wrong + ?,
+    last_verdict = ?,
+    last_at = ?
+WHERE english = ?
+"""
+
+
+class SentenceStats(NamedTuple):
+    """句子的累计作答统计"""
+    english: str
+    chinese: str
+    attempts: int
+    correct: int
+    wrong: int
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL 下可安全使用，每次提交不必等待 fsync
+    return conn
+
+
+class ProgressStore:
+    """学习进度数据库
+
+    写入(record)只把记录放入队列并立即返回，由后台线程批量写入；
+    查询使用单独的连接，可与写入同时进行。
+
+    Args:
+        path: 数据库文件路径(目录不存在时自动创建)
+        source: 记录的来源，如 "cli" 或 "gui"
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, source: str = "cli"):
+        self.path = path
+        self.source = source
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._reader = _connect(path)
+        self._reader.executescript(_SCHEMA)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, args=(_connect(path),),
+                                        name="progress-writer", daemon=True)
+        self._writer.start()
+
+    # ---------- 写入 ----------
+
+    def record(self, card: Card, answer: str, verdict: str, similarity: float,
+               state: Optional[ReviewState]) -> None:
+        """记录一次作答(非阻塞)
+
+        Args:
+            card: 作答的题目
+            answer: 用户输入的原文
+            verdict: 判定结果(CORRECT / ALMOST / WRONG)
+            similarity: 相似度
+            state: 作答后该句子的复习状态；为 None 时(如错题复习)只记录作答，不改变复习状态
+        """
+        now = time.time()
+        correct = 0 if verdict == WRONG else 1
+        if state is None:
+            sentence = _UPDATE_COUNTS, (correct, 1 - correct, verdict, now, card.english)
+        else:
+            sentence = _UPSERT_SENTENCE, (card.english, card.chinese, correct, 1 - correct, verdict, now,
+                                          state.ease, state.interval, state.repetitions, state.due,
+                                          state.lapses)
+        self._queue.put(((card.english, answer, verdict, similarity, now, self.source), sentence))
+
+    def _write_loop(self, conn: sqlite3.Connection) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # 攒批：继续收集，直到够一批、队列暂时为空超过 FLUSH_INTERVAL 或收到结束标记
+            while item is not None and len(batch) < BATCH_SIZE:
+                try:
+                    item = self._queue.get(timeout=FLUSH_INTERVAL)
+                except queue.Empty:
+                    break
+                batch.append(item)
+            records = [entry for entry in batch if entry is not None]
+            if records:
+                with conn:
+                    conn.executemany(_INSERT_ATTEMPT, [attempt for attempt, _ in records])
+                    # 先写入复习状态再累计统计：同一批中错题复习的作答总在该句第一次作答之后
+                    for statement in (_UPSERT_SENTENCE, _UPDATE_COUNTS):
+                        rows = [row for (_, (sql, row)) in records if sql is statement]
+                        if rows:
+                            conn.executemany(statement, rows)
+            for _ in batch:
+                self._queue.task_done()
+            if len(records) < len(batch):
+                conn.close()
+                return
+
+    def flush(self) -> None:
+        """等待已提交的记录全部写入数据库"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """写完剩余记录后关闭数据库"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._reader.close()
+
+    # ---------- 查询 ----------
+
+    def __len__(self) -> int:
+        """已作答过的句子数"""
+        return self._reader.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+
+    def worst(self, limit: int = 100) -> List[SentenceStats]:
+        """错误次数最多的句子(次数相同时答对越少越靠前)"""
+        rows = self._reader.execute(
+            "SELECT english, chinese, attempts, correct, wrong FROM sentences "
+            "WHERE wrong > 0 ORDER BY wrong DESC, correct LIMIT ?", (limit,))
+        return [SentenceStats(*row) for row in rows]
+
+    def stats(self, english: str) -> Optional[SentenceStats]:
+        """单个句子的累计统计，未作答过时为 None"""
+        row = self._reader.execute(
+            "SELECT english, chinese, attempts, correct, wrong FROM sentences WHERE english = ?",
+            (english,)).fetchone()
+        return SentenceStats(*row) if row else None
+
+    def totals(self) -> Tuple[int, int, int]:
+        """累计(作答次数, 答对次数, 答错次数)"""
+        row = self._reader.execute(
+            "SELECT COUNT(*), COALESCE(SUM(verdict != ?), 0), COALESCE(SUM(verdict = ?), 0) FROM attempts",
+            (WRONG, WRONG)).fetchone()
+        return tuple(row)
+
+    def restore(self, scheduler: Scheduler, normalizer: Callable[[str], str],
+                deck: Optional[Container[str]] = None) -> int:
+        """把保存的复习状态载入调度器，从上次的进度继续
+
+        Args:
+            scheduler: 间隔重复调度器
+            normalizer: 文本规范化函数(重建题目的判题键)
+            deck: 只载入其中包含的句子(如当前题库)，为 None 时全部载入
+
+        Returns:
+            载入的句子数
+        """
+        rows = self._reader.execute(
+            "SELECT english, chinese, ease, interval, repetitions, due, lapses FROM sentences ORDER BY due")
+        count = 0
+        for english, chinese, ease, interval, repetitions, due, lapses in rows:
+            if deck is not None and english not in deck:
+                continue
+            card = Card(english, chinese, normalizer(english))
+            scheduler.restore(card, ReviewState(ease, interval, repetitions, due, lapses))
+            count += 1
+        return count
+
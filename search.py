@@ -0,0 +1,186 @@
+"""
+题目搜索模块
+功能：按中文提示或英文单词在所有题库中查找题目，组成临时题库来练习
+特点：
+1. 中文提示按单字和相邻两字(bigram)建立倒排索引，英文句子按单词建立倒排索引
+2. 查询中的各个词都要出现：从最短的倒排表开始求交集，候选很快缩小，
+   十万题以上的目录每次查询也只需几毫秒
+3. 超过两个字的中文词，两字组都出现并不代表整个词连续出现，求完交集后再逐题确认
+4. 倒排表是按题目编号排好序的整数数组，内存紧凑；索引在第一次搜索时才建立
+
+用法：
+    python search.py 开玩笑                 # 在所有题库中查找
+    python search.py "serious 认真" -d 日常  # 中英混合查询，只在指定题库中查找
+"""
+
+import argparse
+import bisect
+import re
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional
+
+from deck import Card
+
+# 含有汉字(含日文汉字等 CJK 统一表意文字)的查询词按中文提示查找，其余按英文单词查找
+_CJK = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+_SEPARATORS = re.compile(r"[\W_]+")
+DEFAULT_LIMIT = 50
+
+
+def chinese_grams(text: str) -> List[str]:
+    """中文文本(去掉标点与空白后)的单字与相邻两字"""
+    text = _SEPARATORS.sub("", text.lower())
+    return list(text) + [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def english_words(text: str) -> List[str]:
+    """英文文本中的单词(小写，保留单词内部的撇号，如 can't)"""
+    return _WORD.findall(text.lower())
+
+
+def _intersect(numbers: List[int], postings: array) -> List[int]:
+    """两个按编号排序的序列求交集
+
+    候选已经很少时在倒排表中二分查找，否则转成集合逐个比较。
+    """
+    if len(numbers) * max(1, len(postings).bit_length()) < len(postings):
+        found = []
+        start = 0
+        for number in numbers:
+            start = bisect.bisect_left(postings, number, start)
+            if start == len(postings):
+                break
+            if postings[start] == number:
+                found.append(number)
+        return found
+    wanted = set(postings)
+    return [number for number in numbers if number in wanted]
+
+
+class CardSearch:
+    """题目的中文两字组与英文单词倒排索引
+
+    Args:
+        cards: 题目(DeckIndex、StreamingDeck、CompiledDeck、Catalog 或 Card 序列)
+    """
+
+    def __init__(self, cards: Iterable[Card]):
+        self._source: Optional[Iterable[Card]] = cards
+        self._cards: List[Card] = []
+        self._chinese: Dict[str, array] = {}
+        self._words: Dict[str, array] = {}
+
+    def build(self) -> "CardSearch":
+        """立即建立索引；已建立时什么也不做"""
+        if self._source is None:
+            return self
+        self._cards = list(self._source)
+        self._source = None
+        for index, keys_of in ((self._chinese, lambda card: chinese_grams(card.chinese)),
+                               (self._words, lambda card: english_words(card.english))):
+            for number, card in enumerate(self._cards):
+                # 编号依次递增，每张倒排表自然按编号排序
+                for key in set(keys_of(card)):
+                    postings = index.get(key)
+                    if postings is None:
+                        postings = index[key] = array("I")
+                    postings.append(number)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.build()._cards)
+
+    def find(self, query: str, accept: Optional[Callable[[int], bool]] = None,
+             limit: Optional[int] = None) -> List[int]:
+        """查找同时含有查询中全部词的题目
+
+        查询按空白分成若干词：含汉字的词须连续出现在中文提示中，其他词中的单词须出现在英文句子中。
+
+        Args:
+            query: 查询文字，如 "开玩笑"、"are you"、"serious 认真"
+            accept: 按编号进一步筛选题目(如只取某些题库)，为 None 时不筛选
+            limit: 最多返回的题目数，为 None 时不限
+
+        Returns:
+            题目编号(即建立索引时的顺序)，按编号排列
+        """
+        self.build()
+        phrases: List[str] = []
+        lists: List[array] = []
+        for term in query.split():
+            if _CJK.search(term):
+                phrase = _SEPARATORS.sub("", term.lower())
+                keys = [phrase] if len(phrase) <= 2 else [phrase[i:i + 2] for i in range(len(phrase) - 1)]
+                if len(phrase) > 2:
+                    phrases.append(phrase)
+                index = self._chinese
+            else:
+                keys = english_words(term)
+                index = self._words
+            for key in keys:
+                postings = index.get(key)
+                if postings is None:
+                    return []  # 有一个词完全没有出现，不可能有结果
+                lists.append(postings)
+        if not lists:
+            return []
+
+        lists.sort(key=len)
+        numbers = list(lists[0])
+        for postings in lists[1:]:
+            if not numbers:
+                break
+            numbers = _intersect(numbers, postings)
+
+        found = []
+        for number in numbers:
+            if limit is not None and len(found) >= limit:
+                break
+            if phrases:
+                chinese = _SEPARATORS.sub("", self._cards[number].chinese.lower())
+                if not all(phrase in chinese for phrase in phrases):
+                    continue
+            if accept is not None and not accept(number):
+                continue
+            found.append(number)
+        return found
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Card]:
+        """查找同时含有查询中全部词的题目，按建立索引时的顺序返回"""
+        return [self._cards[number] for number in self.find(query, limit=limit)]
+
+
+def main():
+    """程序主入口：在题库目录中搜索题目"""
+    from catalog import load_catalog
+    from practice import COLORS, PRACTICE_SETTINGS, load_deck, normalize_text
+
+    parser = argparse.ArgumentParser(description="按中文提示或英文单词搜索所有题库中的题目")
+    parser.add_argument("query", help="查询文字(多个词以空格分隔，须全部出现)")
+    parser.add_argument("-d", "--deck", action="append", metavar="NAME", help="只在指定题库中查找，可重复指定")
+    parser.add_argument("-n", "--limit", type=int, default=DEFAULT_LIMIT,
+                        help=f"最多列出的题目数(默认{DEFAULT_LIMIT})")
+    parser.add_argument("--deck-dir", default=PRACTICE_SETTINGS['deck_dir'], help="题库目录")
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.deck_dir, load_deck, normalize_text)
+    start = time.perf_counter()
+    catalog.search_index().build()
+    built = time.perf_counter()
+    try:
+        found = catalog.search(args.query, args.deck, args.limit)
+    except KeyError as e:
+        print(f"{COLORS['wrong']}錯誤：{e.args[0]}{COLORS['reset']}")
+        return
+    elapsed = time.perf_counter() - built
+    for card in found:
+        print(f"{COLORS['question']}{card.english}{COLORS['reset']}  {card.chinese}  "
+              f"{COLORS['prompt']}[{'/'.join(catalog.tags(card.english))}]{COLORS['reset']}")
+    print(f"{COLORS['correct']}在 {len(catalog)} 題中找到 {len(found)} 題，查詢耗時 {elapsed * 1000:.2f} ms"
+          f"（建立索引 {(built - start) * 1000:.0f} ms）{COLORS['reset']}")
+
+
+if __name__ == "__main__":
+    main()
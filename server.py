@@ -0,0 +1,311 @@
+"""
+网页版后端
+功能：提供 index.html、题库列表与内容，并用与命令列版相同的规则判题
+特点：
+1. 基于 asyncio 的单线程 HTTP/1.1 服务，支持长连接，一个核心即可服务数百名同时练习的用户
+2. 题库在启动时并行加载，每个题库的 JSON 响应与静态文件只生成一次
+3. 判题与命令列版共用 session.grade_attempt(含题库旁 .accept.json 中的其他可接受答案)，网页与命令列版结果一致
+
+接口：
+    GET  /                    网页
+    GET  /api/decks           题库列表 [{"name": ..., "count": ...}]
+    GET  /api/decks/<名称>    题库内容 {英文: 中文}
+    POST /api/grade           {"answer": ..., "reference": ...} → {"verdict", "similarity", "correct"}
+                              answer 与 reference 各不超过 MAX_GRADE_CHARS 个字符
+                              按其他可接受的写法判题时另附 "accepted"：该写法
+                              答错时另附 "nearest"：与答案相近的其他句子
+    POST /api/search          {"query": ..., "decks": [...], "limit": ...} → [{"english", "chinese", "decks"}]
+                              按中文提示或英文单词搜索所有题库(decks、limit 可省略)
+
+用法：
+    python server.py [--host 127.0.0.1] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import json
+import mimetypes
+import os
+import posixpath
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from answers import AcceptedAnswers, load_accepted
+from catalog import Catalog, discover_decks, load_catalog
+from deck import Card
+from metrics import Metrics
+from nearest import SentenceIndex
+from session import grade_attempt
+from similarity import WRONG
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+# 网页可以访问的静态资源目录
+STATIC_DIRS = ("image", "sound", "photo")
+# 请求头与请求体的大小上限(字节)
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+# 判题时答案与正确答案的长度上限(字符)：题库中最长的句子约一百个字符，
+# 判题在事件循环中进行，限制长度后每次判题不超过约 1 毫秒，不会拖慢其他连接
+MAX_GRADE_CHARS = 1000
+# 每次搜索最多返回的题目数
+SEARCH_LIMIT = 500
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large"}
+_JSON = "application/json; charset=utf-8"
+
+Response = Tuple[int, str, bytes]
+
+
+class HttpError(Exception):
+    """以指定状态码返回给客户端的错误"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_bytes(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class GradingServer:
+    """判题服务
+
+    Args:
+        catalog: 合并后的题库目录
+        normalizer: 文本规范化函数(如 practice.normalize_text)
+        threshold: 相似度阈值
+        root: 网页与静态资源所在目录
+        answers: 各题其他可接受的答案，为 None 时只接受题目的英文句子
+    """
+
+    def __init__(self, catalog: Catalog, normalizer, threshold: float, root: str = ROOT_DIR,
+                 answers: Optional[AcceptedAnswers] = None):
+        self.catalog = catalog
+        self.normalizer = normalizer
+        self.threshold = threshold
+        self.root = root
+        self.answers = answers
+        self._metrics = Metrics(enabled=False)
+        self._static: Dict[str, Response] = {}
+        # 答错时查找答案与哪些其他句子相近，索引在启动时建立
+        self.index = SentenceIndex(catalog.select()).build()
+        catalog.search_index().build()
+
+        # 题库列表与内容不会变化，预先序列化
+        self._deck_responses: Dict[str, bytes] = {}
+        listing = []
+        for name in catalog.deck_names:
+            deck = catalog.select([name])
+            listing.append({"name": name, "count": len(deck)})
+            self._deck_responses[name] = _json_bytes(dict(deck.items()))
+        self._deck_list = _json_bytes(listing)
+
+    # ---------- 路由 ----------
+
+    def dispatch(self, method: str, path: str, body: bytes) -> Response:
+        """处理一个请求，返回(状态码, 内容类型, 内容)"""
+        if path == "/api/grade":
+            if method != "POST":
+                raise HttpError(405, "请使用 POST")
+            return 200, _JSON, self.grade(body)
+        if path == "/api/search":
+            if method != "POST":
+                raise HttpError(405, "请使用 POST")
+            return 200, _JSON, self.search(body)
+        if method not in ("GET", "HEAD"):
+            raise HttpError(405, "不支持的请求方法")
+        if path == "/api/decks":
+            return 200, _JSON, self._deck_list
+        if path.startswith("/api/decks/"):
+            payload = self._deck_responses.get(path[len("/api/decks/"):])
+            if payload is None:
+                raise HttpError(404, "题库不存在")
+            return 200, _JSON, payload
+        return self.static(path)
+
+    def grade(self, body: bytes) -> bytes:
+        """判题：正确答案在题库中时直接使用预先计算的判题键，与命令列版走同一判题流程"""
+        try:
+            request = json.loads(body)
+            answer, reference = request["answer"], request["reference"]
+        except (ValueError, TypeError, KeyError):
+            raise HttpError(400, '请求体应为 {"answer": ..., "reference": ...}')
+        if not isinstance(answer, str) or not isinstance(reference, str):
+            raise HttpError(400, "answer 与 reference 必须是字符串")
+        if len(answer) > MAX_GRADE_CHARS or len(reference) > MAX_GRADE_CHARS:
+            raise HttpError(400, f"answer 与 reference 不能超过 {MAX_GRADE_CHARS} 个字符")
+
+        if reference in self.catalog:
+            card = self.catalog.card(reference)
+        else:
+            card = Card(reference, "", self.normalizer(reference))
+        attempt = grade_attempt(card, answer, self.normalizer, self.threshold, self._metrics,
+                                self.index, self.answers)
+        result = {"verdict": attempt.verdict, "similarity": round(attempt.similarity, 4),
+                  "correct": attempt.verdict != WRONG}
+        if attempt.accepted is not None:
+            result["accepted"] = attempt.accepted
+        if attempt.verdict == WRONG:
+            result["nearest"] = [
+                {"english": other.english, "chinese": other.chinese, "similarity": round(ratio, 4)}
+                for other, ratio in attempt.nearest
+            ]
+        return _json_bytes(result)
+
+    def search(self, body: bytes) -> bytes:
+        """搜索题目：查询中的词须全部出现在中文提示或英文句子中"""
+        try:
+            request = json.loads(body)
+            query = request["query"]
+            decks, limit = request.get("decks"), request.get("limit", SEARCH_LIMIT)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            raise HttpError(400, '请求体应为 {"query": ..., "decks": [...], "limit": ...}')
+        if not isinstance(query, str) or not isinstance(limit, int) or limit < 0:
+            raise HttpError(400, "query 必须是字符串，limit 必须是非负整数")
+        if decks is not None and not (isinstance(decks, list) and all(isinstance(name, str) for name in decks)):
+            raise HttpError(400, "decks 必须是题库名称的列表")
+        try:
+            found = self.catalog.search(query, decks, min(limit, SEARCH_LIMIT))
+        except KeyError as e:
+            raise HttpError(404, e.args[0])
+        return _json_bytes([{"english": card.english, "chinese": card.chinese,
+                             "decks": self.catalog.tags(card.english)} for card in found])
+
+    def static(self, path: str) -> Response:
+        """返回网页或静态资源(读取一次后缓存在内存中)
+
+        路径先规范化(消去 . 与 ..)，解析符号链接后必须仍在所属的静态资源目录内。
+        """
+        if path in ("/", "/index.html"):
+            relative, base = "index.html", self.root
+        else:
+            relative = posixpath.normpath(path.lstrip("/"))
+            top = relative.split("/", 1)[0]
+            if top not in STATIC_DIRS or relative == top:
+                raise HttpError(404, "文件不存在")
+            base = os.path.join(self.root, top)
+        cached = self._static.get(relative)
+        if cached is not None:
+            return cached
+
+        # 路径中含 NUL 等无效字符时 realpath 与 open 会抛出 ValueError
+        try:
+            full_path = os.path.realpath(os.path.join(self.root, relative))
+            if not full_path.startswith(os.path.realpath(base) + os.sep):
+                raise HttpError(404, "文件不存在")
+            with open(full_path, "rb") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            raise HttpError(404, "文件不存在")
+        content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        response = self._static[relative] = (200, content_type, content)
+        return response
+
+    # ---------- 连接处理 ----------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理一个连接上的请求(HTTP/1.1 长连接可连续处理多个请求)"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive = await self._respond(head, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, head: bytes, reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter) -> bool:
+        """解析请求并写入响应，返回是否保持连接"""
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            self._write(writer, 400, _JSON, _json_bytes({"error": "请求行格式错误"}), False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        # HTTP/1.1 默认保持连接，HTTP/1.0 需明确要求
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self._write(writer, 413, _JSON, _json_bytes({"error": "请求体过大"}), False)
+            return False
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            return False
+
+        try:
+            status, content_type, payload = self.dispatch(method, unquote(urlsplit(target).path), body)
+        except HttpError as e:
+            status, content_type, payload = e.status, _JSON, _json_bytes({"error": e.message})
+        self._write(writer, status, content_type, b"" if method == "HEAD" else payload, keep_alive,
+                    len(payload))
+        return keep_alive
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, content_type: str, payload: bytes,
+               keep_alive: bool, length: Optional[int] = None) -> None:
+        header = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload) if length is None else length}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(header.encode("latin-1") + payload)
+
+
+async def serve(server: GradingServer, host: str, port: int) -> None:
+    """启动服务并持续运行"""
+    listener = await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES,
+                                          backlog=1024)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    """程序主入口"""
+    from practice import COLORS, PRACTICE_SETTINGS, load_deck, normalize_text
+
+    parser = argparse.ArgumentParser(description="网页版判题服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址(默认127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="监听端口(默认8000)")
+    parser.add_argument("--deck-dir", default=PRACTICE_SETTINGS['deck_dir'], help="题库目录")
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.deck_dir, load_deck, normalize_text)
+    answers = load_accepted(discover_decks(args.deck_dir).values(), normalize_text)
+    for error in answers.errors:
+        print(f"{COLORS['wrong']}警告：{error}{COLORS['reset']}")
+    server = GradingServer(catalog, normalize_text, PRACTICE_SETTINGS['similarity_threshold'],
+                           answers=answers)
+    print(f"{COLORS['prompt']}已載入 {len(catalog.deck_names)} 個題庫，共 {len(catalog)} 題{COLORS['reset']}")
+    print(f"{COLORS['question']}http://{args.host}:{args.port}/{COLORS['reset']}")
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
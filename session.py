@@ -0,0 +1,183 @@
+"""
+练习会话引擎
+功能：不依赖输入输出的出题、判题与错题复习流程，命令列版与模拟驱动共用
+特点：
+1. 调用方只负责取题和提交答案，朗读、音效与显示根据返回的作答结果自行处理
+2. 出题顺序由调度器决定，指定随机种子与时钟后相同的答案序列得到相同的结果
+3. 错题复习按轮进行，答对(含差一点)的句子移出，直到全部清空
+4. 答错时可附上题库中与答案最相近的其他句子(用户可能翻译成了另一题)
+5. 题目有其他可接受的答案时，按与答案最接近的写法判题
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from answers import AcceptedAnswers
+from deck import Card, DeckIndex
+from deck_stream import StreamingDeck
+from metrics import Metrics
+from nearest import SentenceIndex
+from progress import ProgressStore
+from similarity import CORRECT, WRONG, Alignment, grade_aligned
+from srs import ReviewState, Scheduler
+
+
+class Attempt(NamedTuple):
+    """一次作答的判定结果"""
+    card: Card                     # 作答的题目
+    answer: str                    # 用户输入的原文
+    verdict: str                   # CORRECT / ALMOST / WRONG
+    similarity: float              # 相似度(明显错误的答案为不超过阈值的上界)
+    state: Optional[ReviewState]   # 作答后的复习状态，错题复习时为 None
+    nearest: Tuple[Tuple[Card, float], ...] = ()  # 答错时与答案相近的其他句子及相似度
+    alignment: Optional[Alignment] = None  # 差一点时判题求得的对齐结果，用于生成提示
+    accepted: Optional[str] = None  # 按其他可接受的写法判题时为该写法，按题目的英文句子判题时为 None
+
+
+def grade_attempt(card: Card, answer: str, normalizer: Callable[[str], str], threshold: float,
+                  metrics: Metrics, index: Optional[SentenceIndex] = None,
+                  answers: Optional[AcceptedAnswers] = None) -> Attempt:
+    """规范化并判定答案；差一点时保留对齐结果，答错且提供了相近句子索引时，附上与答案相近的其他句子
+
+    题目有其他可接受的答案且答案与英文句子不完全相同时，
+    改按最接近的写法判题(取相似度较高的结果)。
+    """
+    with metrics.time("normalize"):
+        normalized = normalizer(answer)
+    with metrics.time("similarity"):
+        verdict, similarity, alignment = grade_aligned(normalized, card.normalized, threshold)
+    accepted = None
+    if verdict != CORRECT and answers is not None and card.english in answers:
+        with metrics.time("accepted"):
+            variant = answers.match(card.english, normalized, threshold)
+            if variant is not None and variant[1] != card.normalized:
+                graded = grade_aligned(normalized, variant[1], threshold)
+                if graded[1] > similarity:
+                    (verdict, similarity, alignment), accepted = graded, variant[0]
+    nearest = ()
+    if verdict == WRONG and index is not None:
+        with metrics.time("nearest"):
+            nearest = tuple(index.nearest(normalized, threshold, exclude=card.english))
+    return Attempt(card, answer, verdict, similarity, None, nearest, alignment, accepted)
+
+
+def _independent_cards(deck) -> Iterable[Card]:
+    """供后台线程遍历的题目：流式题库另开一个读取器，不与答题循环共用解析状态和缓存"""
+    if isinstance(deck, StreamingDeck):
+        reader = StreamingDeck(deck.file_path, deck.normalizer)
+        try:
+            yield from reader
+        finally:
+            reader.close()
+    else:
+        yield from deck
+
+
+class PracticeSession:
+    """一次练习会话：由调度器出题，判题后安排复习并保存记录
+
+    Args:
+        deck: 题库索引(含流式、二进制题库)
+        normalizer: 文本规范化函数(如 practice.normalize_text)
+        threshold: 相似度阈值
+        scheduler: 间隔重复调度器，默认为题库新建一个
+        store: 学习进度数据库，为 None 时不保存作答记录
+        metrics: 各环节耗时统计，为 None 时不统计
+        find_nearest: 答错时是否查找题库中与答案相近的其他句子(索引在后台建立，建好前不提示)
+        answers: 各题其他可接受的答案，为 None 时只接受题目的英文句子
+    """
+
+    def __init__(self, deck, normalizer: Callable[[str], str], threshold: float,
+                 scheduler: Optional[Scheduler] = None, store: Optional[ProgressStore] = None,
+                 metrics: Optional[Metrics] = None, find_nearest: bool = False,
+                 answers: Optional[AcceptedAnswers] = None):
+        self.deck = deck
+        self.normalizer = normalizer
+        self.threshold = threshold
+        self.scheduler = scheduler if scheduler is not None else Scheduler(deck)
+        self.store = store
+        self.metrics = metrics or Metrics(enabled=False)
+        self.correct_count = 0
+        self.wrong_count = 0
+        self.wrong_cards: Dict[str, Card] = {}
+        self.index = SentenceIndex(_independent_cards(deck)).build_in_background() if find_nearest else None
+        self.answers = answers
+
+    def questions(self) -> Iterator[Card]:
+        """依次产生题目：先复习到期的句子，再出新句子，直到没有可出的题"""
+        return self.scheduler.session()
+
+    def peek(self) -> Optional[Card]:
+        """下一题(不取出)，供预先合成语音"""
+        return self.scheduler.peek()
+
+    def submit(self, card: Card, answer: str) -> Attempt:
+        """判定答案，更新统计与复习进度
+
+        Args:
+            card: 当前题目
+            answer: 用户输入的原文
+
+        Returns:
+            本次作答的判定结果
+        """
+        attempt = grade_attempt(card, answer, self.normalizer, self.threshold, self.metrics, self.index,
+                                self.answers)
+        state = self.scheduler.review(card, attempt.verdict)
+        if self.store is not None:
+            self.store.record(card, answer, attempt.verdict, attempt.similarity, state)
+
+        if attempt.verdict == WRONG:
+            self.wrong_count += 1
+            self.wrong_cards[card.english] = card
+        else:
+            self.correct_count += 1
+        return attempt._replace(state=state)
+
+    def review(self) -> "ReviewSession":
+        """本次会话答错的题目组成的错题复习"""
+        return ReviewSession(DeckIndex.from_cards(self.wrong_cards.values(), self.normalizer),
+                             self.threshold, self.metrics, self.index, self.answers, self.store)
+
+
+class ReviewSession:
+    """错题复习：一轮轮出完剩余的错题，答对的移出，直到全部清空
+
+    Args:
+        deck: 错题索引
+        threshold: 相似度阈值
+        metrics: 各环节耗时统计，为 None 时不统计
+        index: 整个题库的相近句子索引，答错时附上相近的其他句子；为 None 时不查找
+        answers: 各题其他可接受的答案，为 None 时只接受题目的英文句子
+        store: 学习进度数据库，为 None 时不保存作答记录；复习中的作答只记入历史，不改变复习安排
+    """
+
+    def __init__(self, deck: DeckIndex, threshold: float, metrics: Optional[Metrics] = None,
+                 index: Optional[SentenceIndex] = None, answers: Optional[AcceptedAnswers] = None,
+                 store: Optional[ProgressStore] = None):
+        self.deck = deck
+        self.threshold = threshold
+        self.metrics = metrics or Metrics(enabled=False)
+        self.index = index
+        self.answers = answers
+        self.store = store
+        self.remaining: Dict[str, Card] = {card.english: card for card in deck}
+
+    def __len__(self) -> int:
+        return len(self.remaining)
+
+    def questions(self) -> Iterator[Card]:
+        """按题库顺序逐轮出题，直到剩余错题清空"""
+        while self.remaining:
+            for card in list(self.remaining.values()):
+                yield card
+
+    def submit(self, card: Card, answer: str) -> Attempt:
+        """判定答案，答对(含差一点)的题目移出错题本"""
+        attempt = grade_attempt(card, answer, self.deck.normalizer, self.threshold, self.metrics, self.index,
+                                self.answers)
+        if self.store is not None:
+            # 间隔重复只按第一次作答安排，复习中的作答不更新调度器
+            self.store.record(card, answer, attempt.verdict, attempt.similarity, None)
+        if attempt.verdict != WRONG:
+            self.remaining.pop(card.english, None)
+        return attempt
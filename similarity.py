@@ -0,0 +1,141 @@
+"""
+相似度判定模块
+功能：判断用户答案与正确答案的相似度是否达到阈值
+特点：
+1. 结果与 difflib.SequenceMatcher(None, a, b).ratio() 完全一致
+2. 先用长度、字符直方图等廉价上界快速排除明显错误的答案
+3. 再用位并行算法求最长公共子序列，得到更紧的上界
+4. 只有可能达到阈值的答案才会执行完整的 SequenceMatcher
+5. 判题时求得的对齐结果可直接用来生成提示，不必再比较一次
+"""
+
+import difflib
+from collections import Counter
+from typing import List, Optional, Tuple
+
+# 对齐结果：SequenceMatcher.get_opcodes() 的 (操作, i1, i2, j1, j2) 列表
+Alignment = List[Tuple[str, int, int, int, int]]
+
+# 判定结果
+CORRECT = "correct"  # 完全正确
+ALMOST = "almost"    # 差一点(达到阈值但不完全相同)
+WRONG = "wrong"      # 错误
+
+
+def length_bound(a: str, b: str) -> float:
+    """只根据长度得到的相似度上界(等同 real_quick_ratio)"""
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    return 2.0 * min(len(a), len(b)) / total
+
+
+def histogram_bound(a: str, b: str) -> float:
+    """根据字符出现次数得到的相似度上界(等同 quick_ratio)"""
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    common = sum((Counter(a) & Counter(b)).values())
+    return 2.0 * common / total
+
+
+def lcs_length(a: str, b: str) -> int:
+    """最长公共子序列的长度(位并行算法)
+
+    把 b 中每个字符出现的位置编码为整数位掩码，逐个处理 a 的字符时
+    用几次整数位运算更新整行状态，耗时为 O(len(a)) 次整数运算。
+
+    Args:
+        a: 第一个字符串
+        b: 第二个字符串
+
+    Returns:
+        最长公共子序列的长度
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    masks = {}
+    for position, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    full = (1 << len(b)) - 1
+    row = full
+    for char in a:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(b) - bin(row).count("1")
+
+
+def align(a: str, b: str, threshold: float) -> Tuple[float, Optional[difflib.SequenceMatcher]]:
+    """计算相似度，但对达不到阈值的答案提前放弃
+
+    Args:
+        a: 规范化后的用户答案
+        b: 规范化后的正确答案
+        threshold: 相似度阈值(0-1之间)
+
+    Returns:
+        (相似度, 比较器)：若相似度可能达到阈值，相似度与 SequenceMatcher.ratio() 相同，
+        比较器已求得匹配块，get_opcodes() 不必重新比较；
+        否则为一个小于阈值的上界(真实相似度不会超过它)与 None。两者相同时比较器也为 None
+    """
+    if a == b:
+        return 1.0, None
+
+    bound = length_bound(a, b)
+    if bound < threshold:
+        return bound, None
+
+    bound = histogram_bound(a, b)
+    if bound < threshold:
+        return bound, None
+
+    # SequenceMatcher 找到的匹配字符数不超过最长公共子序列的长度 L，
+    # 故 ratio <= 2L / 总长
+    bound = 2.0 * lcs_length(a, b) / (len(a) + len(b))
+    if bound < threshold:
+        return bound, None
+
+    matcher = difflib.SequenceMatcher(None, a, b)
+    return matcher.ratio(), matcher
+
+
+def bounded_ratio(a: str, b: str, threshold: float) -> float:
+    """计算相似度，但对达不到阈值的答案提前放弃
+
+    Returns:
+        若相似度可能达到阈值，返回与 SequenceMatcher.ratio() 相同的精确值；
+        否则返回一个小于阈值的上界(真实相似度不会超过它)
+    """
+    return align(a, b, threshold)[0]
+
+
+def grade(normalized_user: str, normalized_correct: str, threshold: float) -> Tuple[str, float]:
+    """判定答案等级
+
+    Args:
+        normalized_user: 规范化后的用户答案
+        normalized_correct: 规范化后的正确答案
+        threshold: 相似度阈值
+
+    Returns:
+        (判定结果, 相似度)，判定结果为 CORRECT、ALMOST 或 WRONG
+    """
+    verdict, similarity, _ = grade_aligned(normalized_user, normalized_correct, threshold)
+    return verdict, similarity
+
+
+def grade_aligned(normalized_user: str, normalized_correct: str,
+                  threshold: float) -> Tuple[str, float, Optional[Alignment]]:
+    """判定答案等级，差一点时一并返回对齐结果(供生成提示)
+
+    Returns:
+        (判定结果, 相似度, 对齐结果)，只有 ALMOST 时对齐结果不为 None
+    """
+    similarity, matcher = align(normalized_user, normalized_correct, threshold)
+    if similarity == 1:
+        return CORRECT, similarity, None
+    if similarity >= threshold:
+        return ALMOST, similarity, matcher.get_opcodes()
+    return WRONG, similarity, None
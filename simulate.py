@@ -0,0 +1,368 @@
+"""
+会话模拟程序
+功能：不经键盘，由模拟的学习者或脚本回答完整的练习会话(含错题复习)，
+用于对判题改动做压力测试，以及确定性地重现用户回报的误判
+特点：
+1. 出题顺序与模拟答案都由随机种子决定，时钟也是模拟的，相同参数得到完全相同的结果
+2. 多进程并行运行大量会话，输出各判定结果的数量与判题各环节的耗时
+3. 可把每次作答导出为 JSON Lines，之后用 --replay 重放：判定与记录不同的作答会被列出
+
+用法：
+    python simulate.py json/english_sentence.json -n 2000 [-j 进程数] [--seed 0]
+    python simulate.py json/english_sentence.json -n 200 --transcript run.jsonl
+    python simulate.py json/english_sentence.json --replay run.jsonl
+
+重放文件每行为 {"english": 正确答案, "answer": 用户答案}，可附带 "verdict"(期望的判定)、
+"session"(会话编号)与 "seed"(随机种子)；用户回报的误判只需写前两项与期望的判定，
+没有会话编号的每一行单独重放。
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from answers import AcceptedAnswers, load_accepted
+from deck import Card, DeckIndex
+from metrics import Histogram, Metrics
+from practice import COLORS, PRACTICE_SETTINGS, load_deck, normalize_text
+from session import Attempt, PracticeSession
+from similarity import ALMOST, CORRECT, WRONG
+from srs import Scheduler
+
+DEFAULT_QUESTIONS = 50
+ANSWER_SECONDS = 8.0    # 模拟时钟上每次作答花费的秒数
+REVIEW_ROUNDS = 3       # 错题复习最多进行的轮数，避免总是答错的学习者无限循环
+
+# 每个工作进程各自加载一次题库
+_deck = None
+_answers: Optional[AcceptedAnswers] = None
+
+
+class SimulatedClock:
+    """模拟时钟：只在作答时前进，供调度器判断复习是否到期"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SyntheticLearner:
+    """模拟的学习者：按比例给出正确、拼错少量字母或完全错误的答案
+
+    Args:
+        rng: 随机数生成器
+        accuracy: 答对的比例
+        typo_rate: 拼错少量字母的比例，其余为完全错误的答案
+    """
+
+    def __init__(self, rng: random.Random, accuracy: float = 0.6, typo_rate: float = 0.25):
+        self.rng = rng
+        self.accuracy = accuracy
+        self.typo_rate = typo_rate
+
+    def answer(self, card: Card) -> Optional[str]:
+        roll = self.rng.random()
+        if roll < self.accuracy or not card.english:
+            return card.english
+        chars = list(card.english)
+        if roll < self.accuracy + self.typo_rate:
+            typos = 1
+        else:
+            typos = max(1, len(chars) // 2)
+        for _ in range(typos):
+            chars[self.rng.randrange(len(chars))] = self.rng.choice("abcdefghijklmnopqrstuvwxyz ")
+        return "".join(chars)
+
+
+class ScriptedLearner:
+    """按脚本回答：每个句子的答案按文件中的顺序依次使用，用完后返回 None
+
+    Args:
+        script: (英文, 答案)序列
+    """
+
+    def __init__(self, script: Iterable[Tuple[str, str]]):
+        self.answers: Dict[str, Deque[str]] = defaultdict(deque)
+        for english, answer in script:
+            self.answers[english].append(answer)
+
+    def answer(self, card: Card) -> Optional[str]:
+        answers = self.answers.get(card.english)
+        return answers.popleft() if answers else None
+
+
+def run_session(deck, learner, seed: int, questions: int, threshold: float,
+                metrics: Optional[Metrics] = None,
+                answers: Optional[AcceptedAnswers] = None) -> List[Tuple[str, Attempt]]:
+    """运行一次练习会话及其错题复习
+
+    学习者对某题没有答案(返回 None)时，练习阶段跳过该题，复习阶段直接结束。
+
+    Args:
+        deck: 题库索引
+        learner: 有 answer(card) 方法的学习者
+        seed: 决定出题顺序的随机种子
+        questions: 练习阶段最多出题数
+        threshold: 相似度阈值
+        metrics: 各环节耗时统计，为 None 时不统计
+        answers: 各题其他可接受的答案，为 None 时只接受题目的英文句子
+
+    Returns:
+        [(阶段, 作答结果)]，阶段为 "practice" 或 "review"
+    """
+    clock = SimulatedClock()
+    scheduler = Scheduler(deck, rng=random.Random(seed), clock=clock)
+    session = PracticeSession(deck, normalize_text, threshold, scheduler=scheduler, metrics=metrics,
+                              answers=answers)
+    attempts = []
+
+    asked = 0
+    for card in session.questions():
+        if asked >= questions:
+            break
+        asked += 1
+        answer = learner.answer(card)
+        if answer is None:
+            continue
+        attempts.append(("practice", session.submit(card, answer)))
+        clock.advance(ANSWER_SECONDS)
+
+    review = session.review()
+    limit = len(review) * REVIEW_ROUNDS
+    for count, card in enumerate(review.questions()):
+        answer = learner.answer(card) if count < limit else None
+        if answer is None:
+            break
+        attempts.append(("review", review.submit(card, answer)))
+    return attempts
+
+
+def _init_worker(deck_path: str) -> None:
+    global _deck, _answers
+    _deck = load_deck(deck_path)
+    _answers = load_accepted([deck_path], normalize_text)
+
+
+def _run_chunk(sessions: Sequence[Tuple[int, int]], questions: int, threshold: float,
+               accuracy: float, typo_rate: float, keep_attempts: bool) -> Tuple[Counter, Dict[str, Histogram], List[dict]]:
+    """在工作进程中运行一组(会话编号, 种子)，返回判定统计、耗时直方图与(可选的)作答记录"""
+    metrics = Metrics()
+    counts: Counter = Counter()
+    records = []
+    for number, seed in sessions:
+        learner = SyntheticLearner(random.Random(seed ^ 0x5EED), accuracy, typo_rate)
+        with metrics.time("session"):
+            attempts = run_session(_deck, learner, seed, questions, threshold, metrics, _answers)
+        for phase, attempt in attempts:
+            counts[phase, attempt.verdict] += 1
+            if keep_attempts:
+                records.append(attempt_record(number, seed, phase, attempt))
+    return counts, metrics.snapshot(), records
+
+
+def attempt_record(number, seed: int, phase: str, attempt: Attempt) -> dict:
+    """作答记录(重放文件中的一行)"""
+    return {
+        "session": number,
+        "seed": seed,
+        "phase": phase,
+        "english": attempt.card.english,
+        "answer": attempt.answer,
+        "verdict": attempt.verdict,
+        "similarity": round(attempt.similarity, 6),
+    }
+
+
+def simulate(deck_path: str, sessions: int, seed: int = 0, questions: int = DEFAULT_QUESTIONS,
+             threshold: Optional[float] = None, accuracy: float = 0.6, typo_rate: float = 0.25,
+             workers: Optional[int] = None, keep_attempts: bool = False
+             ) -> Tuple[Counter, Metrics, List[dict]]:
+    """并行运行大量模拟会话
+
+    Args:
+        deck_path: 题库文件路径
+        sessions: 会话数
+        seed: 总随机种子，第 i 个会话的种子由它确定
+        questions: 每个会话练习阶段的出题数
+        threshold: 相似度阈值，默认使用 PRACTICE_SETTINGS 中的设置
+        accuracy: 模拟学习者答对的比例
+        typo_rate: 模拟学习者拼错少量字母的比例
+        workers: 进程数，默认为 CPU 核心数
+        keep_attempts: 是否返回每次作答的记录
+
+    Returns:
+        (按(阶段, 判定)统计的数量, 合并后的耗时统计, 作答记录)
+
+    Raises:
+        ValueError: 会话数或进程数小于 1
+    """
+    if sessions < 1 or (workers is not None and workers < 1):
+        raise ValueError("会话数与进程数必须是正整数")
+    if threshold is None:
+        threshold = PRACTICE_SETTINGS['similarity_threshold']
+    workers = min(workers or os.cpu_count() or 1, sessions)
+    seeds = random.Random(seed)
+    plan = [(number, seeds.getrandbits(32)) for number in range(sessions)]
+    chunk_size = -(-sessions // (workers * 4))
+    chunks = [plan[i:i + chunk_size] for i in range(0, sessions, chunk_size)]
+
+    counts: Counter = Counter()
+    metrics = Metrics()
+    records: List[dict] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(deck_path,)) as pool:
+        futures = [pool.submit(_run_chunk, chunk, questions, threshold, accuracy, typo_rate, keep_attempts)
+                   for chunk in chunks]
+        for future in futures:
+            chunk_counts, histograms, chunk_records = future.result()
+            counts.update(chunk_counts)
+            metrics.merge(histograms)
+            records.extend(chunk_records)
+    return counts, metrics, records
+
+
+def load_script(file_path: str) -> List[dict]:
+    """读取重放文件(JSON Lines)，跳过空行"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay(deck, script: List[dict], seed: int = 0, threshold: Optional[float] = None,
+           answers: Optional[AcceptedAnswers] = None) -> Tuple[List[dict], List[dict]]:
+    """按会话重放脚本中的答案，并与记录的判定比较
+
+    每个会话只从脚本中出现过的句子出题，相同的种子得到相同的出题顺序；
+    没有会话编号的作答各自单独重放。
+
+    Args:
+        deck: 题库
+        script: load_script 读取的作答记录
+        seed: 记录中没有种子时使用的种子
+        threshold: 相似度阈值，默认使用 PRACTICE_SETTINGS 中的设置
+        answers: 各题其他可接受的答案，为 None 时只接受题目的英文句子
+
+    Returns:
+        (重放得到的作答记录, 判定与记录不同的作答[含 "expected"])
+    """
+    if threshold is None:
+        threshold = PRACTICE_SETTINGS['similarity_threshold']
+    if not isinstance(deck, DeckIndex):
+        deck = DeckIndex(dict(deck.items()), normalize_text)
+
+    # 没有会话编号的作答(如用户回报的误判)各自单独成一个会话
+    by_session: Dict[object, List[dict]] = defaultdict(list)
+    for line, entry in enumerate(script):
+        by_session[entry.get("session", f"#{line + 1}")].append(entry)
+
+    records, mismatches = [], []
+    for number, entries in by_session.items():
+        session_seed = entries[0].get("seed", seed)
+        known = [entry for entry in entries if entry["english"] in deck]
+        # 同一句子的多次作答按顺序对应各自期望的判定
+        expected: Dict[Tuple[str, str], Deque[Optional[str]]] = defaultdict(deque)
+        for entry in known:
+            expected[entry["english"], entry["answer"]].append(entry.get("verdict"))
+
+        learner = ScriptedLearner((entry["english"], entry["answer"]) for entry in known)
+        subset = deck.subset(dict.fromkeys(entry["english"] for entry in known))
+        for phase, attempt in run_session(subset, learner, session_seed, len(known), threshold,
+                                          answers=answers):
+            record = attempt_record(number, session_seed, phase, attempt)
+            records.append(record)
+            verdicts = expected[attempt.card.english, attempt.answer]
+            wanted = verdicts.popleft() if verdicts else None
+            if wanted is not None and wanted != attempt.verdict:
+                mismatches.append(dict(record, expected=wanted))
+    return records, mismatches
+
+
+def write_records(file_path: str, records: Iterable[dict]) -> None:
+    with open(file_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def print_counts(counts: Counter) -> None:
+    """按阶段输出各判定结果的数量"""
+    for phase, label in (("practice", "練習"), ("review", "複習")):
+        total = sum(count for (stage, _), count in counts.items() if stage == phase)
+        print(
+            f"{COLORS['question']}{label} {total} 題: "
+            f"{COLORS['correct']}正確 {counts[phase, CORRECT]}{COLORS['reset']}, "
+            f"{COLORS['almost']}差一點 {counts[phase, ALMOST]}{COLORS['reset']}, "
+            f"{COLORS['wrong']}錯誤 {counts[phase, WRONG]}{COLORS['reset']}"
+        )
+
+
+def _positive_int(text: str) -> int:
+    """命令行参数类型：正整数"""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"必须是正整数: {text!r}")
+    return value
+
+
+def main():
+    """程序主入口"""
+    parser = argparse.ArgumentParser(description="模拟练习会话，压力测试判题并重现误判")
+    parser.add_argument("deck", help="题库JSON文件")
+    parser.add_argument("-n", "--sessions", type=_positive_int, default=1000, help="模拟的会话数(默认1000)")
+    parser.add_argument("-q", "--questions", type=int, default=DEFAULT_QUESTIONS,
+                        help=f"每个会话的出题数(默认{DEFAULT_QUESTIONS})")
+    parser.add_argument("-j", "--workers", type=_positive_int, default=None, help="进程数(默认为CPU核心数)")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子(默认0)")
+    parser.add_argument("--accuracy", type=float, default=0.6, help="模拟学习者答对的比例(默认0.6)")
+    parser.add_argument("--typo-rate", type=float, default=0.25, help="拼错少量字母的比例(默认0.25)")
+    parser.add_argument("--transcript", metavar="PATH", help="把每次作答写入 JSON Lines 文件，可供 --replay 重放")
+    parser.add_argument("--replay", metavar="PATH", help="重放文件中的答案，列出判定与记录不同的作答")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="导出判题各环节耗时(.json 为 JSON，其他为 Prometheus 格式，- 为标准输出)")
+    args = parser.parse_args()
+
+    if args.replay:
+        records, mismatches = replay(load_deck(args.deck), load_script(args.replay), args.seed,
+                                     answers=load_accepted([args.deck], normalize_text))
+        print_counts(Counter((record["phase"], record["verdict"]) for record in records))
+        for record in mismatches:
+            print(f"{COLORS['wrong']}判定不同: {record['english']!r} ← {record['answer']!r} "
+                  f"期望 {record['expected']}，實際 {record['verdict']} "
+                  f"(相似度 {record['similarity']:.3f}){COLORS['reset']}")
+        if args.transcript:
+            write_records(args.transcript, records)
+        if mismatches:
+            sys.exit(1)
+        return
+
+    start = time.perf_counter()
+    counts, metrics, records = simulate(args.deck, args.sessions, args.seed, args.questions,
+                                        accuracy=args.accuracy, typo_rate=args.typo_rate,
+                                        workers=args.workers, keep_attempts=bool(args.transcript))
+    elapsed = time.perf_counter() - start
+
+    print_counts(counts)
+    attempts = sum(counts.values())
+    print(f"{COLORS['prompt']}{args.sessions} 個會話、{attempts} 次作答，耗時 {elapsed:.2f} 秒 "
+          f"({attempts / elapsed:,.0f} 次/秒){COLORS['reset']}")
+    for line in metrics.summary():
+        print(f"{COLORS['prompt']}{line}{COLORS['reset']}")
+    if args.transcript:
+        write_records(args.transcript, records)
+    if args.metrics:
+        metrics.dump(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+间隔重复模块
+功能：按 SM-2 算法安排每个句子的复习时间，答对的句子间隔越来越长，答错的尽快重练
+特点：
+1. 每个句子记录难度系数(ease)、复习间隔、连续答对次数和下次复习时间
+2. 已学过的句子按下次复习时间放在最小堆中，取下一张到期卡片只需 O(log n)
+3. 新句子由 DeckCursor 随机、不重复地提供，不必扫描整个题库
+"""
+
+import heapq
+import itertools
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from deck import Card, DeckCursor
+from similarity import ALMOST, CORRECT
+
+DAY_SECONDS = 24 * 60 * 60
+RELEARN_SECONDS = 10 * 60  # 答错后多久再练一次
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+
+# 判定结果对应的 SM-2 评分(0-5)
+VERDICT_QUALITY = {
+    CORRECT: 5,
+    ALMOST: 3,
+}
+WRONG_QUALITY = 1
+
+
+class ReviewState:
+    """单个句子的复习状态"""
+    __slots__ = ("ease", "interval", "repetitions", "due", "lapses")
+
+    def __init__(self, ease: float = INITIAL_EASE, interval: float = 0.0,
+                 repetitions: int = 0, due: float = 0.0, lapses: int = 0):
+        self.ease = ease                # 难度系数，越大间隔增长越快
+        self.interval = interval        # 当前复习间隔(天)
+        self.repetitions = repetitions  # 连续答对次数
+        self.due = due                  # 下次复习时间(Unix 时间戳)
+        self.lapses = lapses            # 累计答错次数
+
+    def review(self, quality: int, now: float) -> None:
+        """按 SM-2 规则更新状态
+
+        Args:
+            quality: 评分(0-5)，3 分及以上视为答对
+            now: 当前时间戳
+        """
+        if quality >= 3:
+            if self.repetitions == 0:
+                self.interval = 1.0
+            elif self.repetitions == 1:
+                self.interval = 6.0
+            else:
+                self.interval = round(self.interval * self.ease, 2)
+            self.repetitions += 1
+            self.due = now + self.interval * DAY_SECONDS
+        else:
+            self.repetitions = 0
+            self.interval = 0.0
+            self.lapses += 1
+            self.due = now + RELEARN_SECONDS
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+
+class Scheduler:
+    """间隔重复调度器
+
+    出题顺序：先出已到期的复习卡片(最早到期的优先)，没有到期卡片时再出新句子。
+
+    Args:
+        deck: 题库(DeckIndex、StreamingDeck 或 CompiledDeck)
+        rng: 随机数生成器(决定新句子的顺序)
+        clock: 返回当前时间戳的函数
+    """
+
+    def __init__(self, deck, rng: Optional[random.Random] = None,
+                 clock: Callable[[], float] = time.time):
+        self._cursor = DeckCursor(deck, rng)
+        self._clock = clock
+        self._states: Dict[str, ReviewState] = {}
+        self._cards: Dict[str, Card] = {}
+        self._heap: List[Tuple[float, int, str]] = []  # (到期时间, 序号, 英文)
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        """已学过(有复习状态)的句子数"""
+        return len(self._states)
+
+    def state(self, english: str) -> Optional[ReviewState]:
+        """句子的复习状态，未学过时为 None"""
+        return self._states.get(english)
+
+    def states(self) -> Dict[str, ReviewState]:
+        """所有句子的复习状态"""
+        return dict(self._states)
+
+    def restore(self, card: Card, state: ReviewState) -> None:
+        """载入之前保存的复习状态"""
+        self._states[card.english] = state
+        self._cards[card.english] = card
+        self._push(card.english, state.due)
+
+    def _push(self, english: str, due: float) -> None:
+        heapq.heappush(self._heap, (due, next(self._counter), english))
+
+    def next_card(self, learn_ahead: bool = False) -> Optional[Card]:
+        """取出下一张卡片
+
+        Args:
+            learn_ahead: 没有到期卡片和新句子时，是否提前复习最早到期的卡片
+
+        Returns:
+            下一张卡片；本次没有可练习的卡片时为 None
+        """
+        if self._heap and self._heap[0][0] <= self._clock():
+            _, _, english = heapq.heappop(self._heap)
+            return self._cards[english]
+        while not self._cursor.round_finished:
+            card = next(self._cursor)
+            if card.english not in self._states:
+                return card
+        if learn_ahead and self._heap:
+            _, _, english = heapq.heappop(self._heap)
+            return self._cards[english]
+        return None
+
+    def peek(self, learn_ahead: bool = False) -> Optional[Card]:
+        """查看下一张卡片但不取出(用于预先合成语音)，与 next_card 的选择规则相同
+
+        新句子中已学过的会被 next_card 跳过，这里直接将其取出丢弃：
+        学过的句子不会再变回新句子，之后的 next_card 同样会跳过它们。
+
+        Args:
+            learn_ahead: 与 next_card 的同名参数相同
+        """
+        if self._heap and self._heap[0][0] <= self._clock():
+            return self._cards[self._heap[0][2]]
+        while not self._cursor.round_finished:
+            card = self._cursor.peek()
+            if card.english not in self._states:
+                return card
+            next(self._cursor)
+        if learn_ahead and self._heap:
+            return self._cards[self._heap[0][2]]
+        return None
+
+    def review(self, card: Card, verdict: str) -> ReviewState:
+        """记录一次作答结果并安排下次复习
+
+        Args:
+            card: 刚作答的卡片
+            verdict: similarity 模块的判定结果(CORRECT / ALMOST / WRONG)
+
+        Returns:
+            更新后的复习状态
+        """
+        state = self._states.get(card.english)
+        if state is None:
+            state = self._states[card.english] = ReviewState()
+            self._cards[card.english] = card
+        state.review(VERDICT_QUALITY.get(verdict, WRONG_QUALITY), self._clock())
+        self._push(card.english, state.due)
+        return state
+
+    def postpone(self, card: Card, delay: float = RELEARN_SECONDS) -> None:
+        """跳过的卡片(未作答)在 delay 秒后再出，复习状态不变"""
+        self._cards[card.english] = card
+        self._push(card.english, self._clock() + delay)
+
+    def session(self) -> Iterator[Card]:
+        """依次产出本次练习的卡片，直到没有到期卡片且新句子都已出过"""
+        while True:
+            card = self.next_card()
+            if card is None:
+                return
+            yield card
@@ -0,0 +1,34 @@
+"""abbreviations.AbbreviationExpander 的单词边界、大小写与撇号处理"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abbreviations import AbbreviationExpander
+
+MAPPING = {"it's": "it is", "can't": "cannot", "don't": "do not", "I'd": "I would"}
+
+
+def test_only_whole_words_are_expanded():
+    expander = AbbreviationExpander(MAPPING)
+    # 模块说明中的例子："visit's" 含有 "it's"，但不是完整的单词
+    assert expander.expand("The visit's end. It's over") == "The visit's end. it is over"
+    assert expander.expand("scan't idon't it'sy") == "scan't idon't it'sy"
+    assert expander.expand("(don't)can't.") == "(do not)cannot."
+
+
+def test_case_and_curly_apostrophes():
+    expander = AbbreviationExpander(MAPPING)
+    assert expander.expand("I'd i’d I’D") == "i would i would i would"
+    assert expander.expand("DON’T") == "do not"
+
+
+def test_update_and_remove_recompile():
+    expander = AbbreviationExpander(MAPPING)
+    assert expander.expand("won't") == "won't"
+    expander.add("won't", "will not")
+    assert expander.expand("won't") == "will not"
+    expander.remove("WON’T")
+    assert expander.expand("won't") == "won't"
+    assert AbbreviationExpander().expand("don't") == "don't"
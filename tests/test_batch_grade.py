@@ -0,0 +1,42 @@
+"""batch_grade 的批量判题结果"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answers import AcceptedAnswers
+from batch_grade import grade_many
+from practice import normalize_text
+from similarity import ALMOST, CORRECT, WRONG
+
+
+def test_hints_are_plain_text():
+    results = grade_many([("I am in a hury", "I am in a hurry"), ("I am in a hurryy", "I am in a hurry"),
+                          ("I am in a hurry", "I am in a hurry"), ("Nice weather", "I am in a hurry")],
+                         workers=1)
+    assert [result.verdict for result in results] == [ALMOST, ALMOST, CORRECT, WRONG]
+    assert [result.hint for result in results] == ["i am in a hur[r]y", "i am in a hurry{y}", "", ""]
+
+
+def test_accepted_variants_are_correct():
+    answers = AcceptedAnswers(normalize_text)
+    answers.add("I am in a hurry", ["I am in a rush"])
+    pairs = [("I am in a rush", "I am in a hurry"), ("I am in a rushh", "I am in a hurry")]
+    assert [result.verdict for result in grade_many(pairs, workers=1)] == [WRONG, WRONG]
+
+    results = grade_many(pairs, workers=1, answers=answers)
+    assert [(result.verdict, result.accepted) for result in results] == [
+        (CORRECT, "I am in a rush"), (ALMOST, "I am in a rush")]
+    # 提示对照最接近的可接受写法，而不是标准答案
+    assert results[1].hint == "i am in a rush{h}"
+
+
+def test_parallel_matches_single_process(monkeypatch):
+    import batch_grade
+
+    monkeypatch.setattr(batch_grade, "PARALLEL_MIN_PAIRS", 1)
+    answers = AcceptedAnswers(normalize_text)
+    answers.add("I am in a hurry", ["I am in a rush"])
+    pairs = [("I am in a rush", "I am in a hurry"), ("I am in a hury", "I am in a hurry"), ("No", "Yes")] * 4
+    assert grade_many(pairs, workers=2, answers=answers) == grade_many(pairs, workers=1, answers=answers)
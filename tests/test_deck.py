@@ -0,0 +1,235 @@
+"""题库的加载方式与按句子查找"""
+
+import json
+import os
+import random
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck_binary import CompiledDeck, compile_deck, compile_in_background, compiled_path
+import deck_stream
+from deck import DeckCursor, DeckIndex
+from deck_stream import StreamingDeck, open_deck
+from practice import PRACTICE_SETTINGS, load_deck, load_json_file, normalize_text, normalizer_fingerprint
+
+SENTENCES = {f'Sentence {i} says "hi" / é': f"第{i}句" for i in range(300)}
+
+
+@pytest.fixture(params=["stream", "compiled"])
+def deck(request, tmp_path):
+    path = str(tmp_path / "deck.json")
+    with open(path, "w", encoding="utf-8") as f:
+        # 一半题目以转义写出，检查原始字节与解码后的句子都能匹配
+        f.write("{" + ",".join(json.dumps(english, ensure_ascii=i % 2 == 0) + ": " + json.dumps(chinese)
+                               for i, (english, chinese) in enumerate(SENTENCES.items())) + "}")
+    if request.param == "stream":
+        return open_deck(path, normalize_text)
+    return compiled(path)
+
+
+def compiled(path):
+    return CompiledDeck(compile_deck(path, load_json_file(path), normalize_text, normalizer_fingerprint()),
+                        normalize_text)
+
+
+def test_contains(deck):
+    assert all(english in deck for english in SENTENCES)
+    for missing in ("Sentence 1", 'Sentence 300 says "hi" / é', "", 1):
+        assert missing not in deck
+
+
+def test_compiled_position(tmp_path):
+    path = str(tmp_path / "deck.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(SENTENCES, f, ensure_ascii=False)
+    deck = compiled(path)
+    for position, english in enumerate(SENTENCES):
+        assert deck.position(english) == position
+    assert deck.position("missing") is None
+
+
+def join_compiler():
+    for thread in threading.enumerate():
+        if thread.name == "deck-compiler":
+            thread.join()
+
+
+def test_large_deck_streams_while_compiling(tmp_path, monkeypatch):
+    monkeypatch.setitem(PRACTICE_SETTINGS, "streaming_min_mb", 0)
+    path = str(tmp_path / "deck.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(SENTENCES, f, ensure_ascii=False)
+
+    deck = load_deck(path)
+    assert isinstance(deck, StreamingDeck)
+    join_compiler()
+    assert os.path.exists(compiled_path(path))
+
+    deck = load_deck(path)
+    assert isinstance(deck, CompiledDeck)
+    assert [card.english for card in deck] == list(SENTENCES)
+
+    # 只是修改时间变了(如重新检出)，内容相同时继续使用编译结果
+    os.utime(path, ns=(0, 0))
+    assert isinstance(load_deck(path), CompiledDeck)
+
+    # 内容变了(即使大小不变)编译结果过期，再次先流式加载
+    with open(path, "r+b") as f:
+        f.seek(-len('句"}'.encode("utf-8")), os.SEEK_END)
+        f.write(b"XYZ")
+    assert isinstance(load_deck(path), StreamingDeck)
+    join_compiler()
+    assert load_deck(path).entry(len(SENTENCES) - 1)[1] == f"第{len(SENTENCES) - 1}XYZ"
+
+
+@pytest.mark.parametrize("content", [
+    '["Hello", "你好"]',
+    '{"Hello": ["你好"]}',
+    '{"Hello": 1}',
+])
+def test_compile_rejects_non_string_decks(tmp_path, monkeypatch, content):
+    path = str(tmp_path / "deck.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    with pytest.raises(ValueError):
+        compile_deck(path, json.loads(content), normalize_text, normalizer_fingerprint())
+
+    # 后台编译同样不会因此抛出异常，只是不生成编译结果
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", errors.append)
+    compile_in_background(path, normalize_text, normalizer_fingerprint(), load_json_file).join()
+    assert errors == []
+    assert not os.path.exists(compiled_path(path))
+
+
+# 各种需要转义或容易误判为 JSON 结构的字符
+TRICKY = {
+    'He said "hi"': "他说“嗨”",
+    "back\\slash": "反斜线",
+    "tab\there": "制表符",
+    "line\nbreak": "换行",
+    "emoji 😀 and é": "表情",
+    "Don't, {won't}: [can't]": "标点",
+    "  spaced  ": "空格",
+    "  separator": "分隔符",
+    "": "空句子",
+}
+FORMATS = {
+    "compact": dict(ensure_ascii=False, separators=(",", ":")),
+    "ascii": dict(ensure_ascii=True),
+    "indented": dict(ensure_ascii=False, indent=4),
+}
+
+
+@pytest.fixture(params=list(FORMATS))
+def tricky_path(request, tmp_path):
+    path = str(tmp_path / "tricky.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(TRICKY, f, **FORMATS[request.param])
+    return path
+
+
+def test_stream_round_trip(tricky_path, monkeypatch):
+    monkeypatch.setattr(deck_stream, "SCAN_CHUNK", 2)  # 分多次解析
+    monkeypatch.setattr(deck_stream, "CARD_CACHE_SIZE", 3)
+    deck = open_deck(tricky_path, normalize_text)
+    assert len(deck) == 2
+    assert list(deck.items()) == list(TRICKY.items())
+    assert [card.normalized for card in deck] == [normalize_text(english) for english in TRICKY]
+    assert deck.complete and len(deck) == len(TRICKY)
+    assert all(english in deck for english in TRICKY)
+
+
+def test_binary_round_trip(tricky_path):
+    deck = compiled(tricky_path)
+    assert len(deck) == len(TRICKY)
+    assert list(deck.items()) == list(TRICKY.items())
+    assert [card.normalized for card in deck] == [normalize_text(english) for english in TRICKY]
+    assert [deck.position(english) for english in TRICKY] == list(range(len(TRICKY)))
+    assert deck.is_fresh(tricky_path, normalizer_fingerprint())
+    assert not deck.is_fresh(tricky_path, bytes(32))
+
+
+def test_empty_deck(tmp_path):
+    path = str(tmp_path / "empty.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{ }")
+    stream = open_deck(path, normalize_text)
+    assert (len(stream), list(stream), bool(stream)) == (0, [], False)
+    binary = compiled(path)
+    assert (len(binary), list(binary), binary.position("x")) == (0, [], None)
+
+
+@pytest.mark.parametrize("content, first", [
+    ('{"a": "b", "c": 1}', True),
+    ('{"a": "b", "c": "d"', True),
+    ('{"a": 1}', False),
+    ('["a", "b"]', False),
+])
+def test_stream_rejects_malformed_decks(tmp_path, monkeypatch, content, first):
+    # 每次只解析一条：格式错误在第一条之后时，打开时不报错，解析到错误处才报错
+    monkeypatch.setattr(deck_stream, "SCAN_CHUNK", 1)
+    path = str(tmp_path / "bad.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    if not first:
+        with pytest.raises(ValueError):
+            open_deck(path, normalize_text)
+        return
+    deck = open_deck(path, normalize_text)
+    assert deck.entry(0) == ("a", "b")
+    with pytest.raises(ValueError):
+        deck.scan_all()
+
+
+@pytest.mark.parametrize("garbage", [b"", b"PDECKBIN", b"x" * 200])
+def test_compiled_rejects_invalid_files(tmp_path, garbage):
+    path = tmp_path / "bad.deckbin"
+    path.write_bytes(garbage)
+    with pytest.raises(ValueError):
+        CompiledDeck(str(path), normalize_text)
+
+
+def test_compiled_rejects_truncated_file(tmp_path):
+    path = str(tmp_path / "deck.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(SENTENCES, f, ensure_ascii=False)
+    output = compile_deck(path, SENTENCES, normalize_text, normalizer_fingerprint())
+    with open(output, "r+b") as f:
+        f.truncate(200)
+    with pytest.raises(ValueError):
+        CompiledDeck(output, normalize_text)
+
+
+@pytest.fixture(params=["index", "stream", "compiled"])
+def deck_kind(request):
+    return request.param
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 100])
+def test_cursor_rounds(deck_kind, tmp_path, monkeypatch, size):
+    monkeypatch.setattr(deck_stream, "SCAN_CHUNK", 3)
+    sentences = {f"Sentence {i}": f"第{i}句" for i in range(size)}
+    path = str(tmp_path / "deck.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sentences, f, ensure_ascii=False)
+    deck = {"index": lambda: DeckIndex(sentences, normalize_text),
+            "stream": lambda: open_deck(path, normalize_text),
+            "compiled": lambda: compiled(path)}[deck_kind]()
+
+    cursor = DeckCursor(deck, random.Random(size))
+    rounds = []
+    for _ in range(4):
+        assert cursor.peek() == cursor.peek()
+        rounds.append([card.english for card in cursor.one_round()])
+    for number, drawn in enumerate(rounds):
+        # 每轮恰好出完全部题目各一次，且新一轮的第一题不是上一轮的最后一题
+        assert sorted(drawn) == sorted(sentences)
+        if number and size > 1:
+            assert drawn[0] != rounds[number - 1][-1]
+    assert cursor.epoch == 3
+
@@ -0,0 +1,98 @@
+"""lint 的题库读取、拼写检查与 MinHash 相近句子查找"""
+
+import itertools
+import json
+import os
+import random
+import sys
+from array import array
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lint
+from lint import BANDS, candidate_pairs, load_wordlist, read_deck, signature, suggest
+from practice import normalize_text
+from similarity import bounded_ratio
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / f"{name}.json"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("content", ['["Hello", "你好"]', '[["Hello", "你好"]]', '"Hello"', "1"])
+def test_read_deck_rejects_non_objects(tmp_path, content):
+    assert read_deck(write(tmp_path, "deck", content)) == ([], ["頂層不是物件"])
+
+
+def test_read_deck_keeps_repeated_keys(tmp_path):
+    entries, problems = read_deck(write(tmp_path, "deck", '{"Hi": "嗨", "Hi": "你好", "Bad": {"x": "y"}}'))
+    assert entries == [("Hi", "嗨"), ("Hi", "你好")]
+    assert len(problems) == 1
+
+
+def test_wordlist_is_ranked_and_suggestions_prefer_common_words(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("# 注释\nthe\nwhose\nwoes\nThe\n", encoding="utf-8")
+    wordlist = load_wordlist([str(path), str(tmp_path / "missing.txt")])
+    assert wordlist == {"the": 0, "whose": 1, "woes": 2}
+    assert suggest("whoes", wordlist, Counter()) == "whose"
+    assert suggest("whoes", wordlist, Counter({"woes": 1})) == "woes"
+    assert suggest("zzzz", wordlist, Counter()) is None
+
+
+def test_shipped_wordlist_catches_deck_typos():
+    wordlist = load_wordlist(lint.DEFAULT_WORDLISTS[:1])
+    for typo, fixed in [("eqipped", "equipped"), ("lenght", "length"), ("mastakes", "mistakes"),
+                        ("whoes", "whose")]:
+        assert typo not in wordlist
+        assert suggest(typo, wordlist, Counter()) == fixed
+
+
+def test_signature_is_deterministic():
+    text = normalize_text("The quick brown fox jumps over the lazy dog")
+    assert len(signature(text)) == BANDS
+    assert signature(text) == signature(text)
+    assert signature("") == signature("")
+
+
+def make_corpus(count, seed=0):
+    """随机句子，其中十分之一另有一个改了一个字母的副本"""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+                  for _ in range(2000)]
+    sentences = [" ".join(rng.choices(vocabulary, k=rng.randint(6, 14))) for _ in range(count)]
+    for sentence in sentences[:count // 10]:
+        position = rng.randrange(len(sentence))
+        sentences.append(sentence[:position] + rng.choice("xyz") + sentence[position + 1:])
+    return list(dict.fromkeys(sentences))
+
+
+def test_candidate_pairs_cover_all_near_duplicates():
+    texts = [normalize_text(sentence) for sentence in make_corpus(400)]
+    keys = array("I")
+    for text in texts:
+        keys.extend(signature(text))
+    pairs, skipped = candidate_pairs(texts, keys, 0.9)
+    assert skipped == 0
+    expected = {(a, b) for a, b in itertools.combinations(range(len(texts)), 2)
+                if bounded_ratio(texts[a], texts[b], 0.9) >= 0.9}
+    assert len(expected) >= 30
+    assert expected <= set(pairs)
+
+
+def test_parallel_lint_matches_single_process(tmp_path, monkeypatch):
+    corpus = make_corpus(300, seed=1)
+    paths = {"first": write(tmp_path, "first", json.dumps({s: "中" for s in corpus[::2]})),
+             "second": write(tmp_path, "second", json.dumps({s: "中" for s in corpus[1::2]}))}
+    wordlist = {word: rank for rank, word in enumerate(sorted({w for s in corpus[:100] for w in s.split()}))}
+    single = lint.lint(paths, wordlist, workers=1)
+
+    monkeypatch.setattr(lint, "CHUNK_SIZE", 64)
+    parallel = lint.lint(paths, wordlist, workers=2)
+    assert parallel == single
+    assert single.near_duplicates and single.misspellings
@@ -0,0 +1,92 @@
+"""nearest.SentenceIndex 的相近句子查找"""
+
+import difflib
+import json
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck import DeckIndex
+from deck_stream import open_deck
+from nearest import SentenceIndex, grams
+from practice import normalize_text
+from session import PracticeSession
+
+THRESHOLD = 0.95
+
+
+def make_sentences(count, seed=0):
+    rng = random.Random(seed)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 8)))
+             for _ in range(300)]
+    sentences = {}
+    while len(sentences) < count:
+        sentences[" ".join(rng.choices(words, k=rng.randint(4, 25))).capitalize()] = f"第{len(sentences)}句"
+    return sentences
+
+
+def typo(text, rng):
+    position = rng.randrange(len(text))
+    return text[:position] + rng.choice("xyz") + text[position + 1:]
+
+
+def test_grams():
+    assert grams("") == set()
+    assert grams("ab") == {"ab"}
+    assert grams("abcd") == {"abc", "bcd"}
+
+
+def test_finds_the_sentence_a_typo_came_from():
+    sentences = make_sentences(2000)
+    deck = DeckIndex(sentences, normalize_text)
+    index = SentenceIndex(deck)
+    rng = random.Random(1)
+    for english in rng.sample(list(sentences), 200):
+        answer = normalize_text(typo(english, rng))
+        found = index.nearest(answer, THRESHOLD)
+        expected = difflib.SequenceMatcher(None, answer, deck.normalized(english)).ratio()
+        if expected < THRESHOLD:
+            continue
+        assert found and found[0][0].english == english
+        assert found[0][1] == pytest.approx(expected)
+
+
+def test_results_meet_threshold_and_exclude():
+    sentences = make_sentences(500, seed=2)
+    index = SentenceIndex(DeckIndex(sentences, normalize_text))
+    english = next(iter(sentences))
+    normalized = normalize_text(english)
+    assert index.nearest(normalized, THRESHOLD)[0][0].english == english
+    assert all(card.english != english for card, _ in index.nearest(normalized, THRESHOLD, exclude=english))
+    for card, similarity in index.nearest(normalized, 0.5, limit=10):
+        assert similarity >= 0.5
+        assert similarity == pytest.approx(difflib.SequenceMatcher(None, normalized, card.normalized).ratio())
+    assert index.nearest("", THRESHOLD) == []
+
+
+def wait_ready(index, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not index.ready:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_background_build(tmp_path):
+    sentences = make_sentences(300, seed=3)
+    path = str(tmp_path / "deck.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sentences, f, ensure_ascii=False)
+    deck = open_deck(path, normalize_text)
+    session = PracticeSession(deck, normalize_text, THRESHOLD, find_nearest=True)
+    # 答题循环照常使用流式题库，后台线程另开读取器建立索引
+    first = next(session.questions())
+    wait_ready(session.index)
+    assert len(session.index) == len(sentences)
+    other = next(english for english in sentences if english != first.english)
+    attempt = session.submit(first, other)
+    assert attempt.nearest and attempt.nearest[0][0].english == other
@@ -0,0 +1,77 @@
+"""practice 的答案规范化与判定结果显示"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answers import AcceptedAnswers
+from deck import Card
+from metrics import Metrics
+from practice import PRACTICE_SETTINGS, normalize_text, normalize_with_spans, show_attempt
+from session import grade_attempt
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I’m late!", "iamlate"),
+    ("I'm late.", "iamlate"),
+    ("James’s car", "james'scar"),
+    ("Don’t move", "donotmove"),
+])
+def test_normalize_keeps_both_apostrophes(text, expected):
+    assert normalize_text(text) == expected
+    assert normalize_with_spans(text)[0] == expected
+
+
+class CountingSound:
+    """记录播放次数的假音效"""
+
+    def __init__(self):
+        self.plays = 0
+
+    def play(self):
+        self.plays += 1
+
+
+def card(english: str, chinese: str = "我很急") -> Card:
+    return Card(english, chinese, normalize_text(english))
+
+
+def show(attempt, capsys):
+    right, wrong = CountingSound(), CountingSound()
+    show_attempt(attempt, right, wrong)
+    return right.plays, wrong.plays, capsys.readouterr().out
+
+
+def attempt_for(answer: str, answers: AcceptedAnswers = None):
+    return grade_attempt(card("I am in a hurry"), answer, normalize_text,
+                         PRACTICE_SETTINGS['similarity_threshold'], Metrics(enabled=False), answers=answers)
+
+
+@pytest.mark.parametrize("answer", ["I am in a hurry", "I am in a hury"])
+def test_right_answer_plays_only_right_sound(answer, capsys):
+    right, wrong, out = show(attempt_for(answer), capsys)
+    assert (right, wrong) == (1, 0)
+    assert "翻譯錯誤" not in out
+    assert "正確翻譯" not in out
+    assert "標準譯法" not in out
+
+
+def test_wrong_answer_plays_only_wrong_sound(capsys):
+    right, wrong, out = show(attempt_for("Nice weather today"), capsys)
+    assert (right, wrong) == (0, 1)
+    assert "翻譯錯誤" in out
+    assert "正確翻譯: I am in a hurry" in out
+
+
+def test_accepted_variant_lists_standard_answer(capsys):
+    answers = AcceptedAnswers(normalize_text)
+    answers.add("I am in a hurry", ["I('m| am) in a rush"])
+    attempt = attempt_for("I'm in a rush", answers)
+    assert attempt.accepted is not None
+    right, wrong, out = show(attempt, capsys)
+    assert (right, wrong) == (1, 0)
+    assert "標準譯法: I am in a hurry" in out
+    assert "翻譯錯誤" not in out
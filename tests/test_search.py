@@ -0,0 +1,102 @@
+"""search.CardSearch 与 Catalog.search：随机题目与查询下与逐题比对的结果一致"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+from deck import Card, DeckIndex
+from practice import normalize_text
+from search import _SEPARATORS, CardSearch, chinese_grams, english_words
+
+HANZI = "我你他是不好的开玩笑认真吗在家"
+WORDS = ["are", "you", "kidding", "me", "serious", "i'm", "can't", "home", "at", "be"]
+
+
+def make_cards(count, seed=0):
+    rng = random.Random(seed)
+    cards = []
+    for number in range(count):
+        english = " ".join(rng.choices(WORDS, k=rng.randint(1, 6))).capitalize() + f" {number}"
+        chinese = "".join(rng.choice(HANZI + "，？ ") for _ in range(rng.randint(1, 10)))
+        cards.append(Card(english, chinese, normalize_text(english)))
+    return cards
+
+
+def make_query(rng, cards):
+    terms = []
+    for _ in range(rng.randint(1, 3)):
+        if rng.random() < 0.6:
+            chinese = _SEPARATORS.sub("", rng.choice(cards).chinese) or "家"
+            start = rng.randrange(len(chinese))
+            terms.append(chinese[start:start + rng.randint(1, 4)])
+        else:
+            terms.append(rng.choice(WORDS + ["KIDDING", "absent"]))
+    if rng.random() < 0.1:
+        terms.append("笑开")  # 两字组与顺序都要一致
+    return " ".join(terms)
+
+
+def matches(card, query):
+    """逐题判断：含汉字的词须连续出现在中文提示中，其他词的单词须全部出现在英文句子中"""
+    chinese = _SEPARATORS.sub("", card.chinese.lower())
+    words = set(english_words(card.english))
+    keys = 0
+    for term in query.split():
+        if any("一" <= char <= "鿿" for char in term):
+            phrase = _SEPARATORS.sub("", term.lower())
+            keys += 1
+            if phrase not in chinese:
+                return False
+        else:
+            term_words = english_words(term)
+            keys += len(term_words)
+            if not set(term_words) <= words:
+                return False
+    return keys > 0
+
+
+def test_grams_and_words():
+    assert chinese_grams("开玩笑？") == ["开", "玩", "笑", "开玩", "玩笑"]
+    assert english_words("Are you KIDDING me? I can't!") == ["are", "you", "kidding", "me", "i", "can't"]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_find_matches_brute_force(seed):
+    rng = random.Random(seed)
+    cards = make_cards(600, seed)
+    index = CardSearch(cards)
+    for _ in range(150):
+        query = make_query(rng, cards)
+        expected = [number for number, card in enumerate(cards) if matches(card, query)]
+        assert index.find(query) == expected, query
+        limit = rng.randint(0, 5)
+        assert index.find(query, limit=limit) == expected[:limit]
+        odd = [number for number in expected if number % 2]
+        assert index.find(query, accept=lambda number: number % 2 == 1) == odd
+        assert [card.english for card in index.search(query, limit=3)] == [cards[n].english for n in expected[:3]]
+
+
+def test_empty_and_missing_queries():
+    index = CardSearch(make_cards(50))
+    assert index.find("") == []
+    assert index.find("，？") == []
+    assert index.find("absent") == []
+    assert index.find("家 absent") == []
+
+
+def test_catalog_search_filters_by_deck():
+    daily = DeckIndex({"Are you kidding me": "你在开玩笑吗", "I'm serious": "我是认真的"}, normalize_text)
+    jokes = DeckIndex({"Are you kidding me": "你在开玩笑吗", "Just kidding": "开玩笑的"}, normalize_text)
+    catalog = Catalog({"daily": daily, "jokes": jokes}, normalize_text)
+
+    assert [card.english for card in catalog.search("开玩笑")] == ["Are you kidding me", "Just kidding"]
+    assert [card.english for card in catalog.search("开玩笑", ["daily"])] == ["Are you kidding me"]
+    assert [card.english for card in catalog.search("kidding", ["jokes"], limit=1)] == ["Are you kidding me"]
+    assert catalog.tags("Are you kidding me") == ["daily", "jokes"]
+    with pytest.raises(KeyError):
+        catalog.search("开玩笑", ["missing"])
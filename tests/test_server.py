@@ -0,0 +1,74 @@
+"""server.GradingServer 的静态资源与判题接口"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answers import AcceptedAnswers
+from catalog import Catalog
+from deck import DeckIndex
+from practice import normalize_text
+from server import MAX_GRADE_CHARS, GradingServer, HttpError
+
+SENTENCES = {"I am in a hurry": "我赶时间", "Are you kidding me": "你在开玩笑吗"}
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "index.html").write_text("<html></html>", encoding="utf-8")
+    (tmp_path / "secret.py").write_text("SECRET = 1", encoding="utf-8")
+    (tmp_path / "image").mkdir()
+    (tmp_path / "image" / "logo.png").write_bytes(b"png")
+    (tmp_path / "sound").mkdir()
+    (tmp_path / "sound" / "link.py").symlink_to(tmp_path / "secret.py")
+    catalog = Catalog({"daily": DeckIndex(SENTENCES, normalize_text)}, normalize_text)
+    answers = AcceptedAnswers(normalize_text)
+    answers.add("I am in a hurry", ["I am in a rush"])
+    return GradingServer(catalog, normalize_text, 0.95, root=str(tmp_path), answers=answers)
+
+
+def test_serves_static_files(server):
+    assert server.dispatch("GET", "/", b"")[2] == b"<html></html>"
+    assert server.dispatch("GET", "/image/logo.png", b"") == (200, "image/png", b"png")
+    assert server.dispatch("GET", "/image/./logo.png", b"")[2] == b"png"
+
+
+@pytest.mark.parametrize("path", ["/image/../secret.py", "/sound/../.git/config", "/image/..",
+                                  "/image", "/sound/link.py", "/../secret.py", "//secret.py",
+                                  "/image/\x00", "/image/logo.png\x00.txt"])
+def test_rejects_paths_outside_static_dirs(server, path):
+    with pytest.raises(HttpError) as error:
+        server.dispatch("GET", path, b"")
+    assert error.value.status == 404
+
+
+def grade(server, answer, reference="I am in a hurry"):
+    body = json.dumps({"answer": answer, "reference": reference}).encode("utf-8")
+    return json.loads(server.dispatch("POST", "/api/grade", body)[2])
+
+
+def test_grade(server):
+    assert grade(server, "I am in a hurry")["verdict"] == "correct"
+    assert grade(server, "I am in a hury")["verdict"] == "almost"
+    result = grade(server, "Are you kidding me")
+    assert result["verdict"] == "wrong"
+    assert [card["english"] for card in result["nearest"]] == ["Are you kidding me"]
+
+
+def test_grade_accepts_alternative_answers(server):
+    result = grade(server, "I am in a rush")
+    assert (result["verdict"], result["accepted"]) == ("correct", "I am in a rush")
+    assert "accepted" not in grade(server, "I am in a hurry")
+    assert grade(server, "I am in a rush", reference="I am not in the deck")["verdict"] == "wrong"
+
+
+def test_grade_rejects_overlong_text(server):
+    assert grade(server, "a" * MAX_GRADE_CHARS, reference="a" * MAX_GRADE_CHARS)["verdict"] == "correct"
+    for answer, reference in (("a" * (MAX_GRADE_CHARS + 1), "a"), ("a", "a" * (MAX_GRADE_CHARS + 1))):
+        with pytest.raises(HttpError) as error:
+            grade(server, answer, reference)
+        assert error.value.status == 400
@@ -0,0 +1,35 @@
+"""session 的作答记录"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck import DeckIndex
+from practice import normalize_text
+from progress import ProgressStore
+from session import PracticeSession
+
+
+def test_review_attempts_are_recorded_without_rescheduling(tmp_path):
+    path = str(tmp_path / "progress.sqlite3")
+    store = ProgressStore(path)
+    deck = DeckIndex({"I am in a hurry": "我赶时间"}, normalize_text)
+    session = PracticeSession(deck, normalize_text, 0.95, store=store)
+    card = next(session.questions())
+    state = session.submit(card, "Nice weather today").state
+
+    review = session.review()
+    review.submit(card, "I am in hurry now")
+    review.submit(card, "I am in a hurry")
+    assert not review
+    store.close()
+
+    with sqlite3.connect(path) as conn:
+        answers = [row[0] for row in conn.execute("SELECT answer FROM attempts ORDER BY id")]
+        stats = conn.execute("SELECT attempts, correct, wrong, last_verdict, ease, interval, repetitions, due, "
+                             "lapses FROM sentences").fetchone()
+    assert answers == ["Nice weather today", "I am in hurry now", "I am in a hurry"]
+    assert stats[:4] == (3, 1, 2, "correct")
+    assert stats[4:] == (state.ease, state.interval, state.repetitions, state.due, state.lapses)
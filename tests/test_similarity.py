@@ -0,0 +1,109 @@
+"""similarity 的上界与判定结果：随机输入下与 difflib.SequenceMatcher 逐一比对"""
+
+import difflib
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from similarity import (ALMOST, CORRECT, WRONG, align, bounded_ratio, grade,
+                        histogram_bound, lcs_length, length_bound)
+
+THRESHOLDS = [0.0, 0.5, 0.8, 0.9, 0.95, 1.0]
+
+
+def reference_lcs(a, b):
+    """普通的 O(len(a) × len(b)) 动态规划"""
+    prev = [0] * (len(b) + 1)
+    for ca in a:
+        cur = [0]
+        for j, cb in enumerate(b):
+            cur.append(prev[j] + 1 if ca == cb else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def mutate(rng, text, edits):
+    chars = list(text)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        position = rng.randrange(len(chars) + 1)
+        if op == 0 or not chars:
+            chars.insert(position, rng.choice("abcde "))
+        elif op == 1:
+            del chars[min(position, len(chars) - 1)]
+        else:
+            chars[min(position, len(chars) - 1)] = rng.choice("abcde ")
+    return "".join(chars)
+
+
+def random_pairs(count, seed=0):
+    """一半完全随机，一半是少量改动的近似串，保证每个分支都能走到"""
+    rng = random.Random(seed)
+    pairs = [("", ""), ("", "abc"), ("abc", ""), ("a", "a")]
+    while len(pairs) < count:
+        length = rng.choice([rng.randint(1, 12), rng.randint(20, 80), rng.randint(150, 300)])
+        a = "".join(rng.choice("abcde ") for _ in range(length))
+        if rng.random() < 0.5:
+            b = "".join(rng.choice("abcde ") for _ in range(rng.randint(0, length + 5)))
+        else:
+            b = mutate(rng, a, rng.randint(0, 4))
+        pairs.append((a, b))
+    return pairs
+
+
+@pytest.mark.parametrize("a, b", random_pairs(300, seed=1))
+def test_lcs_length_matches_dynamic_programming(a, b):
+    assert lcs_length(a, b) == reference_lcs(a, b)
+    assert lcs_length(b, a) == reference_lcs(a, b)
+
+
+def test_lcs_length_wide_alphabet():
+    rng = random.Random(2)
+    for _ in range(50):
+        a = "".join(chr(rng.randint(0x4E00, 0x4E20)) for _ in range(rng.randint(0, 70)))
+        b = "".join(chr(rng.randint(0x4E00, 0x4E20)) for _ in range(rng.randint(0, 70)))
+        assert lcs_length(a, b) == reference_lcs(a, b)
+
+
+@pytest.mark.parametrize("a, b", random_pairs(300, seed=3))
+def test_bounds_never_below_true_ratio(a, b):
+    ratio = difflib.SequenceMatcher(None, a, b).ratio()
+    total = len(a) + len(b)
+    lcs = 2.0 * lcs_length(a, b) / total if total else 1.0
+    assert length_bound(a, b) >= histogram_bound(a, b) >= lcs >= ratio
+
+
+@pytest.mark.parametrize("a, b", random_pairs(300, seed=4))
+def test_bounded_ratio_and_grade_match_difflib(a, b):
+    matcher = difflib.SequenceMatcher(None, a, b)
+    ratio = matcher.ratio()
+    for threshold in THRESHOLDS:
+        result = bounded_ratio(a, b, threshold)
+        if ratio >= threshold:
+            assert result == ratio
+        else:
+            # 提前放弃时返回的上界同样低于阈值，且不低于真实值
+            assert ratio <= result < threshold
+
+        verdict, similarity = grade(a, b, threshold)
+        if a == b:
+            expected = CORRECT
+        elif ratio >= threshold:
+            expected = ALMOST if ratio < 1 else CORRECT
+        else:
+            expected = WRONG
+        assert verdict == expected
+        if verdict != WRONG:
+            assert similarity == ratio
+
+
+@pytest.mark.parametrize("a, b", random_pairs(100, seed=5))
+def test_align_reuses_the_same_matcher(a, b):
+    similarity, matcher = align(a, b, 0.5)
+    if matcher is not None:
+        assert matcher.get_opcodes() == difflib.SequenceMatcher(None, a, b).get_opcodes()
+        assert similarity == difflib.SequenceMatcher(None, a, b).ratio()
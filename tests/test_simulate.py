@@ -0,0 +1,35 @@
+"""simulate 的参数检查与确定性"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DECK = os.path.join(ROOT, "json", "english_sentence.json")
+
+
+@pytest.mark.parametrize("argument", [["-n", "0"], ["-n", "-1"], ["-n", "x"], ["-j", "0"]])
+def test_rejects_non_positive_counts(monkeypatch, capsys, argument):
+    monkeypatch.setattr(sys, "argv", ["simulate.py", DECK] + argument)
+    with pytest.raises(SystemExit) as error:
+        simulate.main()
+    assert error.value.code == 2
+    assert "必须是正整数" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("sessions, workers", [(0, None), (1, 0)])
+def test_simulate_rejects_non_positive_counts(sessions, workers):
+    with pytest.raises(ValueError):
+        simulate.simulate(DECK, sessions, workers=workers)
+
+
+def test_same_seed_same_result():
+    first = simulate.simulate(DECK, 2, seed=7, questions=5, workers=1, keep_attempts=True)
+    second = simulate.simulate(DECK, 2, seed=7, questions=5, workers=1, keep_attempts=True)
+    assert first[0] == second[0]
+    assert first[2] == second[2]
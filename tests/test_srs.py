@@ -0,0 +1,104 @@
+"""srs.Scheduler 的出题顺序与 SM-2 复习间隔"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck import DeckIndex
+from practice import normalize_text
+from similarity import ALMOST, CORRECT, WRONG
+from srs import DAY_SECONDS, INITIAL_EASE, MIN_EASE, RELEARN_SECONDS, ReviewState, Scheduler
+
+SENTENCES = {f"Sentence number {i}": f"第{i}句" for i in range(20)}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def make_scheduler(clock, sentences=SENTENCES, seed=0):
+    deck = DeckIndex(sentences, normalize_text)
+    return deck, Scheduler(deck, random.Random(seed), clock)
+
+
+def test_review_intervals():
+    state = ReviewState()
+    state.review(5, 0.0)
+    assert (state.interval, state.repetitions, state.due) == (1.0, 1, DAY_SECONDS)
+    state.review(5, 0.0)
+    assert state.interval == 6.0
+    ease = state.ease
+    state.review(5, 0.0)
+    assert state.interval == round(6.0 * ease, 2)
+    assert state.ease > INITIAL_EASE
+
+    state.review(1, 100.0)
+    assert (state.interval, state.repetitions, state.lapses, state.due) == (0.0, 0, 1, 100.0 + RELEARN_SECONDS)
+    for _ in range(20):
+        state.review(0, 100.0)
+    assert state.ease == MIN_EASE
+
+
+def test_new_cards_once_then_due_reviews(clock):
+    deck, scheduler = make_scheduler(clock)
+    seen = [card.english for card in scheduler.session()]
+    assert sorted(seen) == sorted(SENTENCES)
+
+    first = deck.card_at(0)
+    scheduler.review(first, WRONG)
+    assert scheduler.next_card() is None
+    clock.now += RELEARN_SECONDS
+    assert scheduler.next_card() == first
+
+
+def test_learn_ahead_takes_earliest_review(clock):
+    _, scheduler = make_scheduler(clock, {"A": "甲", "B": "乙"})
+    cards = {card.english: card for card in scheduler.session()}
+    scheduler.review(cards["A"], CORRECT)
+    scheduler.review(cards["B"], ALMOST)
+    assert scheduler.next_card() is None
+    assert scheduler.next_card(learn_ahead=True).english in ("A", "B")
+
+
+def test_learned_cards_are_not_new(clock):
+    deck, scheduler = make_scheduler(clock)
+    # 恢复一半句子的进度，它们都还没到期
+    learned = set()
+    for position in range(0, len(SENTENCES), 2):
+        card = deck.card_at(position)
+        scheduler.restore(card, ReviewState(interval=1.0, repetitions=1, due=clock.now + DAY_SECONDS))
+        learned.add(card.english)
+    new = [card.english for card in scheduler.session()]
+    assert sorted(new) == sorted(set(SENTENCES) - learned)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("learn_ahead", [False, True])
+def test_peek_matches_next_card(clock, seed, learn_ahead):
+    rng = random.Random(seed)
+    deck, scheduler = make_scheduler(clock, seed=seed)
+    for position in rng.sample(range(len(SENTENCES)), 8):
+        due = clock.now + rng.choice([-60, 60, DAY_SECONDS])
+        scheduler.restore(deck.card_at(position), ReviewState(interval=1.0, repetitions=1, due=due))
+
+    for _ in range(3 * len(SENTENCES)):
+        upcoming = scheduler.peek(learn_ahead)
+        card = scheduler.next_card(learn_ahead)
+        assert upcoming == card
+        if card is None:
+            break
+        scheduler.review(card, rng.choice([CORRECT, ALMOST, WRONG]))
+        clock.now += rng.choice([1, RELEARN_SECONDS])
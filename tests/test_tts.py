@@ -0,0 +1,72 @@
+"""tts.SpeechWorker 的已解码语音缓存"""
+
+import os
+import sys
+import time
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from tts import SOUND_CACHE_SIZE, SpeechWorker
+from tts_cache import AudioCache
+
+
+class FakeEngine:
+    """把每句话合成为一小段静音 WAV 的假引擎"""
+
+    def __init__(self):
+        self.saved = []
+
+    def getProperty(self, name):
+        return {"voice": "fake", "rate": 150}[name]
+
+    def save_to_file(self, text, path):
+        self.saved.append(text)
+        with wave.open(path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(22050)
+            f.writeframes(b"\0\0" * 220)
+
+    def runAndWait(self):
+        pass
+
+
+@pytest.fixture
+def mixer():
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        pytest.skip(f"没有可用的音频设备: {e}")
+    yield
+    pygame.mixer.quit()
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_decoded_sounds_are_bounded(mixer, tmp_path):
+    engine = FakeEngine()
+    worker = SpeechWorker(lambda: engine, cache=AudioCache(str(tmp_path), max_bytes=None))
+    texts = [f"sentence {i}" for i in range(SOUND_CACHE_SIZE + 3)]
+    for text in texts:
+        worker.prefetch(text)
+    wait_for(lambda: len(engine.saved) == len(texts))
+    wait_for(lambda: texts[-1] in worker._sounds)
+    assert list(worker._sounds) == texts[-SOUND_CACHE_SIZE:]
+
+    # 移出内存的句子从磁盘缓存重新载入，不再合成
+    worker.prefetch(texts[0])
+    wait_for(lambda: texts[0] in worker._sounds)
+    assert engine.saved == texts
+    assert len(worker._sounds) == SOUND_CACHE_SIZE
+    worker.close()
@@ -0,0 +1,184 @@
+"""
+后台朗读模块
+功能：在独立线程中合成并播放语音，朗读时输入提示已经可以接受键盘输入
+特点：
+1. 朗读请求立即返回，不阻塞 input()
+2. 新的朗读请求会打断正在播放的句子，也可手动取消或重播
+3. 在用户作答时预先合成下一题的语音，切题时直接播放
+4. 合成结果保存在语音缓存中，通过已初始化的 pygame 混音器播放，
+   重播只是播放文件；若系统语音引擎不支持输出到文件或混音器尚未就绪，则退回直接朗读
+   内存中只保留最近用到的几段已解码语音，更早的句子再次朗读时从磁盘缓存重新载入
+5. 语音在保留的朗读声道上播放，不会占用反馈音效的声道，朗读时答对/答错音效照样立即响起
+"""
+
+import itertools
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Optional
+
+from audio import SPEECH_CHANNEL
+from metrics import Metrics
+from tts_cache import AudioCache, engine_voice
+
+if TYPE_CHECKING:
+    import pygame
+
+# 请求优先级：数字越小越先处理，朗读总是排在预合成之前
+_PRIORITY_STOP = 0
+_PRIORITY_PLAY = 1
+_PRIORITY_RENDER = 2
+
+# 内存中保留的已解码语音数：当前句、预合成的下一句与刚朗读过的句子
+SOUND_CACHE_SIZE = 4
+
+
+class SpeechWorker:
+    """后台朗读线程
+
+    pyttsx3 引擎只在工作线程内创建和使用，主线程只负责投递请求。
+
+    Args:
+        engine_factory: 创建并配置好 TTS 引擎的函数(如 practice.init_tts_engine)
+        cache: 磁盘语音缓存；为 None 时使用会话结束即删除的临时缓存
+        metrics: 耗时统计(合成、从请求到开始播放等)，为 None 时不统计
+    """
+
+    def __init__(self, engine_factory: Callable[[], object], cache: Optional[AudioCache] = None,
+                 metrics: Optional[Metrics] = None):
+        self._engine_factory = engine_factory
+        self._engine = None
+        self._voice = ""
+        self._rate = 0
+        self._requests: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._generation = 0  # 每次打断/取消时递增，旧的朗读请求随之作废
+        self._lock = threading.Lock()
+        self._temp_dir = None
+        if cache is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="practice-tts-")
+            cache = AudioCache(self._temp_dir, max_bytes=None)
+        self.cache = cache
+        self.metrics = metrics or Metrics(enabled=False)
+        self._file_output = True  # 引擎是否支持合成到文件
+        self._sounds: "OrderedDict[str, pygame.mixer.Sound]" = OrderedDict()
+        self._channel: Optional["pygame.mixer.Channel"] = None
+        self.last_text: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._thread.start()
+
+    # ---------- 主线程接口 ----------
+
+    def speak(self, text: str) -> None:
+        """打断当前朗读并朗读新句子(立即返回)"""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._stop_channel()
+        self.last_text = text
+        self._requests.put((_PRIORITY_PLAY, next(self._counter), "play", text, generation, time.perf_counter()))
+
+    def replay(self) -> None:
+        """重播上一次朗读的句子"""
+        if self.last_text is not None:
+            self.speak(self.last_text)
+
+    def prefetch(self, text: str) -> None:
+        """在空闲时预先合成句子，之后朗读时直接播放"""
+        self._requests.put((_PRIORITY_RENDER, next(self._counter), "render", text, 0, 0.0))
+
+    def cancel(self) -> None:
+        """停止正在播放的句子，并丢弃尚未开始的朗读请求"""
+        with self._lock:
+            self._generation += 1
+        self._stop_channel()
+
+    def is_busy(self) -> bool:
+        """是否正在播放语音"""
+        channel = self._channel
+        return bool(channel and channel.get_busy())
+
+    def close(self) -> None:
+        """停止工作线程，并删除临时缓存(若有)"""
+        self.cancel()
+        self._requests.put((_PRIORITY_STOP, next(self._counter), "stop", "", 0, 0.0))
+        self._thread.join(timeout=5)
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def _stop_channel(self) -> None:
+        channel = self._channel
+        if channel is not None:
+            channel.stop()
+
+    # ---------- 工作线程 ----------
+
+    def _run(self) -> None:
+        try:
+            self._engine = self._engine_factory()
+        except Exception:
+            # 没有可用的语音引擎(如容器中未安装语音库)，之后的朗读请求全部丢弃
+            self._engine = None
+        else:
+            self._voice, self._rate = engine_voice(self._engine)
+        while True:
+            _, _, kind, text, generation, requested = self._requests.get()
+            if kind == "stop":
+                return
+            if self._engine is None:
+                continue
+            if kind == "render":
+                self._render(text)
+            elif generation == self._generation:
+                self._play(text, generation, requested)
+
+    def _render(self, text: str) -> Optional["pygame.mixer.Sound"]:
+        """取得句子的音频(内存 → 磁盘缓存 → 重新合成)，失败时返回 None"""
+        sound = self._sounds.get(text)
+        if sound is not None:
+            self._sounds.move_to_end(text)
+            return sound
+        if not self._file_output:
+            return None
+        # pygame 在工作线程中才导入；混音器可能仍在后台初始化，此时先直接朗读
+        import pygame
+
+        if not pygame.mixer.get_init():
+            return None
+
+        path = self.cache.get(text, self._voice, self._rate)
+        if path is None:
+            with self.metrics.time("tts_synthesis"):
+                path = self.cache.render(self._engine, text, self._voice, self._rate)
+        try:
+            if path is None:
+                raise OSError("engine cannot render to file")
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, OSError):
+            # 该语音引擎无法输出可播放的音频文件，之后改为直接朗读
+            self._file_output = False
+            return None
+        self._sounds[text] = sound
+        if len(self._sounds) > SOUND_CACHE_SIZE:
+            self._sounds.popitem(last=False)
+        return sound
+
+    def _play(self, text: str, generation: int, requested: float) -> None:
+        sound = self._render(text)
+        if generation != self._generation:
+            return  # 合成期间已被新的请求打断
+        if sound is not None:
+            import pygame
+
+            channel = pygame.mixer.Channel(SPEECH_CHANNEL)
+            channel.play(sound)
+            self._channel = channel
+            # 从发出朗读请求到开始播放的延迟
+            self.metrics.observe("tts_start", time.perf_counter() - requested)
+        else:
+            with self.metrics.time("tts_run_and_wait"):
+                self._engine.say(text)
+                self._engine.runAndWait()
@@ -0,0 +1,209 @@
+"""
+语音缓存模块
+功能：把合成好的语音按(文本, 音色, 语速)保存在磁盘上，重播时直接播放文件
+特点：
+1. 以内容哈希命名文件，相同句子在不同题库、不同会话间共用
+2. 超过容量上限时按最近使用时间(LRU)删除最旧的文件
+3. 提供预热命令，用多进程一次性合成整个题库
+
+用法：
+    python tts_cache.py json/english_sentence.json [-j 进程数]
+"""
+
+import argparse
+import hashlib
+import os
+from typing import Iterable, List, Optional, Tuple
+
+# 默认缓存目录与容量上限
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "practice-tts")
+DEFAULT_MAX_MB = 200
+AUDIO_SUFFIX = ".wav"
+
+
+class AudioCache:
+    """磁盘语音缓存
+
+    Args:
+        cache_dir: 缓存目录(不存在时自动创建)
+        max_bytes: 容量上限(字节)，为 None 时不限制
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: Optional[int] = DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = 0
+        self.rescan()
+
+    @staticmethod
+    def key(text: str, voice: str, rate: int) -> str:
+        """缓存键：文本、音色与语速共同决定的内容哈希"""
+        raw = f"{voice}\0{rate}\0{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def path(self, text: str, voice: str, rate: int) -> str:
+        """缓存文件路径(文件不一定存在)"""
+        return os.path.join(self.cache_dir, self.key(text, voice, rate) + AUDIO_SUFFIX)
+
+    def get(self, text: str, voice: str, rate: int) -> Optional[str]:
+        """查找缓存，命中时刷新其使用时间
+
+        Returns:
+            音频文件路径，未命中时为 None
+        """
+        path = self.path(text, voice, rate)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def render(self, engine, text: str, voice: str, rate: int) -> Optional[str]:
+        """用 TTS 引擎把文本合成到缓存中
+
+        Args:
+            engine: 已初始化的 pyttsx3 引擎
+            text: 要合成的文本
+            voice: 引擎当前的音色标识
+            rate: 引擎当前的语速
+
+        Returns:
+            音频文件路径；引擎不支持输出到文件时为 None
+        """
+        path = self.path(text, voice, rate)
+        # 先写入临时文件再改名，避免其他进程读到写了一半的文件
+        temp_path = f"{path}.{os.getpid()}.tmp{AUDIO_SUFFIX}"
+        try:
+            engine.save_to_file(text, temp_path)
+            engine.runAndWait()
+            size = os.path.getsize(temp_path)
+            if not size:
+                raise OSError("empty audio file")
+            os.replace(temp_path, path)
+        except (OSError, RuntimeError):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return None
+        self._total_bytes += size
+        self.evict()
+        return path
+
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        """列出缓存文件(路径, 大小, 最近使用时间)"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(AUDIO_SUFFIX) and ".tmp" not in entry.name:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def rescan(self) -> int:
+        """重新统计缓存占用(其他进程写入后调用)
+
+        Returns:
+            缓存占用的字节数
+        """
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+        return self._total_bytes
+
+    def evict(self) -> int:
+        """超过容量上限时删除最久未使用的文件
+
+        Returns:
+            删除的文件数
+        """
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return 0
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+            removed += 1
+        return removed
+
+
+def engine_voice(engine) -> Tuple[str, int]:
+    """读取引擎当前的(音色标识, 语速)，作为缓存键的一部分"""
+    return str(engine.getProperty("voice")), int(engine.getProperty("rate"))
+
+
+def _prewarm_chunk(texts: List[str], cache_dir: str, voice_type: int, speech_rate: int) -> int:
+    """在子进程中合成一组句子，返回新合成的数量"""
+    from practice import init_tts_engine
+
+    engine = init_tts_engine(voice_type, speech_rate)
+    voice, rate = engine_voice(engine)
+    cache = AudioCache(cache_dir, max_bytes=None)  # 由主进程统一清理
+    rendered = 0
+    for text in texts:
+        if cache.get(text, voice, rate) is None and cache.render(engine, text, voice, rate):
+            rendered += 1
+    return rendered
+
+
+def prewarm(texts: Iterable[str], cache: AudioCache, voice_type: int, speech_rate: int,
+            workers: Optional[int] = None) -> int:
+    """用多进程预先合成一批句子
+
+    Args:
+        texts: 要合成的句子
+        cache: 目标缓存
+        voice_type: 语音类型索引
+        speech_rate: 语速
+        workers: 进程数，默认为 CPU 核心数
+
+    Returns:
+        新合成的句子数量
+    """
+    # 多进程模块导入较慢，只在预热时才导入，不拖慢练习程序启动
+    from concurrent.futures import ProcessPoolExecutor
+
+    texts = list(dict.fromkeys(texts))
+    if not texts:
+        return 0
+    workers = min(workers or os.cpu_count() or 1, len(texts))
+    chunks = [texts[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rendered = sum(pool.map(_prewarm_chunk, chunks,
+                                [cache.cache_dir] * workers,
+                                [voice_type] * workers,
+                                [speech_rate] * workers))
+    # 子进程不负责清理，最后统一按容量上限淘汰
+    cache.rescan()
+    cache.evict()
+    return rendered
+
+
+def main():
+    """程序主入口：预热题库语音缓存"""
+    from practice import COLORS, TTS_CACHE_SETTINGS, VOICE_SETTINGS, load_json_file
+
+    parser = argparse.ArgumentParser(description="预先合成题库中所有句子的语音")
+    parser.add_argument("decks", nargs="+", help="题库JSON文件")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="进程数(默认为CPU核心数)")
+    args = parser.parse_args()
+
+    texts = []
+    for deck_path in args.decks:
+        texts.extend(load_json_file(deck_path))
+
+    cache = AudioCache(TTS_CACHE_SETTINGS['cache_dir'], TTS_CACHE_SETTINGS['max_mb'] * 1024 * 1024)
+    rendered = prewarm(texts, cache, VOICE_SETTINGS['voice_type'], VOICE_SETTINGS['speech_rate'], args.workers)
+    print(f"{COLORS['correct']}已合成 {rendered} 句，共 {len(set(texts))} 句{COLORS['reset']}")
+
+
+if __name__ == "__main__":
+    main()